@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import multiprocessing as mp
+import time
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Barrier
+from pathlib import Path
+from statistics import mean
+
+from ingredient_parser import (
+    dedup_info,
+    parse_ingredient,
+    parse_multiple_ingredients,
+    prepare_for_fork,
+    reset_dedup_info,
+    warmup,
+)
+from ingredient_parser.en import PreProcessor
+from ingredient_parser.en._utils import pluralise_units
+
+DEFAULT_CSVS = [
+    "train/data/bbc/bbc-ingredients-snapshot-2017.csv",
+    "train/data/cookstr/cookstr-ingredients-snapshot-2017.csv",
+]
+
+
+def load_sentences(csv_paths: list[str], limit: int | None) -> list[str]:
+    """Load ingredient sentences from the input column of training data csv files.
+
+    Parameters
+    ----------
+    csv_paths : list[str]
+        List of paths to csv files.
+    limit : int | None
+        Maximum number of sentences to load from each csv file.
+        If None, all sentences are loaded.
+
+    Returns
+    -------
+    list[str]
+        List of ingredient sentences.
+    """
+    sentences = []
+    for path in csv_paths:
+        with Path(path).open("r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for i, row in enumerate(reader):
+                if limit is not None and i >= limit:
+                    break
+                sentences.append(row["input"])
+
+    return sentences
+
+
+def report(name: str, n: int, elapsed: float) -> None:
+    """Print the throughput of a benchmark run.
+
+    Parameters
+    ----------
+    name : str
+        Name of benchmark run.
+    n : int
+        Number of sentences parsed.
+    elapsed : float
+        Time taken to parse sentences, in seconds.
+    """
+    print(
+        f"{name:>10}: {n:,} sentences in {elapsed:.2f} s "
+        f"({n / elapsed:,.0f} sentences/s, {1e6 * elapsed / n:.1f} us/sentence)"
+    )
+
+
+def benchmark_batch(args: argparse.Namespace) -> None:
+    """Compare parsing sentences one at a time with parsing them as a batch.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Benchmark configuration.
+    """
+    sentences = load_sentences(args.csv, args.limit) * args.repeat
+    options = {"foundation_foods": args.foundation_foods}
+
+    # Parse a single sentence first so that model loading isn't included in timings.
+    parse_ingredient("2 tbsp olive oil", **options)
+
+    start = time.perf_counter()
+    loop = [parse_ingredient(sentence, **options) for sentence in sentences]
+    loop_elapsed = time.perf_counter() - start
+    report("loop", len(sentences), loop_elapsed)
+
+    reset_dedup_info()
+    start = time.perf_counter()
+    batch = parse_multiple_ingredients(sentences, **options)
+    batch_elapsed = time.perf_counter() - start
+    report("batch", len(sentences), batch_elapsed)
+
+    info = dedup_info()
+    print(
+        f"{info.distinct:,} distinct sentences out of {info.sentences:,} "
+        f"(dedup ratio {info.ratio:.1%})"
+    )
+
+    print(f"   speedup: {loop_elapsed / batch_elapsed:.2f}x")
+    if loop != batch:
+        print("[WARNING] Batch results differ from loop results.")
+
+    if args.workers > 1:
+        start = time.perf_counter()
+        parallel = parse_multiple_ingredients(
+            sentences, workers=args.workers, chunksize=args.chunksize, **options
+        )
+        parallel_elapsed = time.perf_counter() - start
+        report("parallel", len(sentences), parallel_elapsed)
+
+        print(f"   speedup: {loop_elapsed / parallel_elapsed:.2f}x")
+        if loop != parallel:
+            print("[WARNING] Parallel results differ from loop results.")
+
+
+def benchmark_confidence(args: argparse.Namespace) -> None:
+    """Compare parsing sentences with and without calculating confidence.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Benchmark configuration.
+    """
+    sentences = load_sentences(args.csv, args.limit)
+    options = {"foundation_foods": args.foundation_foods}
+
+    # Parse a single sentence first so that model loading isn't included in timings.
+    parse_ingredient("2 tbsp olive oil", **options)
+
+    start = time.perf_counter()
+    for sentence in sentences:
+        parse_ingredient(sentence, **options)
+    with_elapsed = time.perf_counter() - start
+    report("confidence", len(sentences), with_elapsed)
+
+    start = time.perf_counter()
+    for sentence in sentences:
+        parse_ingredient(sentence, confidence=False, **options)
+    without_elapsed = time.perf_counter() - start
+    report("none", len(sentences), without_elapsed)
+
+    saved = 1e6 * (with_elapsed - without_elapsed) / len(sentences)
+    print(
+        f"     saved: {saved:.1f} us/sentence "
+        f"({1 - without_elapsed / with_elapsed:.1%})"
+    )
+
+
+def benchmark_backend(args: argparse.Namespace) -> None:
+    """Compare parsing batches of sentences with the crfsuite and numpy backends.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Benchmark configuration.
+    """
+    sentences = load_sentences(args.csv, args.limit)
+    options = {"foundation_foods": args.foundation_foods}
+
+    results = {}
+    elapsed = {}
+    for backend in ["crfsuite", "numpy"]:
+        # Parse a single sentence first so that model loading isn't included in
+        # timings.
+        parse_ingredient("2 tbsp olive oil", backend=backend, **options)
+
+        start = time.perf_counter()
+        results[backend] = parse_multiple_ingredients(
+            sentences, backend=backend, chunksize=args.chunksize, **options
+        )
+        elapsed[backend] = time.perf_counter() - start
+        report(backend, len(sentences), elapsed[backend])
+
+    print(f"   speedup: {elapsed['crfsuite'] / elapsed['numpy']:.2f}x")
+    if results["crfsuite"] != results["numpy"]:
+        print("[WARNING] numpy backend results differ from crfsuite backend results.")
+
+
+def memory_usage() -> dict[str, int]:
+    """Return the memory usage of the calling process.
+
+    The memory usage is read from /proc/self/smaps_rollup, so this only works on Linux.
+
+    Returns
+    -------
+    dict[str, int]
+        Resident set size (rss), proportional set size (pss) and memory not shared
+        with any other process (private), in bytes.
+    """
+    fields = {}
+    with Path("/proc/self/smaps_rollup").open() as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in {"Rss", "Pss", "Private_Clean", "Private_Dirty"}:
+                fields[name] = int(value.split()[0]) * 1024
+
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def fork_worker(
+    sentences: list[str],
+    foundation_foods: bool,
+    barrier: Barrier,
+    results: Queue,
+) -> None:
+    """Parse sentences one at a time in a forked worker, then report memory usage.
+
+    The memory usage is measured once all workers have finished parsing, and the
+    workers wait until they have all been measured before exiting, so that the memory
+    shared between them is included in the measurements.
+
+    Parameters
+    ----------
+    sentences : list[str]
+        Sentences to parse.
+    foundation_foods : bool
+        If True, extract foundation foods.
+    barrier : Barrier
+        Barrier shared by all workers.
+    results : Queue
+        Queue to put memory usage in.
+    """
+    for sentence in sentences:
+        parse_ingredient(sentence, foundation_foods=foundation_foods)
+
+    barrier.wait()
+    results.put(memory_usage())
+    barrier.wait()
+
+
+def fork_parent(preload: str, args: argparse.Namespace, results: Queue) -> None:
+    """Load the parser resources as configured, then fork workers and parse sentences.
+
+    Parameters
+    ----------
+    preload : str
+        How the parent process loads resources before forking: "none", "warmup" or
+        "prepare_for_fork".
+    args : argparse.Namespace
+        Benchmark configuration.
+    results : Queue
+        Queue to put the memory usage of the parent and each worker in.
+    """
+    sentences = load_sentences(args.csv, args.limit)
+    if preload == "warmup":
+        warmup(foundation_foods=args.foundation_foods)
+    elif preload == "prepare_for_fork":
+        prepare_for_fork(foundation_foods=args.foundation_foods)
+
+    ctx = mp.get_context("fork")
+    barrier = ctx.Barrier(args.workers)
+    worker_results = ctx.Queue()
+    workers = [
+        ctx.Process(
+            target=fork_worker,
+            args=(sentences, args.foundation_foods, barrier, worker_results),
+        )
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    usage = [worker_results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    results.put((memory_usage(), usage))
+
+
+def benchmark_fork(args: argparse.Namespace) -> None:
+    """Compare the memory used by forked workers with different ways of preloading.
+
+    Each configuration is run in a new interpreter, which loads the parser resources
+    in one of the following ways and then forks the workers:
+
+    * none: nothing is loaded, so each worker loads its own resources.
+    * warmup: the resources are loaded with warmup.
+    * prepare_for_fork: the resources are loaded and frozen with prepare_for_fork.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Benchmark configuration.
+    """
+    mb = 1024**2
+    ctx = mp.get_context("spawn")
+    print(
+        f"{'preload':>16}  {'parent RSS':>10}  "
+        f"{'worker RSS':>10}  {'worker PSS':>10}  {'worker private':>14}"
+    )
+    for preload in ["none", "warmup", "prepare_for_fork"]:
+        results = ctx.Queue()
+        parent = ctx.Process(target=fork_parent, args=(preload, args, results))
+        parent.start()
+        parent_usage, worker_usage = results.get()
+        parent.join()
+
+        rss = mean(usage["rss"] for usage in worker_usage) / mb
+        pss = mean(usage["pss"] for usage in worker_usage) / mb
+        private = mean(usage["private"] for usage in worker_usage) / mb
+        print(
+            f"{preload:>16}  {parent_usage['rss'] / mb:>7.1f} MB  "
+            f"{rss:>7.1f} MB  {pss:>7.1f} MB  {private:>11.1f} MB"
+        )
+
+
+def benchmark_normalise(args: argparse.Namespace) -> None:
+    """Time each step of normalising sentences, and normalising as a whole.
+
+    Each step is timed for every sentence. When normalising as a whole, steps are
+    skipped for sentences that don't contain the characters they need, so the number
+    of sentences each step was applied to and skipped for is also printed.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Benchmark configuration.
+    """
+    sentences = load_sentences(args.csv, args.limit)
+    p = PreProcessor("", defer_pos_tagging=True)
+
+    # Each step is applied to the output of the previous step, as in normalisation.
+    inputs = sentences
+    for func in p._normalisation_steps():
+        start = time.perf_counter()
+        inputs = [func(sentence) for sentence in inputs]
+        elapsed = time.perf_counter() - start
+        print(f"{func.__name__:>35}: {1e6 * elapsed / len(sentences):6.2f} us/sentence")
+
+    PreProcessor.reset_normalisation_step_counts()
+    start = time.perf_counter()
+    for sentence in sentences:
+        p._normalise(sentence)
+    report("normalise", len(sentences), time.perf_counter() - start)
+
+    # Steps are skipped for sentences without the characters they need.
+    for name, counts in PreProcessor.normalisation_step_counts().items():
+        print(
+            f"{name:>35}: applied {counts.applied:,}, skipped {counts.skipped:,} "
+            f"({100 * counts.skipped / len(sentences):.0f}%)"
+        )
+
+
+def benchmark_pluralise(args: argparse.Namespace) -> None:
+    """Time pluralising units in sentences and in each token of the sentences.
+
+    Each is timed with an empty cache, then again with the results already cached.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Benchmark configuration.
+    """
+    sentences = load_sentences(args.csv, args.limit)
+    tokens = [token for sentence in sentences for token in sentence.split()]
+
+    for name, inputs in [("sentences", sentences), ("tokens", tokens)]:
+        pluralise_units.cache_clear()
+        for run in ["uncached", "cached"]:
+            start = time.perf_counter()
+            for text in inputs:
+                pluralise_units(text)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:>10} ({run}): {len(inputs):,} in {elapsed:.2f} s "
+                f"({1e6 * elapsed / len(inputs):.2f} us each)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the performance of the ingredient parser."
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Benchmarks")
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Compare parsing in a loop with parsing as a batch."
+    )
+    batch_parser.add_argument(
+        "--csv",
+        help="Paths to csv files of ingredient sentences.",
+        nargs="*",
+        default=DEFAULT_CSVS,
+    )
+    batch_parser.add_argument(
+        "--limit",
+        help="Maximum number of sentences to load from each csv file.",
+        type=int,
+        default=None,
+    )
+    batch_parser.add_argument(
+        "--repeat",
+        help="Number of times to repeat the sentences, to simulate duplicates.",
+        type=int,
+        default=1,
+    )
+    batch_parser.add_argument(
+        "-w",
+        "--workers",
+        help="Number of worker processes to also benchmark parallel parsing with.",
+        type=int,
+        default=1,
+    )
+    batch_parser.add_argument(
+        "--chunksize",
+        help="Number of sentences sent to each worker process at a time.",
+        type=int,
+        default=256,
+    )
+    batch_parser.add_argument(
+        "--foundation-foods",
+        action="store_true",
+        help="Extract foundation foods.",
+    )
+
+    confidence_parser = subparsers.add_parser(
+        "confidence", help="Compare parsing with and without calculating confidence."
+    )
+    confidence_parser.add_argument(
+        "--csv",
+        help="Paths to csv files of ingredient sentences.",
+        nargs="*",
+        default=DEFAULT_CSVS,
+    )
+    confidence_parser.add_argument(
+        "--limit",
+        help="Maximum number of sentences to load from each csv file.",
+        type=int,
+        default=None,
+    )
+    confidence_parser.add_argument(
+        "--foundation-foods",
+        action="store_true",
+        help="Extract foundation foods.",
+    )
+
+    backend_parser = subparsers.add_parser(
+        "backend", help="Compare the crfsuite and numpy inference backends."
+    )
+    backend_parser.add_argument(
+        "--csv",
+        help="Paths to csv files of ingredient sentences.",
+        nargs="*",
+        default=DEFAULT_CSVS,
+    )
+    backend_parser.add_argument(
+        "--limit",
+        help="Maximum number of sentences to load from each csv file.",
+        type=int,
+        default=None,
+    )
+    backend_parser.add_argument(
+        "--chunksize",
+        help="Number of sentences parsed together as a batch.",
+        type=int,
+        default=256,
+    )
+    backend_parser.add_argument(
+        "--foundation-foods",
+        action="store_true",
+        help="Extract foundation foods.",
+    )
+
+    fork_parser = subparsers.add_parser(
+        "fork",
+        help="Compare the memory used by forked workers with and without preloading.",
+    )
+    fork_parser.add_argument(
+        "--csv",
+        help="Paths to csv files of ingredient sentences.",
+        nargs="*",
+        default=DEFAULT_CSVS,
+    )
+    fork_parser.add_argument(
+        "--limit",
+        help="Maximum number of sentences to load from each csv file.",
+        type=int,
+        default=1000,
+    )
+    fork_parser.add_argument(
+        "-w",
+        "--workers",
+        help="Number of worker processes to fork.",
+        type=int,
+        default=4,
+    )
+    fork_parser.add_argument(
+        "--foundation-foods",
+        action="store_true",
+        help="Extract foundation foods.",
+    )
+
+    normalise_parser = subparsers.add_parser(
+        "normalise",
+        help="Time each step of normalising sentences.",
+    )
+    normalise_parser.add_argument(
+        "--csv",
+        help="Paths to csv files of ingredient sentences.",
+        nargs="*",
+        default=DEFAULT_CSVS,
+    )
+    normalise_parser.add_argument(
+        "--limit",
+        help="Maximum number of sentences to load from each csv file.",
+        type=int,
+        default=None,
+    )
+
+    pluralise_parser = subparsers.add_parser(
+        "pluralise",
+        help="Time pluralising units.",
+    )
+    pluralise_parser.add_argument(
+        "--csv",
+        help="Paths to csv files of ingredient sentences.",
+        nargs="*",
+        default=DEFAULT_CSVS,
+    )
+    pluralise_parser.add_argument(
+        "--limit",
+        help="Maximum number of sentences to load from each csv file.",
+        type=int,
+        default=None,
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "batch":
+        benchmark_batch(args)
+    elif args.command == "confidence":
+        benchmark_confidence(args)
+    elif args.command == "backend":
+        benchmark_backend(args)
+    elif args.command == "fork":
+        benchmark_fork(args)
+    elif args.command == "normalise":
+        benchmark_normalise(args)
+    elif args.command == "pluralise":
+        benchmark_pluralise(args)
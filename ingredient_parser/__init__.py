@@ -1,12 +1,47 @@
-from ._common import SUPPORTED_LANGUAGES, show_model_card
-from .parsers import inspect_parser, parse_ingredient, parse_multiple_ingredients
+from ._cache import CacheInfo, ParseCache, SQLiteParseCache
+from ._common import (
+    SUPPORTED_LANGUAGES,
+    DedupInfo,
+    dedup_info,
+    reset_dedup_info,
+    show_model_card,
+)
+from .parsers import (
+    IngredientParser,
+    inspect_parser,
+    iter_parse_ingredients,
+    nbest_labels,
+    nbest_labels_multiple,
+    parse_ingredient,
+    parse_ingredient_async,
+    parse_multiple_ingredients,
+    parse_multiple_ingredients_async,
+    prepare_for_fork,
+    reload_models,
+    warmup,
+)
 
 __all__ = [
+    "CacheInfo",
+    "DedupInfo",
+    "IngredientParser",
+    "ParseCache",
+    "SQLiteParseCache",
     "SUPPORTED_LANGUAGES",
+    "dedup_info",
     "inspect_parser",
+    "iter_parse_ingredients",
+    "nbest_labels",
+    "nbest_labels_multiple",
     "parse_ingredient",
+    "parse_ingredient_async",
     "parse_multiple_ingredients",
+    "parse_multiple_ingredients_async",
+    "prepare_for_fork",
+    "reload_models",
+    "reset_dedup_info",
     "show_model_card",
+    "warmup",
 ]
 
 __version__ = "1.2.0"
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+
+import argparse
+import collections
+import csv
+import dataclasses
+import json
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from . import SUPPORTED_LANGUAGES
+from ._cache import SQLiteParseCache
+from ._tagger import BACKENDS
+from .dataclasses import ParsedIngredient
+from .parsers import IngredientParser
+
+FORMATS = ["text", "csv", "jsonl"]
+
+
+def infer_format(path: str) -> str:
+    """Infer the format of an input file from its extension.
+
+    Parameters
+    ----------
+    path : str
+        Path to input file, or "-" for stdin.
+
+    Returns
+    -------
+    str
+        "csv" for .csv files, "jsonl" for .jsonl or .ndjson files, otherwise "text".
+    """
+    match Path(path).suffix.lower():
+        case ".csv":
+            return "csv"
+        case ".jsonl" | ".ndjson":
+            return "jsonl"
+        case _:
+            return "text"
+
+
+def read_sentences(f: TextIO, fmt: str, field: str) -> Iterator[str | None]:
+    """Lazily read ingredient sentences from a file.
+
+    Parameters
+    ----------
+    f : TextIO
+        File to read sentences from.
+    fmt : str
+        Format of file: "text" for one sentence per line, "csv" for a csv file with a
+        header row, or "jsonl" for one JSON object per line.
+        None is yielded for each blank line in text and jsonl files, so that there is
+        one item for every line.
+    field : str
+        Name of the csv column or JSON object key containing the sentence.
+        Not used for text files.
+
+    Yields
+    ------
+    str | None
+        Ingredient sentence, or None for a blank line.
+
+    Raises
+    ------
+    ValueError
+        If a csv file does not have a column called field, or a line of a jsonl file
+        is not a JSON object with a key called field.
+    """
+    match fmt:
+        case "text":
+            for line in f:
+                yield line.rstrip("\r\n") if line.strip() else None
+        case "csv":
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None or field not in reader.fieldnames:
+                raise ValueError(f'CSV file does not have a "{field}" column')
+            for row in reader:
+                yield row[field]
+        case "jsonl":
+            for i, line in enumerate(f, start=1):
+                if not line.strip():
+                    yield None
+                    continue
+
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Line {i} is not valid JSON: {e}") from e
+
+                if not isinstance(obj, dict) or field not in obj:
+                    raise ValueError(f'Line {i} does not have a "{field}" key')
+
+                yield obj[field]
+        case _:
+            raise ValueError(f'Unrecognised format "{fmt}"')
+
+
+def to_json(parsed: ParsedIngredient) -> str:
+    """Serialise a ParsedIngredient object to a single line of JSON.
+
+    pint.Unit objects are converted to strings.
+
+    Parameters
+    ----------
+    parsed : ParsedIngredient
+        Parsed ingredient sentence.
+
+    Returns
+    -------
+    str
+        JSON representation of parsed ingredient sentence.
+    """
+    return json.dumps(dataclasses.asdict(parsed), default=str, ensure_ascii=False)
+
+
+def positive_int(value: str) -> int:
+    """Convert a command line argument to a positive integer.
+
+    Parameters
+    ----------
+    value : str
+        Command line argument.
+
+    Returns
+    -------
+    int
+        Integer value of argument.
+
+    Raises
+    ------
+    argparse.ArgumentTypeError
+        If value is not an integer greater than 0.
+    """
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a positive integer")
+
+    return n
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the command line argument parser.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Command line argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m ingredient_parser",
+        description="Parse ingredient sentences, writing the results as JSON lines. "
+        "One line is written for each input sentence, in the same order. A blank "
+        "line in text or jsonl input is written as null.",
+    )
+    parser.add_argument(
+        "input",
+        help="File to read sentences from. Default is stdin.",
+        nargs="?",
+        default="-",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="File to write JSON lines to. Default is stdout.",
+        default="-",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        help="Format of input. Default is inferred from the input file extension, "
+        "or text for stdin.",
+        choices=FORMATS,
+        default=None,
+    )
+    parser.add_argument(
+        "--field",
+        help="csv column or JSON key containing the sentences.",
+        default="sentence",
+    )
+    parser.add_argument(
+        "--lang",
+        help="Language of sentences.",
+        choices=SUPPORTED_LANGUAGES,
+        default="en",
+    )
+    parser.add_argument(
+        "--discard-isolated-stop-words",
+        help="Discard isolated stop words in the name, preparation or comment fields.",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+    )
+    parser.add_argument(
+        "--expect-name-in-output",
+        help="Guess a name if the model does not label any tokens as the name.",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+    )
+    parser.add_argument(
+        "--string-units",
+        help="Return units as strings instead of pint units.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--imperial-units",
+        help="Use imperial units instead of US customary units.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--foundation-foods",
+        help="Extract foundation foods.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--confidence",
+        help="Calculate the confidence of each field. "
+        "--no-confidence sets every confidence to 0, which is faster.",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+    )
+    parser.add_argument(
+        "--backend",
+        help="Inference backend used to label sentence tokens. "
+        "The numpy backend requires numpy to be installed.",
+        choices=BACKENDS,
+        default="crfsuite",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="Number of worker processes to parse sentences with.",
+        type=positive_int,
+        default=1,
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="Number of sentences parsed together as a batch.",
+        type=positive_int,
+        default=256,
+    )
+    parser.add_argument(
+        "--cache",
+        help="Path to SQLite database to cache parsed sentences in.",
+        default=None,
+    )
+    parser.add_argument(
+        "--cache-size",
+        help="Maximum number of sentences to keep in the cache.",
+        type=positive_int,
+        default=1_000_000,
+    )
+    parser.add_argument(
+        "--progress",
+        help="Print progress to stderr.",
+        action="store_true",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse ingredient sentences from the command line.
+
+    Sentences are read, parsed and written as a stream, so the input can be larger
+    than the available memory. A summary of the throughput is written to stderr.
+
+    One line is written for each sentence read, so output line N is the result for
+    input sentence N. Blank lines are written as null.
+
+    If the input cannot be read, for example because a csv column or JSON key is
+    missing, the sentences read before the error are written and the error is
+    reported on stderr.
+
+    Parameters
+    ----------
+    argv : list[str] | None, optional
+        Command line arguments. Default is None, which uses sys.argv.
+
+    Returns
+    -------
+    int
+        Exit status: 0 on success, or 1 if the input could not be read.
+    """
+    arg_parser = build_parser()
+    args = arg_parser.parse_args(argv)
+    fmt = args.format or infer_format(args.input)
+
+    with ExitStack() as stack:
+        cache = None
+        if args.cache is not None:
+            cache = SQLiteParseCache(args.cache, maxsize=args.cache_size)
+            stack.callback(cache.close)
+
+        parser = IngredientParser(
+            lang=args.lang,
+            discard_isolated_stop_words=args.discard_isolated_stop_words,
+            expect_name_in_output=args.expect_name_in_output,
+            string_units=args.string_units,
+            imperial_units=args.imperial_units,
+            foundation_foods=args.foundation_foods,
+            confidence=args.confidence,
+            backend=args.backend,
+            cache=cache,
+        )
+
+        if args.input == "-":
+            infile = sys.stdin
+        else:
+            infile = stack.enter_context(
+                open(args.input, "r", encoding="utf-8", newline="")
+            )
+        if args.output == "-":
+            outfile = sys.stdout
+        else:
+            outfile = stack.enter_context(open(args.output, "w", encoding="utf-8"))
+
+        # Blank lines aren't parsed, but are written as null in the same position.
+        # For each sentence read, blank is True if it was a blank line. This is
+        # appended to as iter_parse reads sentences, so when each parsed sentence is
+        # returned, it contains every sentence read up to and including it.
+        blank: collections.deque[bool] = collections.deque()
+        # If the input can't be read, reading stops so the sentences read before the
+        # error are still written, and the error is reported once they have been.
+        read_errors: list[ValueError] = []
+
+        def non_blank_sentences() -> Iterator[str]:
+            try:
+                for sentence in read_sentences(infile, fmt, args.field):
+                    blank.append(sentence is None)
+                    if sentence is not None:
+                        yield sentence
+            except ValueError as e:
+                read_errors.append(e)
+
+        start = time.perf_counter()
+        n = n_blank = 0
+        for parsed in parser.iter_parse(
+            non_blank_sentences(), workers=args.workers, chunksize=args.chunk_size
+        ):
+            while blank.popleft():
+                outfile.write("null\n")
+                n_blank += 1
+            outfile.write(to_json(parsed) + "\n")
+            n += 1
+            if args.progress and n % args.chunk_size == 0:
+                elapsed = time.perf_counter() - start
+                print(
+                    f"\rParsed {n:,} sentences ({n / elapsed:,.0f} sentences/s)",
+                    end="",
+                    file=sys.stderr,
+                )
+
+        # Blank lines after the last sentence.
+        n_blank += len(blank)
+        outfile.write("null\n" * len(blank))
+
+        elapsed = time.perf_counter() - start
+
+        if args.progress:
+            print(file=sys.stderr)
+
+        rate = n / elapsed if elapsed > 0 else 0
+        print(
+            f"Parsed {n:,} sentences in {elapsed:.2f} s ({rate:,.0f} sentences/s).",
+            file=sys.stderr,
+        )
+        if n_blank:
+            print(f"Wrote null for {n_blank:,} blank lines.", file=sys.stderr)
+        if cache is not None:
+            info = cache.cache_info()
+            print(
+                f"Cache: {info.hits:,} hits, {info.misses:,} misses, "
+                f"{info.currsize:,} cached sentences.",
+                file=sys.stderr,
+            )
+
+    if read_errors:
+        print(f"{arg_parser.prog}: error: {read_errors[0]}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+
+import copy
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Hashable, Iterable, Iterator, NamedTuple, Sequence
+
+
+class CacheInfo(NamedTuple):
+    """Statistics for a ParseCache.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups that returned a cached result.
+    misses : int
+        Number of lookups that did not return a cached result.
+    maxsize : int
+        Maximum number of cached results.
+    currsize : int
+        Current number of cached results.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ParseCache:
+    """In-process cache of parsed ingredient sentences.
+
+    Results are stored in least recently used order. When the cache is full, the least
+    recently used result is evicted to make space for a new result. If ttl is set,
+    results older than ttl seconds are treated as missing and evicted when next looked
+    up.
+
+    A copy of each result is stored in the cache and a new copy is returned for every
+    cache hit, so modifying a returned result does not modify the cached result.
+
+    The cache is thread safe.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of results to cache.
+        Default is 1024.
+    ttl : float | None, optional
+        Time, in seconds, after which a cached result expires.
+        Default is None, which means cached results do not expire.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of results to cache.
+    ttl : float | None
+        Time, in seconds, after which a cached result expires.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least one")
+
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be greater than zero")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __repr__(self) -> str:
+        """__repr__ method.
+
+        Returns
+        -------
+        str
+            String representation of initialised object
+        """
+        return f"ParseCache(maxsize={self.maxsize}, ttl={self.ttl})"
+
+    def __len__(self) -> int:
+        """Return the number of cached results.
+
+        Returns
+        -------
+        int
+            Number of cached results.
+        """
+        return len(self._cache)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a copy of the cached result for key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of cached result.
+
+        Returns
+        -------
+        Any | None
+            Copy of cached result, or None if there is no cached result for key or the
+            cached result has expired.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._cache[key]
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._cache.move_to_end(key)
+            self._hits += 1
+            value = entry[1]
+
+        return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a copy of value for key.
+
+        If the cache is full, the least recently used result is evicted.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of result.
+        value : Any
+            Result to cache.
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._cache[key] = (time.monotonic(), value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def get_many(self, keys: Sequence[Hashable]) -> list[Any | None]:
+        """Return a copy of the cached result for each key.
+
+        Parameters
+        ----------
+        keys : Sequence[Hashable]
+            Keys of cached results.
+
+        Returns
+        -------
+        list[Any | None]
+            Copy of cached result for each key, or None for keys where there is no
+            cached result or the cached result has expired.
+        """
+        return [self.get(key) for key in keys]
+
+    def put_many(self, items: Sequence[tuple[Hashable, Any]]) -> None:
+        """Cache a copy of each value for its key.
+
+        Parameters
+        ----------
+        items : Sequence[tuple[Hashable, Any]]
+            List of (key, value) tuples.
+        """
+        for key, value in items:
+            self.put(key, value)
+
+    def clear(self) -> None:
+        """Remove all cached results and reset the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return the cache statistics.
+
+        Returns
+        -------
+        CacheInfo
+            Named tuple of hits, misses, maxsize and currsize.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._cache))
+
+    def _expired(self, stored: float) -> bool:
+        """Return True if a result stored at the given time has expired.
+
+        Parameters
+        ----------
+        stored : float
+            Time result was stored, from time.monotonic().
+
+        Returns
+        -------
+        bool
+            True if result has expired.
+        """
+        return self.ttl is not None and time.monotonic() - stored > self.ttl
+
+
+class SQLiteParseCache(ParseCache):
+    """Persistent cache of parsed ingredient sentences, stored in an SQLite database.
+
+    The cache persists between processes, so sentences parsed in one run can be reused
+    in the next. Cached results are pickled, so the cache file should only be shared
+    with trusted users.
+
+    Each key is stored together with the version of this package. The keys created by
+    the parser include a hash of each model file, so cached results are not reused if
+    the package is upgraded or a model changes.
+
+    When the cache contains more than maxsize results, the least recently used results
+    are evicted.
+
+    Every result returned is unpickled from the database, so modifying a returned
+    result does not modify the cached result.
+
+    The cache is thread safe, but a cache file should only be used by one process at a
+    time.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path to SQLite database file. The file is created if it doesn't exist.
+    maxsize : int, optional
+        Maximum number of results to cache.
+        Default is 1,000,000.
+
+    Attributes
+    ----------
+    path : Path
+        Path to SQLite database file.
+    maxsize : int
+        Maximum number of results to cache.
+    """
+
+    # Maximum number of keys in a single SELECT, to stay below SQLite's limit on the
+    # number of parameters in a statement.
+    _select_batch_size = 500
+
+    def __init__(self, path: str | Path, maxsize: int = 1_000_000):
+        # Imported here to avoid a circular import, because ingredient_parser imports
+        # this module before __version__ is defined.
+        from . import __version__
+
+        super().__init__(maxsize=maxsize)
+        self.path = Path(path)
+        self._version = __version__
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS parsed (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                accessed REAL NOT NULL
+                )"""
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS parsed_accessed ON parsed (accessed)"
+            )
+        # Number of rows in the database, counted once here and then kept up to date
+        # as rows are inserted and evicted, so it doesn't need to be counted again.
+        (self._size,) = self._connection.execute(
+            "SELECT COUNT(*) FROM parsed"
+        ).fetchone()
+
+    def __repr__(self) -> str:
+        """__repr__ method.
+
+        Returns
+        -------
+        str
+            String representation of initialised object
+        """
+        return f'SQLiteParseCache("{self.path}", maxsize={self.maxsize})'
+
+    def __len__(self) -> int:
+        """Return the number of cached results.
+
+        Returns
+        -------
+        int
+            Number of cached results.
+        """
+        with self._lock:
+            return self._size
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a copy of the cached result for key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of cached result.
+
+        Returns
+        -------
+        Any | None
+            Copy of cached result, or None if there is no cached result for key.
+        """
+        return self.get_many([key])[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache value for key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of result.
+        value : Any
+            Result to cache.
+        """
+        self.put_many([(key, value)])
+
+    def get_many(self, keys: Sequence[Hashable]) -> list[Any | None]:
+        """Return a copy of the cached result for each key.
+
+        The cached results are looked up in batches, and the last accessed time of all
+        results found is updated in a single transaction.
+
+        Parameters
+        ----------
+        keys : Sequence[Hashable]
+            Keys of cached results.
+
+        Returns
+        -------
+        list[Any | None]
+            Copy of cached result for each key, or None for keys where there is no
+            cached result.
+        """
+        db_keys = [self._db_key(key) for key in keys]
+        found: dict[str, bytes] = {}
+        with self._lock:
+            found.update(self._select("key, value", db_keys))
+
+            if found:
+                now = time.time()
+                with self._connection:
+                    self._connection.executemany(
+                        "UPDATE parsed SET accessed = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+
+            hits = sum(key in found for key in db_keys)
+            self._hits += hits
+            self._misses += len(db_keys) - hits
+
+        return [pickle.loads(found[key]) if key in found else None for key in db_keys]
+
+    def put_many(self, items: Sequence[tuple[Hashable, Any]]) -> None:
+        """Cache each value for its key.
+
+        All values are inserted in a single transaction. If the cache then contains
+        more than maxsize results, the least recently used results are evicted.
+
+        The number of cached results is kept up to date from the number of keys that
+        weren't already cached, which are looked up by primary key, instead of being
+        counted after every insert.
+
+        Parameters
+        ----------
+        items : Sequence[tuple[Hashable, Any]]
+            List of (key, value) tuples.
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (self._db_key(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), now)
+            for key, value in items
+        ]
+        with self._lock, self._connection:
+            new_keys = {key for key, _, _ in rows}
+            new_keys.difference_update(key for (key,) in self._select("key", new_keys))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO parsed (key, value, accessed) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._size += len(new_keys)
+            excess = self._size - self.maxsize
+            if excess > 0:
+                evicted = self._connection.execute(
+                    """DELETE FROM parsed WHERE key IN (
+                    SELECT key FROM parsed ORDER BY accessed LIMIT ?
+                    )""",
+                    (excess,),
+                )
+                self._size -= evicted.rowcount
+
+    def clear(self) -> None:
+        """Remove all cached results and reset the statistics."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM parsed")
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return the cache statistics.
+
+        The hits and misses are counted since this object was created.
+
+        Returns
+        -------
+        CacheInfo
+            Named tuple of hits, misses, maxsize and currsize.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, self._size)
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        with self._lock:
+            self._connection.close()
+
+    def _select(self, columns: str, db_keys: Iterable[str]) -> Iterator[tuple]:
+        """Select columns from the rows for the database keys, in batches.
+
+        Parameters
+        ----------
+        columns : str
+            Comma separated columns to select.
+        db_keys : Iterable[str]
+            Database keys of rows to select.
+
+        Yields
+        ------
+        tuple
+            Selected columns of each row found.
+        """
+        it = iter(set(db_keys))
+        while batch := list(islice(it, self._select_batch_size)):
+            placeholders = ",".join("?" * len(batch))
+            yield from self._connection.execute(
+                f"SELECT {columns} FROM parsed WHERE key IN ({placeholders})", batch
+            )
+
+    def _db_key(self, key: Hashable) -> str:
+        """Return the database key for a cache key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key. This must have a repr that is the same in every process, such as
+            a tuple of strings, numbers and bools.
+
+        Returns
+        -------
+        str
+            SHA-256 hash of the package version and key.
+        """
+        return hashlib.sha256(repr((self._version, key)).encode("utf-8")).hexdigest()
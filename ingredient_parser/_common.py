@@ -5,15 +5,18 @@ import os
 import platform
 import re
 import subprocess
+import threading
 from importlib.resources import as_file, files
 from itertools import groupby, islice
 from operator import itemgetter
-from typing import Generator, Iterator
+from typing import Generator, Iterable, Iterator, NamedTuple, TypeVar
 
 import nltk
 
 SUPPORTED_LANGUAGES = ["en"]
 
+T = TypeVar("T")
+
 # Regex pattern for matching a numeric range e.g. 1-2, 2-3.
 RANGE_PATTERN = re.compile(r"^\d+\s*[\-]\d+$")
 
@@ -51,6 +54,154 @@ def consume(iterator: Iterator, n: int | None) -> None:
         next(islice(iterator, n, n), None)
 
 
+def chunked(iterable: Iterable[T], n: int) -> Generator[list[T], None, None]:
+    """Yield successive chunks of n elements from iterable.
+
+    The last chunk may contain fewer than n elements.
+    Only one chunk is read from iterable at a time.
+
+    See batched from https://docs.python.org/3/library/itertools.html#itertools-recipes
+
+    Parameters
+    ----------
+    iterable : Iterable[T]
+        Iterable to split into chunks.
+    n : int
+        Number of elements in each chunk.
+
+    Yields
+    ------
+    list[T]
+        Chunk of up to n elements.
+
+    Examples
+    --------
+    >>> list(chunked(range(7), 3))
+    [[0, 1, 2], [3, 4, 5], [6]]
+    """
+    if n < 1:
+        raise ValueError("n must be at least one")
+
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, n)):
+        yield chunk
+
+
+def deduplicate(sentences: Iterable[str]) -> tuple[list[str], list[int]]:
+    """Find the distinct sentences in an iterable of sentences.
+
+    Sentences that only differ by leading or trailing whitespace are considered to be
+    the same sentence because they are parsed identically.
+
+    Parameters
+    ----------
+    sentences : Iterable[str]
+        Iterable of sentences.
+
+    Returns
+    -------
+    list[str]
+        First occurrence of each distinct sentence, in the order they first occur.
+    list[int]
+        Index into the list of distinct sentences for each input sentence.
+
+    Examples
+    --------
+    >>> deduplicate(["salt", "pepper", "salt ", "salt"])
+    (['salt', 'pepper'], [0, 1, 0, 0])
+    """
+    distinct = []
+    indices = []
+    seen: dict[str, int] = {}
+    for sentence in sentences:
+        key = sentence.strip()
+        if key not in seen:
+            seen[key] = len(distinct)
+            distinct.append(sentence)
+        indices.append(seen[key])
+
+    return distinct, indices
+
+
+class DedupInfo(NamedTuple):
+    """Statistics for deduplicating sentences parsed as a batch.
+
+    Attributes
+    ----------
+    sentences : int
+        Number of sentences passed to be parsed.
+    distinct : int
+        Number of distinct sentences, which were parsed.
+    """
+
+    sentences: int
+    distinct: int
+
+    @property
+    def ratio(self) -> float:
+        """Fraction of sentences that were duplicates, and weren't parsed again.
+
+        Returns
+        -------
+        float
+            Dedup ratio, between 0 and 1. 0 if no sentences have been parsed.
+        """
+        return 1 - self.distinct / self.sentences if self.sentences else 0.0
+
+
+# Number of sentences and distinct sentences parsed by parse_multiple_ingredients.
+_dedup_counts = [0, 0]
+_dedup_lock = threading.Lock()
+
+
+def record_dedup(sentences: int, distinct: int) -> None:
+    """Add the number of sentences and distinct sentences in a batch to the statistics.
+
+    Parameters
+    ----------
+    sentences : int
+        Number of sentences in batch.
+    distinct : int
+        Number of distinct sentences in batch.
+    """
+    with _dedup_lock:
+        _dedup_counts[0] += sentences
+        _dedup_counts[1] += distinct
+
+
+def dedup_info() -> DedupInfo:
+    """Return how many of the sentences parsed as a batch were distinct.
+
+    Every call to parse_multiple_ingredients, or IngredientParser.parse_many, in this
+    process since the statistics were last reset is counted.
+
+    Returns
+    -------
+    DedupInfo
+        Named tuple of the number of sentences and distinct sentences, with the dedup
+        ratio as the ratio attribute.
+
+    Examples
+    --------
+    >>> from ingredient_parser import parse_multiple_ingredients
+    >>> reset_dedup_info()
+    >>> _ = parse_multiple_ingredients(["salt", "pepper", "salt", "salt"])
+    >>> info = dedup_info()
+    >>> info
+    DedupInfo(sentences=4, distinct=2)
+    >>> info.ratio
+    0.5
+    """
+    with _dedup_lock:
+        return DedupInfo(*_dedup_counts)
+
+
+def reset_dedup_info() -> None:
+    """Reset the statistics returned by dedup_info."""
+    with _dedup_lock:
+        _dedup_counts[:] = [0, 0]
+
+
 def group_consecutive_idx(idx: list[int]) -> Generator[Iterator[int], None, None]:
     """Yield groups of consecutive indices.
 
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+import struct
+from itertools import chain
+from typing import Sequence
+
+import numpy as np
+
+from ._tagger import (
+    MODEL_HEADER,
+    Marginals,
+    SentenceFeatures,
+    encode_features,
+    read_cqdb,
+)
+
+# Header of the features chunk: chunk id, size and number of features.
+_FEATURES_HEADER = struct.Struct("<4sII")
+# A feature: type, source, destination and weight. Type 0 is a state feature from the
+# attribute at source to the label at destination, type 1 is a transition from the
+# label at source to the label at destination.
+_FEATURE = struct.Struct("<IIId")
+
+
+class _AttributeIndex(dict):
+    """Index of each attribute a model has weights for.
+
+    Looking up any other attribute returns the number of attributes, instead of
+    raising KeyError.
+
+    Parameters
+    ----------
+    attributes : list[str]
+        All attributes the model has weights for.
+    """
+
+    def __init__(self, attributes: list[str]):
+        super().__init__((attr, i) for i, attr in enumerate(attributes))
+        self._unknown = len(attributes)
+
+    def __missing__(self, key: str) -> int:
+        """Return the index for an attribute the model doesn't have weights for.
+
+        Parameters
+        ----------
+        key : str
+            Attribute.
+
+        Returns
+        -------
+        int
+            Number of attributes the model has weights for.
+        """
+        return self._unknown
+
+
+class NumpyCRF:
+    """Linear chain CRF model for labelling batches of sentences using NumPy.
+
+    The state feature and transition weights are read from the crfsuite model file
+    once, at full precision, into NumPy arrays. The most likely labels are found using
+    Viterbi decoding and the marginal probabilities are calculated using the
+    forward-backward algorithm, both vectorised across a padded batch of sentences.
+    The labels and marginals are the same as pycrfsuite.Tagger returns, to within
+    floating point precision.
+
+    The arrays are never modified, so a NumpyCRF object can be shared between threads.
+
+    Parameters
+    ----------
+    labels : list[str]
+        All labels the model can assign.
+    attributes : list[str]
+        All attributes the model has weights for.
+    state_weights : np.ndarray
+        Weight of each label for each attribute, with shape (attributes, labels).
+    transitions : np.ndarray
+        Weight of the transition from the label at the first index to the label at the
+        second index, with shape (labels, labels).
+
+    Attributes
+    ----------
+    labels : list[str]
+        All labels the model can assign.
+    """
+
+    def __init__(
+        self,
+        labels: list[str],
+        attributes: list[str],
+        state_weights: np.ndarray,
+        transitions: np.ndarray,
+    ):
+        self.labels = labels
+        # Attributes the model doesn't have weights for are given the index of a row
+        # of zeros appended to the state weights.
+        self._attribute_index = _AttributeIndex(attributes)
+        self._state_weights = np.vstack([state_weights, np.zeros((1, len(labels)))])
+        self._transitions = transitions
+
+    @classmethod
+    def from_model(cls, data: bytes) -> "NumpyCRF":
+        """Read the weights from the contents of a crfsuite model file.
+
+        Parameters
+        ----------
+        data : bytes
+            Contents of model file.
+
+        Returns
+        -------
+        NumpyCRF
+            Model with weights read from file.
+
+        Raises
+        ------
+        ValueError
+            If data is not a crfsuite model file.
+        """
+        if data[:4] != b"lCRF":
+            raise ValueError("Model file is not a valid crfsuite model")
+
+        (
+            _,
+            _,
+            _,
+            _,
+            _,
+            n_labels,
+            n_attributes,
+            features_offset,
+            labels_offset,
+            attributes_offset,
+            _,
+            _,
+        ) = MODEL_HEADER.unpack_from(data, 0)
+        labels = read_cqdb(data, labels_offset, n_labels)
+        attributes = read_cqdb(data, attributes_offset, n_attributes)
+
+        chunk, _, n_features = _FEATURES_HEADER.unpack_from(data, features_offset)
+        if chunk != b"FEAT":
+            raise ValueError("Model file is not a valid crfsuite model")
+
+        state_weights = np.zeros((n_attributes, n_labels))
+        transitions = np.zeros((n_labels, n_labels))
+        start = features_offset + _FEATURES_HEADER.size
+        for feature_type, src, dst, weight in _FEATURE.iter_unpack(
+            data[start : start + n_features * _FEATURE.size]
+        ):
+            if feature_type == 0:
+                state_weights[src, dst] = weight
+            else:
+                transitions[src, dst] = weight
+
+        return cls(labels, attributes, state_weights, transitions)
+
+    def state_scores(self, features_batch: Sequence[SentenceFeatures]) -> np.ndarray:
+        """Return the score of every label for every token of every sentence.
+
+        Parameters
+        ----------
+        features_batch : Sequence[SentenceFeatures]
+            Features for each token of each sentence, as dicts or lists of attributes.
+
+        Returns
+        -------
+        np.ndarray
+            Sum of the weights of each token's attributes for each label, with shape
+            (sentences, tokens in longest sentence, labels). Tokens after the end of a
+            sentence have a score of 0 for every label.
+        """
+        # Pad to at least one token so that a batch of empty sentences has a shape
+        # the other methods can work with.
+        max_tokens = max([1, *(len(features) for features in features_batch)])
+        token_attributes = [
+            encode_features(token) if isinstance(token, dict) else token
+            for features in features_batch
+            for token in features
+        ]
+        # Position of each token in the flattened (sentences x max_tokens) array
+        positions = [
+            s * max_tokens + t
+            for s, features in enumerate(features_batch)
+            for t in range(len(features))
+        ]
+
+        rows = np.fromiter(
+            map(
+                self._attribute_index.__getitem__, chain.from_iterable(token_attributes)
+            ),
+            dtype=np.intp,
+        )
+        counts = np.array([len(attrs) for attrs in token_attributes], dtype=np.intp)
+        starts = np.cumsum(counts) - counts
+
+        scores = np.zeros((len(features_batch) * max_tokens, len(self.labels)))
+        if len(rows) > 0:
+            # np.add.reduceat sums the rows from each start to the next start. Tokens
+            # without any attributes have the same start as the next token, so their
+            # sums are wrong and are replaced with 0.
+            token_scores = np.add.reduceat(
+                self._state_weights[rows], np.minimum(starts, len(rows) - 1), axis=0
+            )
+            token_scores[counts == 0] = 0
+            scores[positions] = token_scores
+
+        return scores.reshape(len(features_batch), max_tokens, len(self.labels))
+
+    def viterbi(self, state_scores: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Return the index of the most likely label for every token of every sentence.
+
+        The sentences must be sorted longest first, so that the sentences that have
+        not ended at each token are always the first sentences in the batch.
+
+        Where more than one label sequence has the highest score, the first label with
+        the highest score is chosen at each step, in the same way as crfsuite.
+
+        Parameters
+        ----------
+        state_scores : np.ndarray
+            Score of every label for every token of every sentence, from
+            state_scores().
+        lengths : np.ndarray
+            Number of tokens in each sentence, in descending order.
+
+        Returns
+        -------
+        np.ndarray
+            Label index for each token of each sentence, with shape (sentences, tokens
+            in longest sentence). Tokens after the end of a sentence have label index
+            0.
+        """
+        n_sentences, max_tokens, _ = state_scores.shape
+        # Number of sentences that have not ended at each token
+        active = [int((lengths > t).sum()) for t in range(max_tokens)]
+
+        best = state_scores[:, 0].copy()
+        backpointers = np.zeros(state_scores.shape, dtype=np.intp)
+        for t in range(1, max_tokens):
+            n = active[t]
+            # Score of each previous label (axis 1) followed by each label (axis 2)
+            candidates = best[:n, :, None] + self._transitions
+            backpointers[:n, t] = candidates.argmax(axis=1)
+            best[:n] = candidates.max(axis=1) + state_scores[:n, t]
+
+        label_indices = np.zeros((n_sentences, max_tokens), dtype=np.intp)
+        current = best.argmax(axis=1)
+        for t in range(max_tokens - 1, -1, -1):
+            n = active[t]
+            label_indices[:n, t] = current[:n]
+            current[:n] = backpointers[np.arange(n), t, current[:n]]
+
+        return label_indices
+
+    def marginals(self, state_scores: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Return the marginal probability of every label for every token.
+
+        Calculated using the forward-backward algorithm. The forward and backward
+        probabilities are normalised at every token to avoid overflow, in the same way
+        as crfsuite. The sentences must be sorted longest first.
+
+        Parameters
+        ----------
+        state_scores : np.ndarray
+            Score of every label for every token of every sentence, from
+            state_scores().
+        lengths : np.ndarray
+            Number of tokens in each sentence, in descending order.
+
+        Returns
+        -------
+        np.ndarray
+            Marginal probabilities, with shape (sentences, tokens in longest
+            sentence, labels). Tokens after the end of a sentence have undefined
+            marginals.
+        """
+        _, max_tokens, _ = state_scores.shape
+        active = [int((lengths > t).sum()) for t in range(max_tokens)]
+        # Subtracting the largest score of each token only changes the normalisation.
+        exp_state = np.exp(state_scores - state_scores.max(axis=2, keepdims=True))
+        exp_transitions = np.exp(self._transitions)
+
+        alpha = np.ones(state_scores.shape)
+        alpha[:, 0] = exp_state[:, 0]
+        for t in range(1, max_tokens):
+            n = active[t]
+            a = (alpha[:n, t - 1] @ exp_transitions) * exp_state[:n, t]
+            alpha[:n, t] = a / a.sum(axis=1, keepdims=True)
+
+        # The last token of each sentence, and anything after it, has beta of 1
+        beta = np.ones(state_scores.shape)
+        for t in range(max_tokens - 2, -1, -1):
+            n = active[t + 1]
+            b = (exp_state[:n, t + 1] * beta[:n, t + 1]) @ exp_transitions.T
+            beta[:n, t] = b / b.sum(axis=1, keepdims=True)
+
+        marginals = alpha * beta
+        return marginals / marginals.sum(axis=2, keepdims=True)
+
+    def tag_batch(
+        self, features_batch: Sequence[SentenceFeatures]
+    ) -> list[tuple[list[str], Marginals]]:
+        """Tag a batch of sentences.
+
+        Parameters
+        ----------
+        features_batch : Sequence[SentenceFeatures]
+            Features for each token of each sentence, as dicts or lists of attributes.
+
+        Returns
+        -------
+        list[tuple[list[str], Marginals]]
+            Label for each token and marginal probabilities of every label for every
+            token, for each sentence in the same order as features_batch.
+        """
+        if not features_batch:
+            return []
+
+        # Sort longest first, so that the sentences still being tagged at each token
+        # are a slice at the start of the batch.
+        order = sorted(
+            range(len(features_batch)),
+            key=lambda i: len(features_batch[i]),
+            reverse=True,
+        )
+        sorted_batch = [features_batch[i] for i in order]
+        lengths = np.array([len(features) for features in sorted_batch])
+        state_scores = self.state_scores(sorted_batch)
+        label_indices = self.viterbi(state_scores, lengths).tolist()
+        marginals = self.marginals(state_scores, lengths)
+
+        tagged: list = [None] * len(features_batch)
+        for s, (i, n_tokens) in enumerate(zip(order, lengths.tolist())):
+            labels = [self.labels[j] for j in label_indices[s][:n_tokens]]
+            values = marginals[s, :n_tokens].ravel().tolist()
+            tagged[i] = (labels, Marginals.from_values(values, n_tokens, self.labels))
+
+        return tagged
+
+    def tag(self, features: SentenceFeatures) -> tuple[list[str], Marginals]:
+        """Tag a sentence.
+
+        Parameters
+        ----------
+        features : SentenceFeatures
+            Features for each token of the sentence, as dicts or lists of attributes.
+
+        Returns
+        -------
+        list[str]
+            Label for each token.
+        Marginals
+            Marginal probabilities of every label for every token of the sentence.
+        """
+        return self.tag_batch([features])[0]
@@ -0,0 +1,1071 @@
+#!/usr/bin/env python3
+
+import hashlib
+import heapq
+import math
+import struct
+import threading
+from importlib.resources.abc import Traversable
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+import pycrfsuite
+
+if TYPE_CHECKING:
+    from ._numpy_tagger import NumpyCRF
+
+# Inference backends that can be used to tag sentences. The crfsuite backend uses
+# pycrfsuite. The numpy backend uses NumpyCRF, which requires numpy to be installed.
+BACKENDS = ("crfsuite", "numpy")
+
+# Features for each token of a sentence, either as a dict of feature names and values,
+# or as a list of attributes created by encode_features.
+SentenceFeatures = Sequence[dict[str, str | bool] | list[str]]
+
+
+# Header of a crfsuite model file: magic, size, type, version, number of features,
+# number of labels, number of attributes and the offsets of the features, labels,
+# attributes, label references and attribute references chunks.
+MODEL_HEADER = struct.Struct("<4sI4sIIIIIIIII")
+# Header of a constant database of strings: chunk id, size, flag, byte order, size of
+# backward array and offset of backward array.
+CQDB_HEADER = struct.Struct("<4sIIIII")
+
+
+def read_cqdb(data: bytes, offset: int, n: int) -> list[str]:
+    """Read the strings from a constant database in a crfsuite model.
+
+    Parameters
+    ----------
+    data : bytes
+        Contents of model file.
+    offset : int
+        Offset of the database in the model file.
+    n : int
+        Number of strings in the database.
+
+    Returns
+    -------
+    list[str]
+        Strings, in id order.
+
+    Raises
+    ------
+    ValueError
+        If there isn't a database at offset.
+    """
+    chunk, _, _, _, _, backward_offset = CQDB_HEADER.unpack_from(data, offset)
+    if chunk != b"CQDB":
+        raise ValueError("Model file is not a valid crfsuite model")
+
+    # The backward array gives the offset of the record for each id. Each record is
+    # the id, the size of the string including its null terminator, then the string.
+    backward = struct.unpack_from(f"<{n}I", data, offset + backward_offset)
+    strings = []
+    for record_offset in backward:
+        start = offset + record_offset + 8
+        (size,) = struct.unpack_from("<I", data, start - 4)
+        strings.append(data[start : start + size - 1].decode("utf-8"))
+
+    return strings
+
+
+def encode_features(features: dict[str, str | bool]) -> list[str]:
+    """Encode the features of a token as CRF attributes.
+
+    This is the same encoding that pycrfsuite applies to a dict of features:
+    a string value becomes the attribute "name:value" and a True value becomes the
+    attribute "name". False values are omitted because pycrfsuite gives them a weight
+    of 0, which has the same effect as the attribute not being present.
+
+    Parameters
+    ----------
+    features : dict[str, str | bool]
+        Features for a token.
+
+    Returns
+    -------
+    list[str]
+        Attributes for token.
+
+    Examples
+    --------
+    >>> encode_features({"bias": "", "stem": "cup", "is_unit": True, "is_punc": False})
+    ['bias:', 'stem:cup', 'is_unit']
+    """
+    return [
+        name if value is True else f"{name}:{value}"
+        for name, value in features.items()
+        if value is not False
+    ]
+
+
+class Marginals:
+    """Marginal probabilities of every label for every token of a tagged sentence.
+
+    This is the tokens x labels matrix of marginal probabilities for the sentence most
+    recently tagged by a pycrfsuite.Tagger. The marginals are computed lazily, the
+    first time each one is requested, and stored in a flat list so that no marginal is
+    computed more than once for the same tagged sentence.
+
+    The marginals can only be computed until the Tagger tags another sentence, so
+    request any marginals that are needed, or call matrix(), before then.
+
+    Parameters
+    ----------
+    tagger : pycrfsuite.Tagger
+        Tagger that has just tagged the sentence.
+    n_tokens : int
+        Number of tokens in the tagged sentence.
+    labels : list[str]
+        All labels the model can assign.
+
+    Attributes
+    ----------
+    n_tokens : int
+        Number of tokens in the tagged sentence.
+    labels : list[str]
+        All labels the model can assign.
+    """
+
+    def __init__(
+        self,
+        tagger: pycrfsuite.Tagger | None,  # type: ignore
+        n_tokens: int,
+        labels: list[str],
+    ):
+        self.n_tokens = n_tokens
+        self.labels = labels
+        self._tagger = tagger
+        self._label_index = {label: i for i, label in enumerate(labels)}
+        self._values: list[float | None] = [None] * (n_tokens * len(labels))
+
+    @classmethod
+    def from_values(
+        cls, values: list[float], n_tokens: int, labels: list[str]
+    ) -> "Marginals":
+        """Create Marginals from marginal probabilities that are already calculated.
+
+        Unlike Marginals created from a Tagger, these remain available after other
+        sentences are tagged.
+
+        Parameters
+        ----------
+        values : list[float]
+            Marginal probability of every label for every token, in token order then
+            label order.
+        n_tokens : int
+            Number of tokens in the tagged sentence.
+        labels : list[str]
+            All labels the model can assign.
+
+        Returns
+        -------
+        Marginals
+            Marginals for the sentence.
+        """
+        marginals = cls(None, n_tokens, labels)
+        marginals._values = list(values)
+        return marginals
+
+    def __getitem__(self, key: tuple[int, str]) -> float:
+        """Return the marginal probability of a label for a token.
+
+        Parameters
+        ----------
+        key : tuple[int, str]
+            Index of token and label.
+
+        Returns
+        -------
+        float
+            Marginal probability of the label for the token.
+        """
+        token, label = key
+        idx = token * len(self.labels) + self._label_index[label]
+        value = self._values[idx]
+        if value is None:
+            value = self._tagger.marginal(label, token)  # type: ignore
+            self._values[idx] = value
+
+        return value
+
+    def sequence(self, labels: list[str]) -> list[float]:
+        """Return the marginal probability of each token having the given label.
+
+        Parameters
+        ----------
+        labels : list[str]
+            Label for each token, e.g. the labels returned by the Tagger.
+
+        Returns
+        -------
+        list[float]
+            Marginal probability of the label for each token.
+        """
+        return [self[i, label] for i, label in enumerate(labels)]
+
+    def label(self, label: str) -> list[float]:
+        """Return the marginal probability of the label for every token.
+
+        Parameters
+        ----------
+        label : str
+            Label.
+
+        Returns
+        -------
+        list[float]
+            Marginal probability of the label for each token.
+        """
+        return [self[i, label] for i in range(self.n_tokens)]
+
+    def matrix(self) -> list[list[float]]:
+        """Return the marginal probability of every label for every token.
+
+        Returns
+        -------
+        list[list[float]]
+            List of the marginal probabilities of each label, in the order of the
+            labels attribute, for each token.
+        """
+        return [[self[i, label] for label in self.labels] for i in range(self.n_tokens)]
+
+
+class CRFWeights:
+    """Weights of a linear chain CRF model, for decoding label sequences in Python.
+
+    pycrfsuite only returns the single most likely label sequence for a sentence. This
+    class holds the state feature and transition weights read from a model so that the
+    k most likely label sequences can be found using k-best Viterbi decoding.
+
+    The weights are read once and never modified, so a CRFWeights object can be shared
+    between threads.
+
+    Parameters
+    ----------
+    labels : list[str]
+        All labels the model can assign.
+    state_features : dict[str, list[tuple[int, float]]]
+        For each attribute, the index of each label the attribute has a weight for and
+        the weight.
+    transitions : list[list[float]]
+        Weight of the transition from the label at the first index to the label at the
+        second index.
+
+    Attributes
+    ----------
+    labels : list[str]
+        All labels the model can assign.
+    """
+
+    def __init__(
+        self,
+        labels: list[str],
+        state_features: dict[str, list[tuple[int, float]]],
+        transitions: list[list[float]],
+    ):
+        self.labels = labels
+        self._state_features = state_features
+        self._transitions = transitions
+
+    @classmethod
+    def from_tagger(cls, tagger: pycrfsuite.Tagger) -> "CRFWeights":  # type: ignore
+        """Read the weights of the model opened by a Tagger.
+
+        Parameters
+        ----------
+        tagger : pycrfsuite.Tagger
+            Tagger with model opened.
+
+        Returns
+        -------
+        CRFWeights
+            Weights of model.
+        """
+        labels = tagger.labels()
+        label_index = {label: i for i, label in enumerate(labels)}
+        info = tagger.info()
+
+        state_features: dict[str, list[tuple[int, float]]] = {}
+        for (attr, label), weight in info.state_features.items():
+            state_features.setdefault(attr, []).append((label_index[label], weight))
+
+        transitions = [[0.0] * len(labels) for _ in labels]
+        for (from_label, to_label), weight in info.transitions.items():
+            transitions[label_index[from_label]][label_index[to_label]] = weight
+
+        return cls(labels, state_features, transitions)
+
+    def state_scores(self, features: SentenceFeatures) -> list[list[float]]:
+        """Return the score of every label for every token.
+
+        Parameters
+        ----------
+        features : SentenceFeatures
+            Features for each token of the sentence, as dicts or lists of attributes.
+
+        Returns
+        -------
+        list[list[float]]
+            Sum of the weights of the token's attributes for each label, for each
+            token.
+        """
+        scores = []
+        # ItemSequence converts features to attributes in the same way as Tagger.tag.
+        # Attributes given as strings have a value of 1.
+        for item in pycrfsuite.ItemSequence(features).items():  # type: ignore
+            token_scores = [0.0] * len(self.labels)
+            for attr, value in item.items():
+                for label_idx, weight in self._state_features.get(attr, ()):
+                    token_scores[label_idx] += weight * value
+            scores.append(token_scores)
+
+        return scores
+
+    def log_partition(self, state_scores: list[list[float]]) -> float:
+        """Return the log of the sum of the exponentiated scores of every sequence.
+
+        Calculated using the forward algorithm.
+
+        Parameters
+        ----------
+        state_scores : list[list[float]]
+            Score of every label for every token, from state_scores().
+
+        Returns
+        -------
+        float
+            Log partition function.
+        """
+        n_labels = len(self.labels)
+        alpha = state_scores[0]
+        for token_scores in state_scores[1:]:
+            next_alpha = []
+            for j in range(n_labels):
+                terms = [alpha[i] + self._transitions[i][j] for i in range(n_labels)]
+                m = max(terms)
+                log_sum = m + math.log(sum(math.exp(t - m) for t in terms))
+                next_alpha.append(log_sum + token_scores[j])
+            alpha = next_alpha
+
+        m = max(alpha)
+        return m + math.log(sum(math.exp(a - m) for a in alpha))
+
+    def nbest(
+        self, features: SentenceFeatures, k: int
+    ) -> list[tuple[list[str], float]]:
+        """Return the k most likely label sequences for a sentence.
+
+        This uses k-best Viterbi decoding: for each token and label, the k highest
+        scoring partial sequences ending in that label are kept, extended from the k
+        highest scoring partial sequences ending in each label at the previous token.
+        The cost is proportional to the number of tokens, the square of the number of
+        labels and k, instead of the number of possible label sequences.
+
+        Parameters
+        ----------
+        features : SentenceFeatures
+            Features for each token of the sentence, as dicts or lists of attributes.
+        k : int
+            Number of label sequences to return.
+
+        Returns
+        -------
+        list[tuple[list[str], float]]
+            Up to k label sequences and the probability of each, most likely first.
+            If the sentence has no tokens, the list is empty.
+        """
+        if k < 1:
+            raise ValueError("k must be at least one")
+
+        state_scores = self.state_scores(features)
+        if not state_scores:
+            return []
+
+        n_labels = len(self.labels)
+        # For each token and label, a list of the k best (score, previous label,
+        # index into the list of the previous label) tuples, highest score first.
+        beams = [[[(score, -1, -1)] for score in state_scores[0]]]
+        for token_scores in state_scores[1:]:
+            prev = beams[-1]
+            token_beams = []
+            for j in range(n_labels):
+                candidates = (
+                    (score + self._transitions[i][j], i, rank)
+                    for i in range(n_labels)
+                    for rank, (score, _, _) in enumerate(prev[i])
+                )
+                best = heapq.nlargest(k, candidates, key=itemgetter(0))
+                token_beams.append(
+                    [(score + token_scores[j], i, r) for score, i, r in best]
+                )
+            beams.append(token_beams)
+
+        finals = heapq.nlargest(
+            k,
+            (
+                (score, j, rank)
+                for j in range(n_labels)
+                for rank, (score, _, _) in enumerate(beams[-1][j])
+            ),
+            key=itemgetter(0),
+        )
+
+        log_z = self.log_partition(state_scores)
+        sequences = []
+        for score, j, rank in finals:
+            label_indices = []
+            for token_beams in reversed(beams):
+                label_indices.append(j)
+                _, j, rank = token_beams[j][rank]
+
+            labels = [self.labels[i] for i in reversed(label_indices)]
+            sequences.append((labels, math.exp(score - log_z)))
+
+        return sequences
+
+
+# Held whilst taggers are reloaded or pinned, so that taggers reloaded together are
+# always pinned together.
+_SWAP_LOCK = threading.Lock()
+
+
+class _LoadedModel:
+    """A model file and everything loaded from it, each loaded when first requested.
+
+    Everything is loaded from the same model file, so different threads can load
+    different parts at different times.
+
+    Parameters
+    ----------
+    model : Traversable
+        Path to CRF model file.
+
+    Attributes
+    ----------
+    model : Traversable
+        Path to CRF model file.
+    pinned : ThreadLocalTagger | None
+        Tagger that always uses this model, created by ThreadLocalTagger.pin().
+    """
+
+    def __init__(self, model: Traversable):
+        self.model = model
+        self.pinned: "ThreadLocalTagger | None" = None
+        self._model_bytes: bytes | None = None
+        self._model_hash: str | None = None
+        self._labels: list[str] | None = None
+        self._attributes: frozenset[str] | None = None
+        self._weights: CRFWeights | None = None
+        self._numpy_crf: "NumpyCRF | None" = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def loaded_weights(self) -> bool:
+        """Whether the CRFWeights have been loaded.
+
+        Returns
+        -------
+        bool
+            True if weights() has been called.
+        """
+        return self._weights is not None
+
+    @property
+    def loaded_numpy_crf(self) -> bool:
+        """Whether the NumpyCRF has been loaded.
+
+        Returns
+        -------
+        bool
+            True if numpy_crf() has been called.
+        """
+        return self._numpy_crf is not None
+
+    def read_model(self) -> bytes:
+        """Return the contents of the model file, reading it if not already read.
+
+        Returns
+        -------
+        bytes
+            Contents of model file.
+        """
+        if self._model_bytes is None:
+            with self._lock:
+                # Check again in case another thread read the model whilst this thread
+                # was waiting for the lock.
+                if self._model_bytes is None:
+                    self._model_bytes = self.model.read_bytes()
+
+        return self._model_bytes
+
+    def model_hash(self) -> str:
+        """Return the SHA-256 hash of the contents of the model file.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of model file contents.
+        """
+        if self._model_hash is None:
+            self._model_hash = hashlib.sha256(self.read_model()).hexdigest()
+
+        return self._model_hash
+
+    def attributes(self) -> frozenset[str]:
+        """Return the attributes the model has weights for.
+
+        Returns
+        -------
+        frozenset[str]
+            Attributes of model.
+
+        Raises
+        ------
+        ValueError
+            If the model file is not a crfsuite model.
+        """
+        if self._attributes is None:
+            data = self.read_model()
+            if data[:4] != b"lCRF":
+                raise ValueError("Model file is not a valid crfsuite model")
+
+            header = MODEL_HEADER.unpack_from(data, 0)
+            n_attributes, attributes_offset = header[6], header[9]
+            self._attributes = frozenset(
+                read_cqdb(data, attributes_offset, n_attributes)
+            )
+
+        return self._attributes
+
+    def get(self) -> pycrfsuite.Tagger:  # type: ignore
+        """Return the Tagger for the calling thread, creating it if necessary.
+
+        Returns
+        -------
+        pycrfsuite.Tagger
+            Tagger object, with model opened, for the calling thread.
+        """
+        tagger = getattr(self._local, "tagger", None)
+        if tagger is None:
+            tagger = pycrfsuite.Tagger()  # type: ignore
+            tagger.open_inmemory(self.read_model())
+            self._local.tagger = tagger
+
+        return tagger
+
+    def labels(self) -> list[str]:
+        """Return all labels the model can assign.
+
+        Returns
+        -------
+        list[str]
+            Labels of model.
+        """
+        if (labels := self._labels) is None:
+            labels = self._labels = self.get().labels()
+
+        return labels
+
+    def weights(self) -> CRFWeights:
+        """Return the weights of the model, reading them if not already read.
+
+        Returns
+        -------
+        CRFWeights
+            Weights of model, shared by all threads.
+        """
+        if self._weights is None:
+            tagger = self.get()
+            with self._lock:
+                # Check again in case another thread read the weights whilst this
+                # thread was waiting for the lock.
+                if self._weights is None:
+                    self._weights = CRFWeights.from_tagger(tagger)
+
+        return self._weights
+
+    def numpy_crf(self) -> "NumpyCRF":
+        """Return the model weights loaded into NumPy arrays, loading them if necessary.
+
+        Returns
+        -------
+        NumpyCRF
+            Model for the numpy backend, shared by all threads.
+
+        Raises
+        ------
+        ImportError
+            If numpy is not installed.
+        """
+        if self._numpy_crf is None:
+            try:
+                from ._numpy_tagger import NumpyCRF
+            except ImportError as e:
+                raise ImportError(
+                    'The numpy backend requires numpy. Install it with "python -m pip '
+                    'install ingredient_parser_nlp[numpy]".'
+                ) from e
+
+            model_bytes = self.read_model()
+            with self._lock:
+                # Check again in case another thread loaded the model whilst this
+                # thread was waiting for the lock.
+                if self._numpy_crf is None:
+                    self._numpy_crf = NumpyCRF.from_model(model_bytes)
+
+        return self._numpy_crf
+
+
+class ThreadLocalTagger:
+    """Provide a separate pycrfsuite.Tagger for each thread, sharing the same model.
+
+    A pycrfsuite.Tagger object is not safe to share between threads. Calling tag()
+    stores the state of the tagged sequence in the Tagger object, which subsequent
+    calls to marginal() read from. If two threads share a Tagger, one thread can tag a
+    sequence in between the other thread calling tag() and marginal(), resulting in the
+    wrong marginals being returned.
+
+    This class creates a Tagger object for each thread the first time that thread
+    requests one. The model file is only read once, and every Tagger opens the model
+    from the same in-memory buffer.
+
+    Use ThreadLocalTagger.shared() to get the ThreadLocalTagger for a model, so that
+    every user of the same model shares the same in-memory buffer and Taggers.
+    A ThreadLocalTagger is pickled by its model path, and is unpickled to the shared
+    ThreadLocalTagger for that model in the unpickling process.
+
+    The model can be replaced whilst the tagger is in use by calling reload(). Anything
+    that uses the tagger more than once for the same sentence, or batch of sentences,
+    should call pin() first and use the returned tagger instead, so that it uses the
+    same model throughout even if the tagger is reloaded part way through. Reloading
+    changes the model for every user of the tagger, so to change the model for only
+    one user, call load_all() to get a new tagger instead.
+
+    Parameters
+    ----------
+    model : Traversable
+        Path to CRF model file.
+    """
+
+    _shared: dict[str, "ThreadLocalTagger"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, model: Traversable):
+        self._loaded = _LoadedModel(model)
+        self._is_pinned = False
+
+    @classmethod
+    def shared(cls, model: Traversable) -> "ThreadLocalTagger":
+        """Return the shared ThreadLocalTagger for model, creating it if necessary.
+
+        Parameters
+        ----------
+        model : Traversable
+            Path to CRF model file.
+
+        Returns
+        -------
+        ThreadLocalTagger
+            ThreadLocalTagger for model, shared by all callers in this process.
+        """
+        with cls._shared_lock:
+            if (tagger := cls._shared.get(str(model))) is None:
+                tagger = cls(model)
+                cls._shared[str(model)] = tagger
+
+        return tagger
+
+    def __reduce__(self) -> tuple:
+        """Pickle by model path, unpickling to the shared ThreadLocalTagger.
+
+        Returns
+        -------
+        tuple
+            Callable and arguments to recreate object.
+        """
+        return (ThreadLocalTagger.shared, (self.model,))
+
+    def __repr__(self) -> str:
+        """__repr__ method.
+
+        Returns
+        -------
+        str
+            String representation of initialised object
+        """
+        return f'ThreadLocalTagger("{self.model}")'
+
+    @property
+    def model(self) -> Traversable:
+        """Path to the CRF model file the tagger currently uses.
+
+        Returns
+        -------
+        Traversable
+            Path to CRF model file.
+        """
+        return self._loaded.model
+
+    def pin(self) -> "ThreadLocalTagger":
+        """Return a tagger that always uses the model this tagger currently uses.
+
+        The returned tagger is not affected by later reloads of this tagger. Calling
+        pin() again before the next reload returns the same object, and calling pin()
+        on the returned tagger returns itself.
+
+        Returns
+        -------
+        ThreadLocalTagger
+            Tagger for the current model, which cannot be reloaded.
+        """
+        return ThreadLocalTagger._pin_loaded(self._loaded)
+
+    @classmethod
+    def pin_all(cls, *taggers: "ThreadLocalTagger") -> tuple["ThreadLocalTagger", ...]:
+        """Pin several taggers at once.
+
+        If the taggers are reloaded together by reload_all(), the returned taggers
+        either all use the models from before the reload, or all use the models from
+        after it.
+
+        Parameters
+        ----------
+        *taggers : ThreadLocalTagger
+            Taggers to pin.
+
+        Returns
+        -------
+        tuple[ThreadLocalTagger, ...]
+            Pinned tagger for each tagger, in the same order.
+        """
+        with _SWAP_LOCK:
+            snapshot = [tagger._loaded for tagger in taggers]
+
+        return tuple(cls._pin_loaded(loaded) for loaded in snapshot)
+
+    @staticmethod
+    def _pin_loaded(loaded: _LoadedModel) -> "ThreadLocalTagger":
+        """Return the pinned tagger for a loaded model, creating it if necessary.
+
+        Parameters
+        ----------
+        loaded : _LoadedModel
+            Loaded model.
+
+        Returns
+        -------
+        ThreadLocalTagger
+            Tagger that always uses the loaded model.
+        """
+        if (pinned := loaded.pinned) is None:
+            with _SWAP_LOCK:
+                # Check again in case another thread pinned the model whilst this
+                # thread was waiting for the lock.
+                if (pinned := loaded.pinned) is None:
+                    pinned = ThreadLocalTagger.__new__(ThreadLocalTagger)
+                    pinned._loaded = loaded
+                    pinned._is_pinned = True
+                    loaded.pinned = pinned
+
+        return pinned
+
+    def reload(self, model: Traversable | None = None) -> bool:
+        """Replace the model the tagger uses.
+
+        Parameters
+        ----------
+        model : Traversable | None, optional
+            Path to new CRF model file. If None, the current model file is read
+            again.
+            Default is None.
+
+        Returns
+        -------
+        bool
+            True if the model was replaced, False if the model file is the same as the
+            one the tagger already uses.
+
+        Raises
+        ------
+        ValueError
+            If this tagger was returned by pin(), or the model file is not a crfsuite
+            model.
+
+        See Also
+        --------
+        reload_all
+        """
+        return ThreadLocalTagger.reload_all([(self, model)])
+
+    @classmethod
+    def reload_all(
+        cls, reloads: Iterable[tuple["ThreadLocalTagger", Traversable | None]]
+    ) -> bool:
+        """Replace the models several taggers use, all at once.
+
+        Every new model file is read and checked before any tagger is changed, so if
+        any file cannot be read or is not a crfsuite model, every tagger continues to
+        use its current model. Anything already loaded from the current model of a
+        tagger is loaded from the new model before the taggers are changed, so the
+        first sentences tagged with the new models are not slower.
+
+        Sentences that are already being tagged, and taggers returned by pin() before
+        the reload, continue to use the previous models.
+
+        Every user of a reloaded tagger uses the new model. If a tagger returned by
+        shared() is reloaded with a different model file, it is no longer returned by
+        shared() for its previous model file.
+
+        Parameters
+        ----------
+        reloads : Iterable[tuple[ThreadLocalTagger, Traversable | None]]
+            Each tagger to reload and the path to its new model file. If the path is
+            None, the current model file is read again.
+
+        Returns
+        -------
+        bool
+            True if any model was replaced, False if every model file is the same as
+            the one the tagger already uses.
+
+        Raises
+        ------
+        ValueError
+            If any tagger was returned by pin(), or any model file is not a crfsuite
+            model.
+
+        See Also
+        --------
+        load_all
+        """
+        replacements = [
+            (tagger, loaded)
+            for tagger, loaded in cls._load_replacements(reloads)
+            if loaded is not None
+        ]
+
+        with _SWAP_LOCK, cls._shared_lock:
+            for tagger, loaded in replacements:
+                # The shared tagger for a model file must always use that model file.
+                key = str(tagger.model)
+                if key != str(loaded.model) and cls._shared.get(key) is tagger:
+                    del cls._shared[key]
+                tagger._loaded = loaded
+
+        return bool(replacements)
+
+    @classmethod
+    def load_all(
+        cls, reloads: Iterable[tuple["ThreadLocalTagger", Traversable | None]]
+    ) -> tuple["ThreadLocalTagger", ...]:
+        """Return new taggers for new models, without changing the current taggers.
+
+        This is the same as reload_all(), except that the taggers are not changed, so
+        anything else using them continues to use the current models. Instead, a new
+        tagger is returned for each model that is replaced.
+
+        Parameters
+        ----------
+        reloads : Iterable[tuple[ThreadLocalTagger, Traversable | None]]
+            Each current tagger and the path to its new model file. If the path is
+            None, the current model file is read again.
+
+        Returns
+        -------
+        tuple[ThreadLocalTagger, ...]
+            Tagger for each new model, in the same order. If the model file is the
+            same as the one the current tagger uses, the current tagger is returned.
+
+        Raises
+        ------
+        ValueError
+            If any tagger was returned by pin(), or any model file is not a crfsuite
+            model.
+        """
+        taggers = []
+        for tagger, loaded in cls._load_replacements(reloads):
+            if loaded is not None:
+                tagger = ThreadLocalTagger.__new__(ThreadLocalTagger)
+                tagger._loaded = loaded
+                tagger._is_pinned = False
+            taggers.append(tagger)
+
+        return tuple(taggers)
+
+    @staticmethod
+    def _load_replacements(
+        reloads: Iterable[tuple["ThreadLocalTagger", Traversable | None]],
+    ) -> list[tuple["ThreadLocalTagger", _LoadedModel | None]]:
+        """Read and check the new model for each tagger.
+
+        Parameters
+        ----------
+        reloads : Iterable[tuple[ThreadLocalTagger, Traversable | None]]
+            Each tagger and the path to its new model file. If the path is None, the
+            current model file is read again.
+
+        Returns
+        -------
+        list[tuple[ThreadLocalTagger, _LoadedModel | None]]
+            Each tagger and its new loaded model, or None if the model file is the same
+            as the one the tagger already uses.
+
+        Raises
+        ------
+        ValueError
+            If any tagger was returned by pin(), or any model file is not a crfsuite
+            model.
+        """
+        replacements = []
+        for tagger, model in reloads:
+            if tagger._is_pinned:
+                raise ValueError("A pinned ThreadLocalTagger cannot be reloaded")
+
+            current = tagger._loaded
+            loaded = _LoadedModel(current.model if model is None else model)
+            # Reading the attributes checks the model header and opening a Tagger
+            # checks the rest of the model.
+            loaded.attributes()
+            if not loaded.labels():
+                raise ValueError("Model file is not a valid crfsuite model")
+            if (
+                str(loaded.model) == str(current.model)
+                and loaded.model_hash() == current.model_hash()
+            ):
+                replacements.append((tagger, None))
+                continue
+
+            if current.loaded_weights:
+                loaded.weights()
+            if current.loaded_numpy_crf:
+                loaded.numpy_crf()
+
+            replacements.append((tagger, loaded))
+
+        return replacements
+
+    @property
+    def model_hash(self) -> str:
+        """SHA-256 hash of the contents of the model file.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of model file contents.
+        """
+        return self._loaded.model_hash()
+
+    @property
+    def attributes(self) -> frozenset[str]:
+        """Attributes the model has weights for, read from the model file once.
+
+        Any other attribute has no effect on the labels or marginals the model gives a
+        sentence.
+
+        Returns
+        -------
+        frozenset[str]
+            Attributes of model.
+
+        Raises
+        ------
+        ValueError
+            If the model file is not a crfsuite model.
+        """
+        return self._loaded.attributes()
+
+    def get(self) -> pycrfsuite.Tagger:  # type: ignore
+        """Return the Tagger for the calling thread, creating it if necessary.
+
+        Returns
+        -------
+        pycrfsuite.Tagger
+            Tagger object, with model opened, for the calling thread.
+        """
+        return self._loaded.get()
+
+    def tag(
+        self, features: SentenceFeatures, backend: str = "crfsuite"
+    ) -> tuple[list[str], Marginals]:
+        """Tag a sentence using the Tagger for the calling thread.
+
+        Parameters
+        ----------
+        features : SentenceFeatures
+            Features for each token of the sentence, as dicts or lists of attributes.
+        backend : str, optional
+            Inference backend to tag the sentence with, one of BACKENDS.
+            Default is "crfsuite".
+
+        Returns
+        -------
+        list[str]
+            Label for each token.
+        Marginals
+            Marginal probabilities of every label for every token of the sentence.
+            For the crfsuite backend, these are only available until the calling thread
+            tags another sentence with this ThreadLocalTagger.
+
+        Raises
+        ------
+        ValueError
+            If backend is not one of BACKENDS.
+        """
+        loaded = self._loaded
+        if backend == "numpy":
+            return loaded.numpy_crf().tag(features)
+        elif backend != "crfsuite":
+            raise ValueError(f'Unrecognised backend "{backend}"')
+
+        tagger = loaded.get()
+        labels = tagger.tag(features)
+        return labels, Marginals(tagger, len(labels), loaded.labels())
+
+    @property
+    def weights(self) -> CRFWeights:
+        """Weights of the model, read the first time they are requested.
+
+        Returns
+        -------
+        CRFWeights
+            Weights of model, shared by all threads.
+        """
+        return self._loaded.weights()
+
+    def nbest(
+        self, features: SentenceFeatures, k: int
+    ) -> list[tuple[list[str], float]]:
+        """Return the k most likely label sequences for a sentence.
+
+        Parameters
+        ----------
+        features : SentenceFeatures
+            Features for each token of the sentence, as dicts or lists of attributes.
+        k : int
+            Number of label sequences to return.
+
+        Returns
+        -------
+        list[tuple[list[str], float]]
+            Up to k label sequences and the probability of each, most likely first.
+        """
+        return self.weights.nbest(features, k)
+
+    @property
+    def numpy_crf(self) -> "NumpyCRF":
+        """Model weights loaded into NumPy arrays, read the first time requested.
+
+        Returns
+        -------
+        NumpyCRF
+            Model for the numpy backend, shared by all threads.
+
+        Raises
+        ------
+        ImportError
+            If numpy is not installed.
+        """
+        return self._loaded.numpy_crf()
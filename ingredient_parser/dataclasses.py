@@ -190,6 +190,25 @@ class FoudationFood:
     confidence: float
 
 
+@dataclass
+class LabelSequence:
+    """Dataclass for holding one possible labelling of a sentence's tokens.
+
+    Attributes
+    ----------
+    tokens : list[str]
+        Tokens of the pre-processed input sentence.
+    labels : list[str]
+        Label for each token.
+    probability : float
+        Probability of this label sequence according to the model, between 0 and 1.
+    """
+
+    tokens: list[str]
+    labels: list[str]
+    probability: float
+
+
 @dataclass
 class ParsedIngredient:
     """Dataclass for holding the parsed values for an input sentence.
@@ -247,6 +266,12 @@ class ParserDebugInfo:
         List of foundation foods extracted from parsed ingredient name, or None.
     Tagger : pycrfsuite.Tagger
         CRF model tagger object.
+    marginals : list[list[float]]
+        Marginal probability of every label for every token, in the order of the
+        labels returned by tagger.labels().
+    nbest : list[LabelSequence]
+        Most likely label sequences for the sentence, most likely first.
+        Empty unless requested.
     """
 
     sentence: str
@@ -254,3 +279,5 @@ class ParserDebugInfo:
     PostProcessor: Any
     foundation_foods: list[FoudationFood]
     tagger: pycrfsuite.Tagger  # type: ignore
+    marginals: list[list[float]] = field(default_factory=list)
+    nbest: list[LabelSequence] = field(default_factory=list)
@@ -1,10 +1,25 @@
-from .parser import inspect_parser_en, parse_ingredient_en
+from .parser import (
+    inspect_parser_en,
+    iter_parse_ingredients_en,
+    nbest_labels_en,
+    nbest_labels_multiple_en,
+    parse_ingredient_en,
+    parse_multiple_ingredients_en,
+    reload_models_en,
+    warmup_en,
+)
 from .postprocess import PostProcessor
 from .preprocess import PreProcessor
 
 __all__ = [
     "inspect_parser_en",
+    "iter_parse_ingredients_en",
+    "nbest_labels_en",
+    "nbest_labels_multiple_en",
     "parse_ingredient_en",
+    "parse_multiple_ingredients_en",
     "PreProcessor",
     "PostProcessor",
+    "reload_models_en",
+    "warmup_en",
 ]
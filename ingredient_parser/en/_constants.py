@@ -112,6 +112,8 @@ _capitalized_units = {}
 for plural, singular in UNITS.items():
     _capitalized_units[plural.capitalize()] = singular.capitalize()
 UNITS = UNITS | _capitalized_units
+# Plural of each singular unit in UNITS, for pluralising units
+PLURAL_UNITS = {singular: plural for plural, singular in UNITS.items()}
 # Create a flattened list of all keys and values in UNITS dict
 # since we need this in a few places
 FLATTENED_UNITS_LIST = list(chain.from_iterable(UNITS.items()))
@@ -152,6 +154,21 @@ for amb_unit in AMBIGUOUS_UNITS:
 
 AMBIGUOUS_UNITS.extend(_ambiguous_units_alt_forms)
 
+# Abbreviated units that can be written with a trailing period e.g. tsp.
+# Extend list automatically to include capitalized forms
+UNITS_WITH_TRAILING_PERIOD = [
+    "tsp",
+    "tsps",
+    "tbsp",
+    "tbsps",
+    "tbs",
+    "tb",
+    "lb",
+    "lbs",
+    "oz",
+]
+UNITS_WITH_TRAILING_PERIOD.extend([u.capitalize() for u in UNITS_WITH_TRAILING_PERIOD])
+
 
 # Strings and their numeric representation
 STRING_NUMBERS = {
@@ -225,6 +242,20 @@ UNICODE_FRACTIONS = {
     "\xbd": " 1/2",
 }
 
+# Replacements for en dashes, em dashes and unicode fractions, including unicode
+# fractions preceded by an en dash. Replacing each of these in a single pass gives the
+# same result as replacing the dashes with hyphens, then replacing UNICODE_FRACTIONS.
+DASH_AND_FRACTION_REPLACEMENTS = {
+    "\u2013": "-",
+    "\u2014": " - ",
+    **UNICODE_FRACTIONS,
+    **{
+        "\u2013" + fraction[1:]: replacement
+        for fraction, replacement in UNICODE_FRACTIONS.items()
+        if fraction.startswith("-")
+    },
+}
+
 # Stop words - high frequency grammatical words
 # Taken from nltk.corpus.stopwords
 STOP_WORDS = {
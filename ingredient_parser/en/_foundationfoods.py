@@ -1,38 +1,41 @@
 #!/usr/bin/env python3
 
 from collections import defaultdict
-from importlib.resources import as_file, files
+from importlib.resources import files
 from itertools import groupby
 from statistics import mean
 
 import pycrfsuite
 
 from .._common import group_consecutive_idx
+from .._tagger import SentenceFeatures, ThreadLocalTagger
 from ..dataclasses import FoudationFood
 
 # Create FF_TAGGER object that can be reused between function calls.
 # We only want to load the model into FF_TAGGER once, but only do it
 # when we need to (from parse_ingredient() or inspect_parser()) and
 # not whenever anything from ingredient_parser is imported.
-FF_TAGGER = pycrfsuite.Tagger()  # type: ignore
+# Each thread gets its own pycrfsuite.Tagger from FF_TAGGER, so parsing is thread safe.
+FF_TAGGER = ThreadLocalTagger.shared(files(__package__) / "ff_model.en.crfsuite")
 
 
-def load_ffmodel_if_not_loaded():
-    """Load foundation foods model into FF_TAGGER variable if not loaded.
+def load_ffmodel_if_not_loaded() -> pycrfsuite.Tagger:  # type: ignore
+    """Return the foundation foods Tagger for the calling thread, loading the model if
+    not loaded.
 
-    There isn't a simple way to check if the model if loaded or not, so
-    we try to call FF_TAGGER.labels() which will raise a ValueError if the
-    model is not loaded yet.
+    Returns
+    -------
+    pycrfsuite.Tagger
+        Tagger object, with the foundation foods model opened, for the calling thread.
     """
-    try:
-        FF_TAGGER.labels()
-    except ValueError:
-        with as_file(files(__package__) / "ff_model.en.crfsuite") as p:
-            FF_TAGGER.open(str(p))
+    return FF_TAGGER.get()
 
 
 def join_adjacent_FF_tokens(
-    labels: list[str], tokens: list[str], scores: list[float]
+    labels: list[str],
+    tokens: list[str],
+    scores: list[float],
+    confidence: bool = True,
 ) -> list[FoudationFood]:
     """Join adjacent tokens labelled as FF into strings.
 
@@ -44,6 +47,10 @@ def join_adjacent_FF_tokens(
         List of NAME tokens
     scores : list[float]
         List of confidence scores for labels
+    confidence : bool, optional
+        If True, set the confidence of each foundation food to the mean score of its
+        tokens. If False, the scores are ignored and the confidence is 0.
+        Default is True.
 
     Returns
     -------
@@ -64,10 +71,13 @@ def join_adjacent_FF_tokens(
             continue
 
         group = list(group)
-        score = mean([score for _, _, score in group])
+        if confidence:
+            score = round(mean([score for _, _, score in group]), 6)
+        else:
+            score = 0
 
         foundation_foods.append(
-            FoudationFood(" ".join([tok for _, tok, _ in group]), round(score, 6))
+            FoudationFood(" ".join([tok for _, tok, _ in group]), score)
         )
 
     return foundation_foods
@@ -75,6 +85,7 @@ def join_adjacent_FF_tokens(
 
 def deduplicate_foundation_foods(
     foundation_foods: list[FoudationFood],
+    confidence: bool = True,
 ) -> list[FoudationFood]:
     """Deduplicate foundation foods by averaging the score of duplicates.
 
@@ -82,6 +93,10 @@ def deduplicate_foundation_foods(
     ----------
     foundation_foods : list[FoudationFood]
         List of foundation foods found in ingredient name.
+    confidence : bool, optional
+        If True, average the confidence of duplicates. If False, the confidence of
+        every foundation food is 0.
+        Default is True.
 
     Returns
     -------
@@ -89,6 +104,12 @@ def deduplicate_foundation_foods(
         Description
     """
 
+    if not confidence:
+        return [
+            FoudationFood(name, 0)
+            for name in dict.fromkeys(ff.text for ff in foundation_foods)
+        ]
+
     seen_foods = defaultdict(list)
     for ff in foundation_foods:
         seen_foods[ff.text].append(ff.confidence)
@@ -100,7 +121,12 @@ def deduplicate_foundation_foods(
 
 
 def extract_foundation_foods(
-    tokens: list[str], labels: list[str], features: list[dict[str, str | bool]]
+    tokens: list[str],
+    labels: list[str],
+    features: SentenceFeatures,
+    ff_tagger: ThreadLocalTagger = FF_TAGGER,
+    confidence: bool = True,
+    backend: str = "crfsuite",
 ) -> list[FoudationFood]:
     """Extract foundation foods from tokens labelled as NAME.
 
@@ -110,16 +136,26 @@ def extract_foundation_foods(
         Sentence tokens
     labels : list[str]
         Labels for sentence tokens
-    features : list[dict[str, str | bool]]
-        Features for sentence tokens
+    features : SentenceFeatures
+        Features for sentence tokens, as dicts or lists of attributes
+    ff_tagger : ThreadLocalTagger, optional
+        Tagger for the foundation foods model.
+        Default is the tagger for the foundation foods model distributed with this
+        package.
+    confidence : bool, optional
+        If True, calculate the confidence of each foundation food from the marginal
+        probabilities of its labels. If False, no marginal probabilities are
+        calculated and the confidence of every foundation food is 0.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the name tokens.
+        Default is "crfsuite".
 
     Returns
     -------
     list[FoudationFood]
         List of foundation foods.
     """
-    load_ffmodel_if_not_loaded()
-
     name_idx = [idx for idx, label in enumerate(labels) if label == "NAME"]
     name_tokens = [tok for tok, label in zip(tokens, labels) if label == "NAME"]
     name_features = [feat for feat, label in zip(features, labels) if label == "NAME"]
@@ -135,13 +171,14 @@ def extract_foundation_foods(
         group = list(group)
         name_tokens = [tok for idx, tok in enumerate(tokens) if idx in group]
         name_features = [feat for idx, feat in enumerate(features) if idx in group]
-        ff_labels = FF_TAGGER.tag(name_features)
-        name_scores = [
-            FF_TAGGER.marginal(label, i) for i, label in enumerate(ff_labels)
-        ]
+        ff_labels, marginals = ff_tagger.tag(name_features, backend)
+        if confidence:
+            name_scores = marginals.sequence(ff_labels)
+        else:
+            name_scores = [0.0] * len(ff_labels)
 
         foundation_foods.extend(
-            join_adjacent_FF_tokens(ff_labels, name_tokens, name_scores)
+            join_adjacent_FF_tokens(ff_labels, name_tokens, name_scores, confidence)
         )
 
-    return deduplicate_foundation_foods(foundation_foods)
+    return deduplicate_foundation_foods(foundation_foods, confidence)
@@ -1,14 +1,139 @@
 #!/usr/bin/env python3
 
 import re
+from typing import Callable, Iterable
 
-from ._constants import FLATTENED_UNITS_LIST, STRING_NUMBERS
+from ._constants import (
+    FLATTENED_UNITS_LIST,
+    STRING_NUMBERS,
+    UNICODE_FRACTIONS,
+    UNITS_WITH_TRAILING_PERIOD,
+)
 
 # Regex pattern for fraction parts.
 # Matches 0+ numbers followed by 0+ white space characters followed by a number then
 # a forward slash then another number.
 FRACTION_PARTS_PATTERN = re.compile(r"(\d*\s*\d/\d+)")
 
+
+def trie_alternation(words: Iterable[str]) -> str:
+    """Return a regex that matches any of the words, built from a prefix trie.
+
+    Words that share a prefix share the same branch of the regex, so the regex engine
+    only tries the alternatives that start with the characters it has already
+    matched, instead of trying every word at every position. Duplicate words are
+    removed. Where one word is a prefix of another, the longer word is tried first.
+
+    Parameters
+    ----------
+    words : Iterable[str]
+        Words to match.
+
+    Returns
+    -------
+    str
+        Regex matching any of the words.
+
+    Examples
+    --------
+    >>> trie_alternation(["cup", "cups", "can", "cup"])
+    "c(?:an|ups?)"
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        # An empty key marks the end of a word
+        node[""] = {}
+
+    def to_regex(node: dict) -> str:
+        branches = [
+            re.escape(char) + to_regex(node[char]) for char in sorted(node) if char
+        ]
+        if not branches:
+            return ""
+
+        if len(branches) == 1 and ("" not in node or len(branches[0]) == 1):
+            regex = branches[0]
+        else:
+            regex = "(?:" + "|".join(branches) + ")"
+        # The word ends here, but may continue. The greedy ? tries the longer words
+        # first.
+        return regex + "?" if "" in node else regex
+
+    return to_regex(trie)
+
+
+class LazyPattern:
+    """Regex pattern that is compiled the first time it is used.
+
+    Any attribute of the compiled pattern, such as sub or finditer, can be used as if
+    this were the compiled pattern. The attribute is stored on this object the first
+    time it is used, so using it again is as fast as using the compiled pattern.
+    Compiling the same pattern more than once from different threads is harmless.
+
+    Parameters
+    ----------
+    pattern : Callable[[], str]
+        Function that returns the regex to compile.
+    flags : int, optional
+        Flags to compile the regex with.
+        Default is 0.
+    """
+
+    def __init__(self, pattern: Callable[[], str], flags: int = 0):
+        self._pattern = pattern
+        self._flags = flags
+        self._compiled: re.Pattern[str] | None = None
+
+    def compile(self) -> re.Pattern[str]:
+        """Compile the pattern, if it has not already been compiled.
+
+        Returns
+        -------
+        re.Pattern[str]
+            Compiled pattern.
+        """
+        if self._compiled is None:
+            self._compiled = re.compile(self._pattern(), self._flags)
+        return self._compiled
+
+    def __getattr__(self, name: str):
+        """Return an attribute of the compiled pattern.
+
+        Parameters
+        ----------
+        name : str
+            Attribute name.
+
+        Returns
+        -------
+        Any
+            Attribute of compiled pattern.
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        value = getattr(self.compile(), name)
+        setattr(self, name, value)
+        return value
+
+
+# Regex pattern to match hyphens, en dashes, em dashes and unicode fractions, where a
+# hyphen or en dash can be followed by a unicode fraction. A hyphen or en dash followed
+# by a fraction is matched together with the fraction. Each match, apart from a hyphen
+# on its own, is a key of DASH_AND_FRACTION_REPLACEMENTS.
+# The pattern starts with a character set so that sentences without any of these
+# characters are scanned quickly.
+unicode_fractions = "".join(f for f in UNICODE_FRACTIONS if len(f) == 1)
+DASH_AND_FRACTION_PATTERN = re.compile(
+    rf"[\-\u2013\u2014{unicode_fractions}](?:(?<=[\-\u2013])[{unicode_fractions}])?"
+)
+
+# Regex pattern for matching each word in a sentence.
+WORD_PATTERN = re.compile(r"\w+")
+
 # Regex pattern for checking if token starts with a capital letter.
 CAPITALISED_PATTERN = re.compile(r"^[A-Z]")
 
@@ -16,18 +141,48 @@ CAPITALISED_PATTERN = re.compile(r"^[A-Z]")
 # Add additional strings to units list that aren't necessarily units, but we want to
 # treat them like units for the purposes of splitting quantities from units.
 units_list = FLATTENED_UNITS_LIST + ["in", "x"]
-QUANTITY_UNITS_PATTERN = re.compile(rf"(\d)\-?({'|'.join(units_list)})")
-UNITS_QUANTITY_PATTERN = re.compile(rf"({'|'.join(units_list)})(\d)")
-UNITS_HYPHEN_QUANTITY_PATTERN = re.compile(rf"({'|'.join(units_list)})\-(\d)")
-STRING_QUANTITY_HYPHEN_PATTERN = re.compile(
-    rf"""
-    \b({'|'.join(STRING_NUMBERS.keys())})\b  # Capture string number
+# This matches, in a single pass:
+#   <quantity><unit> and <quantity>-<unit>, where a space replaces the hyphen
+#   <unit><quantity>, where a space is inserted
+#   <unit>-<quantity>, where spaces are inserted around the hyphen
+# The quantity or unit following each match is only looked ahead at, and not
+# consumed, so that a quantity between two units or a unit between two quantities
+# is also matched as the start of the next match. This gives the same result as
+# applying a separate pattern for each case, one after the other.
+# The units are matched using a trie of units_list. Every unit is alphabetic and must
+# be followed by a hyphen or digit, so at most one unit can match at any position and
+# the order the units are tried in doesn't change the matches.
+QUANTITY_UNITS_BOUNDARY_PATTERN = LazyPattern(
+    lambda: (
+        rf"""
+    (\d)\-?(?={trie_alternation(units_list)})  # Capture quantity followed by unit
+    |
+    ({trie_alternation(units_list)})(\-)?(?=\d)  # Capture unit followed by quantity
+    """
+    ),
+    re.VERBOSE,
+)
+STRING_QUANTITY_HYPHEN_PATTERN = LazyPattern(
+    lambda: (
+        rf"""
+    \b({"|".join(STRING_NUMBERS.keys())})\b  # Capture string number
     \-                                       # Followed by hyphen
-    \b({'|'.join(units_list)})\b             # Followed by unit
-    """,
+    \b({trie_alternation(unit.lower() for unit in units_list)})\b  # Followed by unit
+    """
+    ),
     re.VERBOSE | re.IGNORECASE,
 )
 
+# Regex pattern to match the period after a unit in UNITS_WITH_TRAILING_PERIOD.
+# The pattern starts with the period and checks the unit before it with a lookbehind,
+# so that the sentence is only scanned for periods, instead of trying to match every
+# unit at every position.
+UNIT_TRAILING_PERIOD_PATTERN = re.compile(
+    r"\.(?:"
+    + "|".join(rf"(?<={re.escape(unit)}\.)" for unit in UNITS_WITH_TRAILING_PERIOD)
+    + ")"
+)
+
 # Regex pattern for matching a range in string format e.g. 1 to 2, 8.5 to 12, 4 or 5.
 # Assumes fake fractions and unicode fraction have already been replaced.
 # Allows the range to include a hyphen, which are captured in separate groups.
@@ -96,6 +251,11 @@ QUANTITY_X_PATTERN = re.compile(
 # e.g. 0.5 - 1. The numbers are captured in capture groups.
 EXPANDED_RANGE = re.compile(r"(\d)\s*\-\s*(\d)")
 
+# Regex patterns for checking which characters a sentence contains before it is
+# normalised. \d matches any unicode decimal digit, not only 0-9.
+ANY_DIGIT_PATTERN = re.compile(r"\d")
+UNICODE_FRACTION_PATTERN = re.compile(rf"[{unicode_fractions}]")
+
 LOWERCASE_PATTERN = re.compile(r"[a-z]")
 UPPERCASE_PATTERN = re.compile(r"[A-Z]")
 DIGIT_PATTERN = re.compile(r"[0-9]")
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import copyreg
 import re
 from fractions import Fraction
 from functools import lru_cache
@@ -10,11 +11,38 @@ import pint
 
 from .._common import download_nltk_resources, is_float, is_range
 from ..dataclasses import IngredientAmount
-from ._constants import UNITS
-from ._regex import FRACTION_SPLIT_AND_PATTERN, STRING_RANGE_PATTERN
+from ._constants import PLURAL_UNITS
+from ._regex import FRACTION_SPLIT_AND_PATTERN, STRING_RANGE_PATTERN, WORD_PATTERN
 
 UREG = pint.UnitRegistry()
 
+
+def _unpickle_unit(units: pint.util.UnitsContainer | str) -> pint.Unit:
+    """Recreate a pint.Unit in UREG from its units.
+
+    Parameters
+    ----------
+    units : pint.util.UnitsContainer | str
+        Units container of unit, or string representation of unit.
+
+    Returns
+    -------
+    pint.Unit
+        Unit in UREG.
+    """
+    return UREG.Unit(units)
+
+
+# By default, pint.Unit objects are unpickled into pint's application registry, which
+# cannot be compared with units from UREG. Pickle units from UREG by their units
+# container so they are recreated in UREG, for example when parsed ingredients are
+# returned from worker processes. The container keeps the order of the units in a
+# compound unit, which parsing the string representation does not, so the unpickled
+# unit has the same repr and str as the original.
+copyreg.pickle(
+    UREG.Unit, lambda unit: (_unpickle_unit, (pint.util.to_units_container(unit),))
+)
+
 # Dict mapping certain units to their imperial version in pint
 IMPERIAL_UNITS = {
     "cup": "imperial_cup",
@@ -142,10 +170,14 @@ def stem(token: str) -> str:
     return STEMMER.stem(token)
 
 
+@lru_cache(maxsize=512)
 def pluralise_units(sentence: str) -> str:
     """Pluralise units in the sentence.
 
-    Use the same UNITS dictionary as PreProcessor to make any units in sentence plural
+    Use the same UNITS dictionary as PreProcessor to make any units in sentence plural.
+    Each word in the sentence is looked up in PLURAL_UNITS, so the sentence is only
+    scanned once. The result is cached because the same units and amounts appear in
+    many sentences.
 
     Parameters
     ----------
@@ -169,17 +201,21 @@ def pluralise_units(sentence: str) -> str:
     >>> pluralise_units("1.5 loaf bread")
     '1.5 loaves bread'
     """
-    for plural, singular in UNITS.items():
-        sentence = re.sub(rf"\b({singular})\b", f"{plural}", sentence)
-
-    return sentence
+    return WORD_PATTERN.sub(
+        lambda match: PLURAL_UNITS.get(match.group(), match.group()), sentence
+    )
 
 
+@lru_cache(maxsize=512)
 def convert_to_pint_unit(unit: str, imperial_units: bool = False) -> str | pint.Unit:
     """Convert a unit to a pint.Unit object, if possible.
 
     If the unit is not found in the pint Unit Registry, just return the input unit.
 
+    The result is cached because the same units appear in many sentences and looking
+    up a unit in the pint Unit Registry is slow. pint.Unit objects are immutable, so
+    the cached objects are safe to share between parsed sentences.
+
     Parameters
     ----------
     unit : str
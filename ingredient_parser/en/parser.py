@@ -1,13 +1,30 @@
 #!/usr/bin/env python3
 
-from importlib.resources import as_file, files
+import collections
+import concurrent.futures as cf
+import copy
+import time
+from functools import lru_cache, partial
+from importlib.resources import files
+from importlib.resources.abc import Traversable
+from typing import Callable, Iterable, Iterator
 
 import pycrfsuite
+from nltk import pos_tag
 
-from .._common import group_consecutive_idx
-from ..dataclasses import ParsedIngredient, ParserDebugInfo
-from ._foundationfoods import extract_foundation_foods
-from ._utils import pluralise_units
+from .._cache import ParseCache
+from .._common import chunked, deduplicate, group_consecutive_idx, record_dedup
+from .._tagger import Marginals, SentenceFeatures, ThreadLocalTagger
+from ..dataclasses import (
+    FoudationFood,
+    LabelSequence,
+    ParsedIngredient,
+    ParserDebugInfo,
+)
+from ._constants import UNITS
+from ._foundationfoods import FF_TAGGER, extract_foundation_foods
+from ._regex import QUANTITY_UNITS_BOUNDARY_PATTERN, STRING_QUANTITY_HYPHEN_PATTERN
+from ._utils import convert_to_pint_unit, pluralise_units, stem
 from .postprocess import PostProcessor
 from .preprocess import PreProcessor
 
@@ -15,21 +32,33 @@ from .preprocess import PreProcessor
 # We only want to load the model into TAGGER once, but only do it
 # when we need to (from parse_ingredient() or inspect_parser()) and
 # not whenever anything from ingredient_parser is imported.
-TAGGER = pycrfsuite.Tagger()  # type: ignore
+# Each thread gets its own pycrfsuite.Tagger from TAGGER, so parsing is thread safe.
+TAGGER = ThreadLocalTagger.shared(files(__package__) / "model.en.crfsuite")
 
+# Sentences parsed by warmup_en to exercise the pre-processing, tagging and
+# post-processing code paths before the first real sentence is parsed.
+WARMUP_SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "1 28 ounce can chopped tomatoes",
+    "1 lb 2 oz butter, softened",
+    "1/2 - 3/4 cup milk or fortified soy milk",
+    "1 1/2 cups (190 grams) all-purpose flour",
+    "2 large eggs, lightly beaten",
+    "salt and freshly ground black pepper, to taste",
+    "For the garnish",
+]
 
-def load_model_if_not_loaded():
-    """Load model into TAGGER variable if not loaded.
 
-    There isn't a simple way to check if the model if loaded or not, so
-    we try to call TAGGER.labels() which will raise a ValueError if the
-    model is not loaded yet.
+def load_model_if_not_loaded() -> pycrfsuite.Tagger:  # type: ignore
+    """Return the Tagger for the calling thread, loading the model if not loaded.
+
+    Returns
+    -------
+    pycrfsuite.Tagger
+        Tagger object, with the parser model opened, for the calling thread.
     """
-    try:
-        TAGGER.labels()
-    except ValueError:
-        with as_file(files(__package__) / "model.en.crfsuite") as p:
-            TAGGER.open(str(p))
+    return TAGGER.get()
 
 
 def parse_ingredient_en(
@@ -39,6 +68,11 @@ def parse_ingredient_en(
     string_units: bool = False,
     imperial_units: bool = False,
     foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    tagger: ThreadLocalTagger = TAGGER,
+    ff_tagger: ThreadLocalTagger = FF_TAGGER,
+    cache: ParseCache | None = None,
 ) -> ParsedIngredient:
     """Parse an English language ingredient sentence to return structured data.
 
@@ -70,47 +104,596 @@ def parse_ingredient_en(
         the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
         of 'organic cucumber'.
         Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    tagger : ThreadLocalTagger, optional
+        Tagger for the parser model.
+        Default is the tagger for the model distributed with this package.
+    ff_tagger : ThreadLocalTagger, optional
+        Tagger for the foundation foods model.
+        Default is the tagger for the foundation foods model distributed with this
+        package.
+    cache : ParseCache | None, optional
+        Cache to look up parsed sentences in, and to store parsed sentences in if not
+        found.
+        Default is None, which means no cache is used.
 
     Returns
     -------
     ParsedIngredient
         ParsedIngredient object of structured data parsed from input string
     """
-    load_model_if_not_loaded()
+    options = {
+        "discard_isolated_stop_words": discard_isolated_stop_words,
+        "expect_name_in_output": expect_name_in_output,
+        "string_units": string_units,
+        "imperial_units": imperial_units,
+        "foundation_foods": foundation_foods,
+        "confidence": confidence,
+        "backend": backend,
+    }
+    # Use the same models throughout, even if they are reloaded part way through.
+    tagger, ff_tagger = ThreadLocalTagger.pin_all(tagger, ff_tagger)
+    # The key includes the model hashes, so is only created if there is a cache, to
+    # avoid reading the model files just to hash them.
+    key = None
+    if cache is not None:
+        key = _cache_key(sentence, options, tagger, ff_tagger)
+        if (cached := cache.get(key)) is not None:
+            return cached
 
     processed_sentence = PreProcessor(sentence)
-    tokens = processed_sentence.tokenized_sentence
-    features = processed_sentence.sentence_features()
-    labels = TAGGER.tag(features)
-    scores = [TAGGER.marginal(label, i) for i, label in enumerate(labels)]
+    postprocessed_sentence, foundation, _ = _tag_and_postprocess(
+        processed_sentence, tagger=tagger, ff_tagger=ff_tagger, **options
+    )
+    parsed = postprocessed_sentence.parsed
+    parsed.foundation_foods = foundation
 
-    # Re-pluralise tokens that were singularised if the label isn't UNIT
-    # For tokens with UNIT label, we'll deal with them below
-    for idx in processed_sentence.singularised_indices:
-        token = tokens[idx]
-        label = labels[idx]
-        if label != "UNIT":
-            tokens[idx] = pluralise_units(token)
+    if cache is not None:
+        cache.put(key, parsed)
 
-    if expect_name_in_output and all(label != "NAME" for label in labels):
-        # No tokens were assigned the NAME label, so guess if there's a name
-        labels, scores = guess_ingredient_name(labels, scores)
+    return parsed
 
-    postprocessed_sentence = PostProcessor(
+
+def parse_multiple_ingredients_en(
+    sentences: list[str],
+    discard_isolated_stop_words: bool = True,
+    expect_name_in_output: bool = True,
+    string_units: bool = False,
+    imperial_units: bool = False,
+    foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    workers: int = 1,
+    chunksize: int = 256,
+    tagger: ThreadLocalTagger = TAGGER,
+    ff_tagger: ThreadLocalTagger = FF_TAGGER,
+    cache: ParseCache | None = None,
+) -> list[ParsedIngredient]:
+    """Parse multiple English language ingredient sentences in one batch.
+
+    Each stage of the parsing pipeline is run over the whole batch before moving on to
+    the next stage. This means the model is only checked once, and part of speech
+    tagging is performed with a single call to the part of speech tagger for the whole
+    batch instead of one call per sentence. The output is identical to calling
+    parse_ingredient_en on each sentence in turn.
+
+    Each distinct sentence is only parsed once, and the result is copied to every
+    position in the output where the sentence occurs. Sentences that only differ by
+    leading or trailing whitespace are considered to be the same sentence. The number
+    of sentences and distinct sentences are added to the statistics returned by
+    dedup_info.
+
+    The sentences are split into chunks which are parsed as batches. If workers is
+    greater than 1, the chunks are parsed in a pool of worker processes. Each worker
+    process loads the models and other resources once, when it starts.
+
+    Parameters
+    ----------
+    sentences : list[str]
+        List of ingredient sentences to parse
+    discard_isolated_stop_words : bool, optional
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+        Default is True.
+    expect_name_in_output : bool, optional
+        If True, if the model doesn't label any words in the sentence as the name,
+        fallback to selecting the most likely name from all tokens even though the
+        model gives it a different label. Note that this does guarantee the output
+        contains a name.
+        Default is True.
+    string_units : bool, optional
+        If True, return all IngredientAmount units as strings.
+        If False, convert IngredientAmount units to pint.Unit objects where possible.
+        Default is False.
+    imperial_units : bool, optional
+        If True, use imperial units instead of US customary units for pint.Unit objects
+        for the the following units: fluid ounce, cup, pint, quart, gallon.
+        Default is False, which results in US customary units being used.
+        This has no effect if string_units=True.
+    foundation_foods : bool, optional
+        If True, extract foundation foods from ingredient name. Foundation foods are
+        the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
+        of 'organic cucumber'.
+        Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    workers : int, optional
+        Number of worker processes to parse the sentences with.
+        Default is 1, which parses the sentences in the current process.
+    chunksize : int, optional
+        Number of sentences parsed together as a batch. If workers is greater than 1,
+        this is the number of sentences sent to a worker process at a time.
+        Default is 256.
+    tagger : ThreadLocalTagger, optional
+        Tagger for the parser model.
+        Default is the tagger for the model distributed with this package.
+    ff_tagger : ThreadLocalTagger, optional
+        Tagger for the foundation foods model.
+        Default is the tagger for the foundation foods model distributed with this
+        package.
+    cache : ParseCache | None, optional
+        Cache to look up parsed sentences in, and to store parsed sentences in if not
+        found.
+        Default is None, which means no cache is used.
+
+    Returns
+    -------
+    list[ParsedIngredient]
+        List of ParsedIngredient objects, in the same order as the input sentences
+    """
+    options = {
+        "discard_isolated_stop_words": discard_isolated_stop_words,
+        "expect_name_in_output": expect_name_in_output,
+        "string_units": string_units,
+        "imperial_units": imperial_units,
+        "foundation_foods": foundation_foods,
+        "confidence": confidence,
+        "backend": backend,
+    }
+    # The whole list is deduplicated here, so the chunks only contain distinct
+    # sentences and are parsed without being deduplicated again.
+    distinct, indices = deduplicate(sentences)
+    record_dedup(len(sentences), len(distinct))
+    if len(distinct) <= chunksize:
+        # Not worth starting worker processes for a single chunk
+        workers = 1
+
+    parsed_distinct = []
+    for parsed_chunk in _parse_chunks_en(
+        chunked(distinct, chunksize), options, workers, tagger, ff_tagger, cache
+    ):
+        parsed_distinct.extend(parsed_chunk)
+
+    return _fan_out(sentences, parsed_distinct, indices)
+
+
+def iter_parse_ingredients_en(
+    sentences: Iterable[str],
+    discard_isolated_stop_words: bool = True,
+    expect_name_in_output: bool = True,
+    string_units: bool = False,
+    imperial_units: bool = False,
+    foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    workers: int = 1,
+    chunksize: int = 256,
+    tagger: ThreadLocalTagger = TAGGER,
+    ff_tagger: ThreadLocalTagger = FF_TAGGER,
+    cache: ParseCache | None = None,
+) -> Iterator[ParsedIngredient]:
+    """Lazily parse English language ingredient sentences from any iterable.
+
+    The sentences are read from the iterable in chunks, and each chunk is parsed as a
+    batch. The parsed sentences are yielded in the same order as the input sentences.
+    At most one chunk is held in memory when workers=1, and at most 2 * workers chunks
+    when workers is greater than 1, so memory use does not grow with the number of
+    sentences.
+
+    Each distinct sentence in a chunk is only parsed once, and the result is copied to
+    every position in the chunk where the sentence occurs.
+
+    Parameters
+    ----------
+    sentences : Iterable[str]
+        Iterable of ingredient sentences to parse, e.g. a list, file or generator.
+    discard_isolated_stop_words : bool, optional
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+        Default is True.
+    expect_name_in_output : bool, optional
+        If True, if the model doesn't label any words in the sentence as the name,
+        fallback to selecting the most likely name from all tokens even though the
+        model gives it a different label. Note that this does guarantee the output
+        contains a name.
+        Default is True.
+    string_units : bool, optional
+        If True, return all IngredientAmount units as strings.
+        If False, convert IngredientAmount units to pint.Unit objects where possible.
+        Default is False.
+    imperial_units : bool, optional
+        If True, use imperial units instead of US customary units for pint.Unit objects
+        for the the following units: fluid ounce, cup, pint, quart, gallon.
+        Default is False, which results in US customary units being used.
+        This has no effect if string_units=True.
+    foundation_foods : bool, optional
+        If True, extract foundation foods from ingredient name. Foundation foods are
+        the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
+        of 'organic cucumber'.
+        Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    workers : int, optional
+        Number of worker processes to parse the sentences with.
+        Default is 1, which parses the sentences in the current process.
+    chunksize : int, optional
+        Number of sentences parsed together as a batch.
+        Default is 256.
+    tagger : ThreadLocalTagger, optional
+        Tagger for the parser model.
+        Default is the tagger for the model distributed with this package.
+    ff_tagger : ThreadLocalTagger, optional
+        Tagger for the foundation foods model.
+        Default is the tagger for the foundation foods model distributed with this
+        package.
+    cache : ParseCache | None, optional
+        Cache to look up parsed sentences in, and to store parsed sentences in if not
+        found.
+        Default is None, which means no cache is used.
+
+    Yields
+    ------
+    ParsedIngredient
+        ParsedIngredient object for each input sentence
+    """
+    options = {
+        "discard_isolated_stop_words": discard_isolated_stop_words,
+        "expect_name_in_output": expect_name_in_output,
+        "string_units": string_units,
+        "imperial_units": imperial_units,
+        "foundation_foods": foundation_foods,
+        "confidence": confidence,
+        "backend": backend,
+    }
+    # Each chunk is deduplicated here, so only its distinct sentences are looked up in
+    # the cache and parsed. The chunks are matched up with the parsed sentences in
+    # order, in the same way as the cache lookups are in _parse_chunks_en.
+    deduplicated = collections.deque()
+
+    def distinct_chunks() -> Iterator[list[str]]:
+        for chunk in chunked(sentences, chunksize):
+            distinct, indices = deduplicate(chunk)
+            deduplicated.append((chunk, indices))
+            yield distinct
+
+    for parsed_distinct in _parse_chunks_en(
+        distinct_chunks(), options, workers, tagger, ff_tagger, cache
+    ):
+        chunk, indices = deduplicated.popleft()
+        yield from _fan_out(chunk, parsed_distinct, indices)
+
+
+def _parse_chunks_en(
+    chunks: Iterable[list[str]],
+    options: dict[str, bool | str],
+    workers: int,
+    tagger: ThreadLocalTagger,
+    ff_tagger: ThreadLocalTagger,
+    cache: ParseCache | None,
+) -> Iterator[list[ParsedIngredient]]:
+    """Lazily parse chunks of distinct English language ingredient sentences.
+
+    Parameters
+    ----------
+    chunks : Iterable[list[str]]
+        Iterable of chunks of sentences. The sentences in each chunk must be distinct.
+    options : dict[str, bool | str]
+        Parsing options.
+    workers : int
+        Number of worker processes to parse the chunks with.
+    tagger : ThreadLocalTagger
+        Tagger for the parser model.
+    ff_tagger : ThreadLocalTagger
+        Tagger for the foundation foods model.
+    cache : ParseCache | None
+        Cache to look up parsed sentences in, and to store parsed sentences in if not
+        found.
+
+    Yields
+    ------
+    list[ParsedIngredient]
+        Parsed sentences for each chunk, in the same order as the chunks.
+    """
+    # Use the same models for every sentence, even if they are reloaded part way
+    # through. Worker processes load the models from the model files when they start.
+    tagger, ff_tagger = ThreadLocalTagger.pin_all(tagger, ff_tagger)
+    parse_chunk = partial(
+        _parse_batch_en, tagger=tagger, ff_tagger=ff_tagger, **options
+    )
+    initargs = (
+        tagger,
+        ff_tagger,
+        bool(options["foundation_foods"]),
+        str(options["backend"]),
+    )
+
+    if cache is None:
+        yield from _map_chunks(parse_chunk, chunks, workers, initargs)
+        return
+
+    # Look up each chunk in the cache and only parse the sentences that aren't found.
+    # Each chunk results in exactly one list of sentences to parse, so the cache
+    # lookups for each chunk are matched up with the parsed sentences in order.
+    lookups = collections.deque()
+
+    def uncached_chunks() -> Iterator[list[str]]:
+        for chunk in chunks:
+            keys = [
+                _cache_key(sentence, options, tagger, ff_tagger) for sentence in chunk
+            ]
+            cached = cache.get_many(keys)
+            lookups.append((keys, cached))
+            yield [sentence for sentence, c in zip(chunk, cached) if c is None]
+
+    for parsed_chunk in _map_chunks(parse_chunk, uncached_chunks(), workers, initargs):
+        keys, cached = lookups.popleft()
+        parsed_uncached = iter(parsed_chunk)
+        parsed_sentences, new_items = [], []
+        for key, parsed in zip(keys, cached):
+            if parsed is None:
+                parsed = next(parsed_uncached)
+                new_items.append((key, parsed))
+            parsed_sentences.append(parsed)
+
+        cache.put_many(new_items)
+        yield parsed_sentences
+
+
+def _map_chunks(
+    parse_chunk: Callable[[list[str]], list[ParsedIngredient]],
+    chunks: Iterable[list[str]],
+    workers: int,
+    initargs: tuple[ThreadLocalTagger, ThreadLocalTagger, bool, str],
+) -> Iterator[list[ParsedIngredient]]:
+    """Lazily parse chunks of sentences, in the current process or a process pool.
+
+    Parameters
+    ----------
+    parse_chunk : Callable[[list[str]], list[ParsedIngredient]]
+        Function to parse a chunk of sentences.
+    chunks : Iterable[list[str]]
+        Iterable of chunks of sentences.
+    workers : int
+        Number of worker processes to parse the chunks with. If 1 or less, the chunks
+        are parsed in the current process.
+    initargs : tuple[ThreadLocalTagger, ThreadLocalTagger, bool, str]
+        Arguments for _init_worker.
+
+    Yields
+    ------
+    list[ParsedIngredient]
+        Parsed sentences for each chunk, in the same order as the chunks.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield parse_chunk(chunk)
+        return
+
+    executor = cf.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=initargs,
+    )
+    try:
+        # Limit the number of chunks submitted to the worker processes to bound the
+        # number of sentences and results held in memory at any time. The futures are
+        # kept in submission order so the results are yielded in input order.
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(parse_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # If the generator is closed before all results are yielded, don't wait for
+        # chunks that haven't started yet.
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _cache_key(
+    sentence: str,
+    options: dict[str, bool | str],
+    tagger: ThreadLocalTagger,
+    ff_tagger: ThreadLocalTagger,
+) -> tuple:
+    """Return the key for a parsed sentence in a ParseCache.
+
+    The key includes a hash of each model and all the options, so that the same
+    sentence parsed by different models or with different options is cached
+    separately. The foundation foods model is only hashed if foundation foods are
+    extracted, because it doesn't affect the result otherwise.
+
+    Parameters
+    ----------
+    sentence : str
+        Ingredient sentence.
+    options : dict[str, bool | str]
+        Parsing options.
+    tagger : ThreadLocalTagger
+        Tagger for the parser model.
+    ff_tagger : ThreadLocalTagger
+        Tagger for the foundation foods model.
+
+    Returns
+    -------
+    tuple
+        Cache key.
+    """
+    return (
+        "en",
         sentence,
-        tokens,
-        labels,
-        scores,
-        discard_isolated_stop_words=discard_isolated_stop_words,
-        string_units=string_units,
-        imperial_units=imperial_units,
+        tagger.model_hash,
+        ff_tagger.model_hash if options["foundation_foods"] else None,
+        *sorted(options.items()),
     )
-    parsed = postprocessed_sentence.parsed
 
-    if foundation_foods and parsed.name:
-        parsed.foundation_foods = extract_foundation_foods(tokens, labels, features)
 
-    return parsed
+def _parse_batch_en(
+    sentences: list[str],
+    discard_isolated_stop_words: bool,
+    expect_name_in_output: bool,
+    string_units: bool,
+    imperial_units: bool,
+    foundation_foods: bool,
+    confidence: bool,
+    backend: str,
+    tagger: ThreadLocalTagger,
+    ff_tagger: ThreadLocalTagger,
+) -> list[ParsedIngredient]:
+    """Parse a batch of English language ingredient sentences.
+
+    Each stage of the parsing pipeline is run over the whole batch before moving on to
+    the next stage. The sentences are not deduplicated, which is done by the
+    functions that split the sentences into batches.
+
+    Parameters
+    ----------
+    sentences : list[str]
+        List of ingredient sentences to parse
+    discard_isolated_stop_words : bool
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+    expect_name_in_output : bool
+        If True, if the model doesn't label any words in the sentence as the name,
+        fallback to selecting the most likely name from all tokens.
+    string_units : bool
+        If True, return all IngredientAmount units as strings.
+    imperial_units : bool
+        If True, use imperial units instead of US customary units for pint.Unit objects.
+    foundation_foods : bool
+        If True, extract foundation foods from ingredient name.
+    confidence : bool
+        If True, calculate the confidence of each field of the parsed output.
+    backend : str
+        Inference backend used to label the sentence tokens.
+    tagger : ThreadLocalTagger
+        Tagger for the parser model.
+    ff_tagger : ThreadLocalTagger
+        Tagger for the foundation foods model.
+
+    Returns
+    -------
+    list[ParsedIngredient]
+        List of ParsedIngredient objects, in the same order as the input sentences
+    """
+    processed_sentences = [
+        PreProcessor(sentence, defer_pos_tagging=True) for sentence in sentences
+    ]
+    PreProcessor.tag_partofspeech_batch(processed_sentences)
+
+    if backend == "numpy":
+        # Label every sentence in the batch at once.
+        known_attributes = _known_attributes(tagger, ff_tagger, foundation_foods)
+        features = [
+            processed.sentence_attributes(known_attributes)
+            for processed in processed_sentences
+        ]
+        tagged = [
+            (sentence_features, labels, marginals)
+            for sentence_features, (labels, marginals) in zip(
+                features, tagger.numpy_crf.tag_batch(features)
+            )
+        ]
+    else:
+        tagged = [None] * len(processed_sentences)
+
+    parsed_sentences = []
+    for processed_sentence, tagged_sentence in zip(processed_sentences, tagged):
+        postprocessed_sentence, foundation, _ = _tag_and_postprocess(
+            processed_sentence,
+            discard_isolated_stop_words=discard_isolated_stop_words,
+            expect_name_in_output=expect_name_in_output,
+            string_units=string_units,
+            imperial_units=imperial_units,
+            foundation_foods=foundation_foods,
+            confidence=confidence,
+            backend=backend,
+            tagger=tagger,
+            ff_tagger=ff_tagger,
+            tagged=tagged_sentence,
+        )
+        parsed = postprocessed_sentence.parsed
+        parsed.foundation_foods = foundation
+        parsed_sentences.append(parsed)
+
+    return parsed_sentences
+
+
+def _fan_out(
+    sentences: list[str], parsed_distinct: list[ParsedIngredient], indices: list[int]
+) -> list[ParsedIngredient]:
+    """Expand the parsed distinct sentences to a parsed sentence for each input.
+
+    The first occurrence of each distinct sentence uses the parsed object directly.
+    Every other occurrence gets a copy, with the sentence attribute set to the input
+    sentence, so that no two elements of the output are the same object.
+
+    Parameters
+    ----------
+    sentences : list[str]
+        List of input sentences.
+    parsed_distinct : list[ParsedIngredient]
+        List of ParsedIngredient objects for each distinct sentence.
+    indices : list[int]
+        Index into parsed_distinct for each input sentence.
+
+    Returns
+    -------
+    list[ParsedIngredient]
+        List of ParsedIngredient objects, in the same order as the input sentences
+    """
+    if len(parsed_distinct) == len(sentences):
+        return parsed_distinct
+
+    used = [False] * len(parsed_distinct)
+    parsed_sentences = []
+    for sentence, idx in zip(sentences, indices):
+        if used[idx]:
+            parsed = copy.deepcopy(parsed_distinct[idx])
+            parsed.sentence = sentence
+        else:
+            parsed = parsed_distinct[idx]
+            used[idx] = True
+        parsed_sentences.append(parsed)
+
+    return parsed_sentences
 
 
 def inspect_parser_en(
@@ -120,6 +703,11 @@ def inspect_parser_en(
     string_units: bool = False,
     imperial_units: bool = False,
     foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    nbest: int = 0,
+    tagger: ThreadLocalTagger = TAGGER,
+    ff_tagger: ThreadLocalTagger = FF_TAGGER,
 ) -> ParserDebugInfo:
     """Return intermediate objects generated during parsing for inspection.
 
@@ -151,22 +739,450 @@ def inspect_parser_en(
         the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
         of 'organic cucumber'.
         Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    nbest : int, optional
+        Number of most likely label sequences to return in the nbest attribute.
+        Default is 0, which returns none.
+    tagger : ThreadLocalTagger, optional
+        Tagger for the parser model.
+        Default is the tagger for the model distributed with this package.
+    ff_tagger : ThreadLocalTagger, optional
+        Tagger for the foundation foods model.
+        Default is the tagger for the foundation foods model distributed with this
+        package.
 
     Returns
     -------
     ParserDebugInfo
         ParserDebugInfo object containing the PreProcessor object, PostProcessor
-        object and Tagger.
+        object, Tagger and marginal probabilities of every label for every token.
     """
-    load_model_if_not_loaded()
-
+    tagger, ff_tagger = ThreadLocalTagger.pin_all(tagger, ff_tagger)
     processed_sentence = PreProcessor(sentence)
+    postprocessed_sentence, foundation, marginals = _tag_and_postprocess(
+        processed_sentence,
+        discard_isolated_stop_words=discard_isolated_stop_words,
+        expect_name_in_output=expect_name_in_output,
+        string_units=string_units,
+        imperial_units=imperial_units,
+        foundation_foods=foundation_foods,
+        confidence=confidence,
+        backend=backend,
+        tagger=tagger,
+        ff_tagger=ff_tagger,
+    )
+
+    if nbest > 0:
+        nbest_sequences = _nbest(processed_sentence, nbest, tagger)
+    else:
+        nbest_sequences = []
+
+    return ParserDebugInfo(
+        sentence=sentence,
+        PreProcessor=processed_sentence,
+        PostProcessor=postprocessed_sentence,
+        foundation_foods=foundation,
+        tagger=tagger.get(),
+        marginals=marginals.matrix(),
+        nbest=nbest_sequences,
+    )
+
+
+def nbest_labels_en(
+    sentence: str, k: int = 5, tagger: ThreadLocalTagger = TAGGER
+) -> list[LabelSequence]:
+    """Return the k most likely label sequences for an English ingredient sentence.
+
+    The label sequences are found using k-best Viterbi decoding, so the sentence is
+    only pre-processed once and the cost grows linearly with k.
+
+    Parameters
+    ----------
+    sentence : str
+        Ingredient sentence.
+    k : int, optional
+        Number of label sequences to return.
+        Default is 5.
+    tagger : ThreadLocalTagger, optional
+        Tagger for the parser model.
+        Default is the tagger for the model distributed with this package.
+
+    Returns
+    -------
+    list[LabelSequence]
+        Up to k label sequences, most likely first.
+    """
+    return _nbest(PreProcessor(sentence), k, tagger)
+
+
+def nbest_labels_multiple_en(
+    sentences: Iterable[str], k: int = 5, tagger: ThreadLocalTagger = TAGGER
+) -> list[list[LabelSequence]]:
+    """Return the k most likely label sequences for each English ingredient sentence.
+
+    Part of speech tagging is performed with a single call to the part of speech
+    tagger for all the sentences.
+
+    Parameters
+    ----------
+    sentences : Iterable[str]
+        Ingredient sentences.
+    k : int, optional
+        Number of label sequences to return for each sentence.
+        Default is 5.
+    tagger : ThreadLocalTagger, optional
+        Tagger for the parser model.
+        Default is the tagger for the model distributed with this package.
+
+    Returns
+    -------
+    list[list[LabelSequence]]
+        Up to k label sequences for each sentence, most likely first, in the same
+        order as the input sentences.
+    """
+    processed_sentences = [
+        PreProcessor(sentence, defer_pos_tagging=True) for sentence in sentences
+    ]
+    PreProcessor.tag_partofspeech_batch(processed_sentences)
+    return [_nbest(processed, k, tagger) for processed in processed_sentences]
+
+
+def warmup_en(
+    foundation_foods: bool = True,
+    backend: str = "crfsuite",
+    corpus: bool = True,
+    tagger: ThreadLocalTagger = TAGGER,
+    ff_tagger: ThreadLocalTagger = FF_TAGGER,
+) -> dict[str, float]:
+    """Load every lazily loaded resource used to parse English ingredient sentences.
+
+    The resources are:
+
+    * The NLTK part of speech tagger.
+    * The parser model and, if foundation_foods is True, the foundation foods model,
+      including the set of attributes each model has weights for.
+    * The pint unit registry and the cache of pint units.
+    * The cache of token stems.
+    * The regex patterns that match units, which are compiled on first use.
+
+    The pycrfsuite Taggers are created for the calling thread only. Other threads
+    create their own Tagger the first time they parse a sentence, but the model file
+    has already been read so this is fast.
+
+    Parameters
+    ----------
+    foundation_foods : bool, optional
+        If True, also load the foundation foods model.
+        Default is True.
+    backend : str, optional
+        Inference backend to load the models for, either "crfsuite" or "numpy".
+        Default is "crfsuite".
+    corpus : bool, optional
+        If True, parse a small built-in set of sentences after loading the resources.
+        Default is True.
+    tagger : ThreadLocalTagger, optional
+        Tagger for the parser model.
+        Default is the tagger for the model distributed with this package.
+    ff_tagger : ThreadLocalTagger, optional
+        Tagger for the foundation foods model.
+        Default is the tagger for the foundation foods model distributed with this
+        package.
+
+    Returns
+    -------
+    dict[str, float]
+        Time, in seconds, taken by each step, in the order the steps were run.
+    """
+    timings = {}
+
+    def timed(step: str, func: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        func()
+        timings[step] = time.perf_counter() - start
+
+    def load(model: ThreadLocalTagger) -> None:
+        if backend == "numpy":
+            model.numpy_crf
+        else:
+            model.get()
+        _known_attributes(tagger, ff_tagger, model is ff_tagger)
+
+    timed("pos_tagger", lambda: pos_tag(["1", "cup", "flour"]))
+    timed("parser_model", lambda: load(tagger))
+    if foundation_foods:
+        timed("foundation_foods_model", lambda: load(ff_tagger))
+
+    units = list(UNITS.keys()) + list(UNITS.values())
+    timed("pint_units", lambda: [convert_to_pint_unit(unit) for unit in units])
+    timed("stems", lambda: [stem(unit) for unit in units])
+    timed(
+        "unit_patterns",
+        lambda: [
+            QUANTITY_UNITS_BOUNDARY_PATTERN.compile(),
+            STRING_QUANTITY_HYPHEN_PATTERN.compile(),
+        ],
+    )
+
+    if corpus:
+        timed(
+            "corpus",
+            lambda: [
+                parse_ingredient_en(
+                    sentence,
+                    foundation_foods=foundation_foods,
+                    backend=backend,
+                    tagger=tagger,
+                    ff_tagger=ff_tagger,
+                )
+                for sentence in WARMUP_SENTENCES
+            ],
+        )
+
+    return timings
+
+
+def reload_models_en(
+    model: Traversable | None = None,
+    ff_model: Traversable | None = None,
+    tagger: ThreadLocalTagger = TAGGER,
+    ff_tagger: ThreadLocalTagger = FF_TAGGER,
+) -> bool:
+    """Replace the parser and foundation foods models, both at the same time.
+
+    Both new model files are read and checked before either model is replaced, so if
+    either file is not a valid model, both taggers continue to use their current
+    models. Sentences that are already being parsed finish using the previous models.
+    Every sentence parsed afterwards uses the new models.
+
+    Cached parsed sentences are keyed by a hash of each model, so sentences parsed by
+    the previous models are never returned for the new models.
+
+    Parameters
+    ----------
+    model : Traversable | None, optional
+        Path to the new parser model file.
+        Default is None, which reads the current parser model file again.
+    ff_model : Traversable | None, optional
+        Path to the new foundation foods model file.
+        Default is None, which reads the current foundation foods model file again.
+    tagger : ThreadLocalTagger, optional
+        Tagger for the parser model to reload.
+        Default is the tagger for the model distributed with this package.
+    ff_tagger : ThreadLocalTagger, optional
+        Tagger for the foundation foods model to reload.
+        Default is the tagger for the foundation foods model distributed with this
+        package.
+
+    Returns
+    -------
+    bool
+        True if either model was replaced, False if both model files are the same as
+        the current ones.
+
+    Raises
+    ------
+    ValueError
+        If either model file is not a crfsuite model.
+    """
+    return ThreadLocalTagger.reload_all([(tagger, model), (ff_tagger, ff_model)])
+
+
+def _nbest(
+    processed_sentence: PreProcessor, k: int, tagger: ThreadLocalTagger
+) -> list[LabelSequence]:
+    """Return the k most likely label sequences for a pre-processed sentence.
+
+    Parameters
+    ----------
+    processed_sentence : PreProcessor
+        PreProcessor object for the sentence.
+    k : int
+        Number of label sequences to return.
+    tagger : ThreadLocalTagger
+        Tagger for the parser model.
+
+    Returns
+    -------
+    list[LabelSequence]
+        Up to k label sequences, most likely first.
+    """
     tokens = processed_sentence.tokenized_sentence
-    features = processed_sentence.sentence_features()
-    labels = TAGGER.tag(features)
-    scores = [TAGGER.marginal(label, i) for i, label in enumerate(labels)]
+    tagger = tagger.pin()
+    return [
+        LabelSequence(tokens=tokens, labels=labels, probability=probability)
+        for labels, probability in tagger.nbest(
+            processed_sentence.sentence_attributes(tagger.attributes), k
+        )
+    ]
+
 
-    # Re-plurise tokens that were singularised if the label isn't UNIT
+def _init_worker(
+    tagger: ThreadLocalTagger,
+    ff_tagger: ThreadLocalTagger,
+    foundation_foods: bool,
+    backend: str,
+) -> None:
+    """Initialise a worker process by loading the resources required for parsing.
+
+    This loads the parser model, the foundation foods model (if required), the part of
+    speech tagger and the pint unit registry once when the worker process starts,
+    rather than when the worker parses its first sentence.
+
+    Parameters
+    ----------
+    tagger : ThreadLocalTagger
+        Tagger for the parser model.
+    ff_tagger : ThreadLocalTagger
+        Tagger for the foundation foods model.
+    foundation_foods : bool
+        If True, load the foundation foods model.
+    backend : str
+        Inference backend used to label the sentence tokens. If "numpy", the models
+        are also loaded into NumPy arrays.
+    """
+    tagger.get()
+    if foundation_foods:
+        ff_tagger.get()
+    if backend == "numpy":
+        tagger.numpy_crf
+        if foundation_foods:
+            ff_tagger.numpy_crf
+    PreProcessor("1 cup water")
+    convert_to_pint_unit("cup")
+
+
+def _known_attributes(
+    tagger: ThreadLocalTagger, ff_tagger: ThreadLocalTagger, foundation_foods: bool
+) -> frozenset[str]:
+    """Return the attributes that the models used to label a sentence have weights for.
+
+    Attributes that aren't in the returned set have no effect on the labels, so they
+    don't need to be generated.
+
+    Parameters
+    ----------
+    tagger : ThreadLocalTagger
+        Tagger for the parser model.
+    ff_tagger : ThreadLocalTagger
+        Tagger for the foundation foods model.
+    foundation_foods : bool
+        If True, the features are also used to label foundation foods, so the
+        attributes of the foundation foods model are included.
+
+    Returns
+    -------
+    frozenset[str]
+        Attributes of the parser model, and of the foundation foods model if
+        foundation_foods is True.
+    """
+    if foundation_foods:
+        return _union_attributes(tagger.attributes, ff_tagger.attributes)
+
+    return tagger.attributes
+
+
+@lru_cache(maxsize=4)
+def _union_attributes(
+    attributes: frozenset[str], ff_attributes: frozenset[str]
+) -> frozenset[str]:
+    """Return the union of the attributes of the parser and foundation foods models.
+
+    The union is cached by the sets of attributes, rather than by the taggers, so that
+    a reloaded model gets a new union and the previous model isn't kept in memory.
+
+    Parameters
+    ----------
+    attributes : frozenset[str]
+        Attributes of the parser model.
+    ff_attributes : frozenset[str]
+        Attributes of the foundation foods model.
+
+    Returns
+    -------
+    frozenset[str]
+        Attributes of either model.
+    """
+    return attributes | ff_attributes
+
+
+def _tag_and_postprocess(
+    processed_sentence: PreProcessor,
+    discard_isolated_stop_words: bool,
+    expect_name_in_output: bool,
+    string_units: bool,
+    imperial_units: bool,
+    foundation_foods: bool,
+    confidence: bool,
+    backend: str,
+    tagger: ThreadLocalTagger,
+    ff_tagger: ThreadLocalTagger,
+    tagged: tuple[SentenceFeatures, list[str], Marginals] | None = None,
+) -> tuple[PostProcessor, list[FoudationFood], Marginals]:
+    """Label the tokens of a pre-processed sentence and post-process the labels.
+
+    This is the part of the parsing pipeline that is shared between parsing a single
+    sentence, parsing a batch of sentences and inspecting the parser.
+
+    Parameters
+    ----------
+    processed_sentence : PreProcessor
+        PreProcessor object for the sentence to parse.
+    discard_isolated_stop_words : bool
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+    expect_name_in_output : bool
+        If True, if the model doesn't label any words in the sentence as the name,
+        fallback to selecting the most likely name from all tokens.
+    string_units : bool
+        If True, return all IngredientAmount units as strings.
+    imperial_units : bool
+        If True, use imperial units instead of US customary units for pint.Unit objects.
+    foundation_foods : bool
+        If True, extract foundation foods from ingredient name.
+    confidence : bool
+        If True, calculate the confidence of each field of the parsed output.
+    backend : str
+        Inference backend used to label the sentence tokens.
+    tagger : ThreadLocalTagger
+        Tagger for the parser model.
+    ff_tagger : ThreadLocalTagger
+        Tagger for the foundation foods model.
+    tagged : tuple[SentenceFeatures, list[str], Marginals] | None, optional
+        Features, labels and marginals for the sentence, if it has already been
+        labelled as part of a batch.
+        Default is None, which means the sentence is labelled using tagger.
+
+    Returns
+    -------
+    tuple[PostProcessor, list[FoudationFood], Marginals]
+        PostProcessor object for the labelled sentence, the list of foundation
+        foods extracted from the ingredient name, and the marginals for the sentence.
+    """
+    tokens = processed_sentence.tokenized_sentence
+    if tagged is None:
+        features = processed_sentence.sentence_attributes(
+            _known_attributes(tagger, ff_tagger, foundation_foods)
+        )
+        labels, marginals = tagger.tag(features, backend)
+    else:
+        features, labels, marginals = tagged
+    if confidence:
+        scores = marginals.sequence(labels)
+    else:
+        # Marginals are only calculated when requested, so none are calculated unless
+        # the name needs to be guessed below.
+        scores = [0.0] * len(labels)
+
+    # Re-pluralise tokens that were singularised if the label isn't UNIT
     # For tokens with UNIT label, we'll deal with them below
     for idx in processed_sentence.singularised_indices:
         token = tokens[idx]
@@ -176,35 +1192,40 @@ def inspect_parser_en(
 
     if expect_name_in_output and all(label != "NAME" for label in labels):
         # No tokens were assigned the NAME label, so guess if there's a name
-        labels, scores = guess_ingredient_name(labels, scores)
+        labels, scores = guess_ingredient_name(labels, scores, marginals)
 
     postprocessed_sentence = PostProcessor(
-        sentence,
+        processed_sentence.input,
         tokens,
         labels,
         scores,
         discard_isolated_stop_words=discard_isolated_stop_words,
         string_units=string_units,
         imperial_units=imperial_units,
+        confidence=confidence,
     )
 
     parsed = postprocessed_sentence.parsed
     if foundation_foods and parsed.name:
-        foundation = extract_foundation_foods(tokens, labels, features)
+        foundation = extract_foundation_foods(
+            tokens,
+            labels,
+            features,
+            ff_tagger,
+            confidence=confidence,
+            backend=backend,
+        )
     else:
         foundation = []
 
-    return ParserDebugInfo(
-        sentence=sentence,
-        PreProcessor=processed_sentence,
-        PostProcessor=postprocessed_sentence,
-        foundation_foods=foundation,
-        tagger=TAGGER,
-    )
+    return postprocessed_sentence, foundation, marginals
 
 
 def guess_ingredient_name(
-    labels: list[str], scores: list[float], min_score: float = 0.2
+    labels: list[str],
+    scores: list[float],
+    marginals: Marginals,
+    min_score: float = 0.2,
 ) -> tuple[list[str], list[float]]:
     """Guess ingredient name from list of labels and scores.
 
@@ -220,6 +1241,9 @@ def guess_ingredient_name(
         List of labels
     scores : list[float]
         List of scores
+    marginals : Marginals
+        Marginals for the sentence, used to get the confidence of each token being
+        NAME.
     min_score : float
         Minimum score to consider as candidate name
 
@@ -230,7 +1254,7 @@ def guess_ingredient_name(
     """
     # Calculate confidence of each token being labelled NAME and get indices where that
     # confidence is greater than min_score.
-    name_scores = [TAGGER.marginal("NAME", i) for i, _ in enumerate(labels)]
+    name_scores = marginals.label("NAME")
     candidate_indices = [i for i, score in enumerate(name_scores) if score >= min_score]
 
     if len(candidate_indices) == 0:
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from functools import cached_property
 from itertools import chain, pairwise
 from statistics import mean
-from typing import Any
+from typing import Any, Iterable
 
 from .._common import consume, group_consecutive_idx
 from ..dataclasses import (
@@ -94,6 +94,10 @@ class PostProcessor:
         for the the following units: fluid ounce, cup, pint, quart, gallon.
         Default is False, which results in US customary units being used.
         This has no effect if string_units=True.
+    confidence : bool
+        If True, calculate the confidence of each field of the parsed output from the
+        scores. If False, the scores are ignored and every confidence is 0.
+        Default is True.
     consumed : list[int]
         List of indices of tokens consumed as part of setting the APPROXIMATE and
         SINGULAR flags. These tokens should not end up in the parsed output.
@@ -108,6 +112,7 @@ class PostProcessor:
         discard_isolated_stop_words: bool = True,
         string_units: bool = False,
         imperial_units: bool = False,
+        confidence: bool = True,
     ):
         self.sentence = sentence
         self.tokens = tokens
@@ -116,6 +121,7 @@ class PostProcessor:
         self.discard_isolated_stop_words = discard_isolated_stop_words
         self.string_units = string_units
         self.imperial_units = imperial_units
+        self.confidence = confidence
         self.consumed = []
 
     def __repr__(self) -> str:
@@ -206,7 +212,7 @@ class PostProcessor:
                 continue
 
             joined = " ".join([self.tokens[i] for i in idx])
-            confidence = mean([self.scores[i] for i in idx])
+            confidence = self._mean(self.scores[i] for i in idx)
 
             if self.discard_isolated_stop_words and joined in STOP_WORDS:
                 # Skip part if it's a stop word
@@ -235,10 +241,12 @@ class PostProcessor:
         if len(parts) == 0:
             return None
 
-        return IngredientText(
-            text=text,
-            confidence=round(mean(confidence_parts), 6),
-        )
+        if self.confidence:
+            confidence = round(mean(confidence_parts), 6)
+        else:
+            confidence = 0
+
+        return IngredientText(text=text, confidence=confidence)
 
     def _postprocess_amounts(self) -> list[IngredientAmount]:
         """Process tokens, labels and scores into IngredientAmount.
@@ -292,6 +300,26 @@ class PostProcessor:
         """
         return [el for i, el in enumerate(list_) if i not in self.consumed]
 
+    def _mean(self, scores: Iterable[float]) -> float:
+        """Return the mean of scores, or 0 if confidence is not being calculated.
+
+        When self.confidence is False, scores is not consumed, so a generator passed as
+        scores is never evaluated.
+
+        Parameters
+        ----------
+        scores : Iterable[float]
+            Scores to average.
+
+        Returns
+        -------
+        float
+            Mean of scores, or 0.
+        """
+        if not self.confidence:
+            return 0
+        return mean(scores)
+
     def _remove_invalid_indices(self, idx: list[int]) -> list[int]:
         """Remove indices of tokens that aren't valid in the group.
 
@@ -492,7 +520,7 @@ class PostProcessor:
             replacement = combine_quantities_split_by_and(fragment)
             if replacement != fragment:
                 mod_idx = idx_group[0]  # Index to replace with replacement
-                self.scores[mod_idx] = mean([self.scores[i] for i in idx_group])
+                self.scores[mod_idx] = self._mean(self.scores[i] for i in idx_group)
                 self.tokens[mod_idx] = replacement
 
                 idx_to_remove.extend(idx_group[1:])
@@ -501,7 +529,7 @@ class PostProcessor:
             replacement = replace_string_range(fragment)
             if replacement != fragment:
                 mod_idx = idx_group[0]  # Index to replace with replacement
-                self.scores[mod_idx] = mean([self.scores[i] for i in idx_group])
+                self.scores[mod_idx] = self._mean(self.scores[i] for i in idx_group)
                 self.tokens[mod_idx] = replacement
 
                 idx_to_remove.extend(idx_group[1:])
@@ -609,7 +637,7 @@ class PostProcessor:
                         quantity=quantity,
                         unit=unit,
                         text=text,
-                        confidence=mean(
+                        confidence=self._mean(
                             [matching_scores.pop(0), matching_scores.pop(-1)]
                         ),
                         starting_index=idx[match[0]],
@@ -628,7 +656,7 @@ class PostProcessor:
                         quantity = matching_tokens[i]
                         unit = matching_tokens[i + 1]
                         text = " ".join((quantity, unit)).strip()
-                        confidence = mean(matching_scores[i : i + 1])
+                        confidence = self._mean(matching_scores[i : i + 1])
 
                         # If the first amount (e.g. 1 can) is approximate, so are all
                         # the pairs in between
@@ -766,7 +794,7 @@ class PostProcessor:
                 # First amount
                 quantity_1 = tokens[match[start1]]
                 unit_1 = tokens[match[start1 + 1]]
-                score_1 = mean(scores[i] for i in match[start1 : start1 + 2])
+                score_1 = self._mean(scores[i] for i in match[start1 : start1 + 2])
                 text_1 = " ".join((quantity_1, unit_1)).strip()
 
                 first_amount = ingredient_amount_factory(
@@ -782,7 +810,7 @@ class PostProcessor:
                 # Second amount
                 quantity_2 = tokens[match[start2]]
                 unit_2 = " ".join([tokens[i] for i in match[start2 + 1 :]])
-                score_2 = mean(scores[i] for i in match[start2:])
+                score_2 = self._mean(scores[i] for i in match[start2:])
                 text_2 = " ".join((quantity_2, unit_2)).strip()
 
                 second_amount = ingredient_amount_factory(
@@ -979,7 +1007,7 @@ class PostProcessor:
                     quantity=amount.quantity,
                     unit=unit,
                     text=text,
-                    confidence=mean(amount.confidence),
+                    confidence=self._mean(amount.confidence),
                     starting_index=amount.starting_index,
                     APPROXIMATE=amount.APPROXIMATE,
                     SINGULAR=amount.SINGULAR,
@@ -1,31 +1,41 @@
 #!/usr/bin/env python3
 
+import re
 import string
+import threading
 import unicodedata
+from collections import Counter
 from fractions import Fraction
+from functools import lru_cache
 from html import unescape
+from itertools import chain
+from typing import Callable, NamedTuple
 
-from nltk import pos_tag
+from nltk import pos_tag, pos_tag_sents
 
+from .._tagger import encode_features
 from ._constants import (
     AMBIGUOUS_UNITS,
+    DASH_AND_FRACTION_REPLACEMENTS,
     FLATTENED_UNITS_LIST,
     STRING_NUMBERS,
     UNICODE_FRACTIONS,
     UNITS,
 )
 from ._regex import (
+    ANY_DIGIT_PATTERN,
     CAPITALISED_PATTERN,
+    DASH_AND_FRACTION_PATTERN,
     DIGIT_PATTERN,
     DUPE_UNIT_RANGES_PATTERN,
     EXPANDED_RANGE,
     FRACTION_PARTS_PATTERN,
     LOWERCASE_PATTERN,
-    QUANTITY_UNITS_PATTERN,
+    QUANTITY_UNITS_BOUNDARY_PATTERN,
     QUANTITY_X_PATTERN,
     STRING_QUANTITY_HYPHEN_PATTERN,
-    UNITS_HYPHEN_QUANTITY_PATTERN,
-    UNITS_QUANTITY_PATTERN,
+    UNICODE_FRACTION_PATTERN,
+    UNIT_TRAILING_PERIOD_PATTERN,
     UPPERCASE_PATTERN,
 )
 from ._utils import (
@@ -35,6 +45,234 @@ from ._utils import (
     tokenize,
 )
 
+# Prefixes of the attributes for the token itself and each of its neighbours.
+NEIGHBOUR_PREFIXES = ("prev_", "prev2_", "next_", "next2_")
+
+# Character classes a sentence must contain for each normalisation step to change it,
+# keyed by the name of the step. Each step has one or more groups of classes. A step
+# is applied to a sentence that contains every class in any of its groups, and
+# skipped for any other sentence. See _character_classes for the classes.
+NORMALISATION_STEP_CLASSES = {
+    "_replace_dashes_and_fractions": (("dash",), ("fraction",), ("ampersand",)),
+    "_replace_en_em_dash": (("dash",),),
+    "_replace_html_fractions": (("ampersand",),),
+    "_replace_unicode_fractions": (("fraction",),),
+    "combine_quantities_split_by_and": (("digit", "slash"),),
+    "_replace_fake_fractions": (("slash",),),
+    "_split_quantity_and_units": (("digit",), ("hyphen",)),
+    "_remove_unit_trailing_period": (("period",),),
+    "replace_string_range": (("digit", "o"),),
+    "_replace_dupe_units_ranges": (("digit",), ("period",)),
+    "_merge_quantity_x": (("digit", "x"), ("period", "x")),
+    "_collapse_ranges": (("digit", "hyphen"),),
+}
+
+
+class NormalisationStepCounts(NamedTuple):
+    """Number of sentences a normalisation step was applied to or skipped for.
+
+    Attributes
+    ----------
+    applied : int
+        Number of sentences the step was applied to.
+    skipped : int
+        Number of sentences the step was skipped for, because the sentence did not
+        contain the characters the step needs.
+    """
+
+    applied: int
+    skipped: int
+
+
+@lru_cache(maxsize=4096)
+def _lexical_attributes(
+    token: str, known_attributes: frozenset[str] | None
+) -> tuple[tuple[str, ...], tuple[str, ...], dict[str, tuple[str, ...]]]:
+    """Return the attributes that only depend on the token itself.
+
+    These attributes are the same in every sentence the token appears in, so they are
+    cached instead of being created again for every occurrence of the token.
+
+    Parameters
+    ----------
+    token : str
+        Feature token.
+    known_attributes : frozenset[str] | None
+        If not None, only return attributes in this set.
+
+    Returns
+    -------
+    tuple[str, ...]
+        Stem and token attributes for the token.
+    tuple[str, ...]
+        N-gram attributes for the token.
+    dict[str, tuple[str, ...]]
+        Stem attributes for the token when it is a neighbour of another token, for
+        each prefix in NEIGHBOUR_PREFIXES.
+    """
+    token_stem = stem(token)
+    head = ["stem:" + token_stem]
+    if token != token_stem:
+        head.append("token:" + token)
+
+    ngrams = []
+    if token != "!num":
+        for n in range(3, min(len(token), 6)):
+            ngrams.append(f"prefix_{n}:{token[:n]}")
+            ngrams.append(f"suffix_{n}:{token[-n:]}")
+
+    neighbours = {
+        prefix: [f"{prefix}stem:{token_stem}"] for prefix in NEIGHBOUR_PREFIXES
+    }
+
+    if known_attributes is None:
+        return (
+            tuple(head),
+            tuple(ngrams),
+            {prefix: tuple(attrs) for prefix, attrs in neighbours.items()},
+        )
+
+    return (
+        tuple(attr for attr in head if attr in known_attributes),
+        tuple(attr for attr in ngrams if attr in known_attributes),
+        {
+            prefix: tuple(attr for attr in attrs if attr in known_attributes)
+            for prefix, attrs in neighbours.items()
+        },
+    )
+
+
+@lru_cache(maxsize=4096)
+def _prefixed_attributes(
+    attributes: tuple[str, ...], prefix: str, known_attributes: frozenset[str] | None
+) -> tuple[str, ...]:
+    """Return attributes with prefix prepended to each one.
+
+    The common attributes of tokens only take a small number of different values, so
+    the prefixed attributes are cached.
+
+    Parameters
+    ----------
+    attributes : tuple[str, ...]
+        Attributes to prefix.
+    prefix : str
+        Prefix to prepend to each attribute.
+    known_attributes : frozenset[str] | None
+        If not None, only return prefixed attributes in this set.
+
+    Returns
+    -------
+    tuple[str, ...]
+        Prefixed attributes.
+    """
+    prefixed = (prefix + attr for attr in attributes)
+    if known_attributes is None:
+        return tuple(prefixed)
+
+    return tuple(attr for attr in prefixed if attr in known_attributes)
+
+
+def _quantity_unit_boundary(match: re.Match) -> str:
+    """Return the replacement for a match of QUANTITY_UNITS_BOUNDARY_PATTERN.
+
+    Parameters
+    ----------
+    match : re.Match
+        Quantity followed by an optional hyphen, or unit followed by an optional
+        hyphen.
+
+    Returns
+    -------
+    str
+        Quantity followed by a space, unit followed by a space, or unit followed by
+        a hyphen with a space either side.
+    """
+    quantity, unit, hyphen = match.groups()
+    if quantity is not None:
+        return f"{quantity} "
+    elif hyphen is not None:
+        return f"{unit} - "
+    return f"{unit} "
+
+
+def _character_classes(sentence: str) -> frozenset[str]:
+    """Return the classes of characters the normalisation steps need in the sentence.
+
+    The classes are:
+
+    * digit: any decimal digit, including non-ascii digits, which \\d also matches.
+    * slash: / or FRACTION SLASH (U+2044).
+    * hyphen: -
+    * dash: en dash or em dash.
+    * fraction: any unicode fraction in UNICODE_FRACTIONS.
+    * ampersand: &, which starts an html entity.
+    * period: .
+    * o: o, which is in both "to" and "or".
+    * x: x or X.
+
+    Each check is a single scan of the sentence by str.__contains__ or a regex search,
+    which is faster for short sentences than finding the set of characters in the
+    sentence.
+
+    Parameters
+    ----------
+    sentence : str
+        Ingredient sentence
+
+    Returns
+    -------
+    frozenset[str]
+        Classes of characters in sentence.
+    """
+    classes = []
+    if ANY_DIGIT_PATTERN.search(sentence):
+        classes.append("digit")
+    if "/" in sentence or "\u2044" in sentence:
+        classes.append("slash")
+    if "-" in sentence:
+        classes.append("hyphen")
+    if "." in sentence:
+        classes.append("period")
+    if "o" in sentence:
+        classes.append("o")
+    if "x" in sentence or "X" in sentence:
+        classes.append("x")
+    if "&" in sentence:
+        classes.append("ampersand")
+    # Dashes and unicode fractions are not ascii characters
+    if not sentence.isascii():
+        if "\u2013" in sentence or "\u2014" in sentence:
+            classes.append("dash")
+        if UNICODE_FRACTION_PATTERN.search(sentence):
+            classes.append("fraction")
+
+    return frozenset(classes)
+
+
+@lru_cache(maxsize=512)
+def _applicable_steps(classes: frozenset[str]) -> frozenset[str]:
+    """Return the names of the normalisation steps that can change a sentence.
+
+    The result only depends on which classes of characters the sentence contains, so
+    it is cached.
+
+    Parameters
+    ----------
+    classes : frozenset[str]
+        Classes of characters in the sentence, from _character_classes.
+
+    Returns
+    -------
+    frozenset[str]
+        Names of the steps in NORMALISATION_STEP_CLASSES that can change a sentence
+        containing the classes of characters.
+    """
+    return frozenset(
+        name
+        for name, groups in NORMALISATION_STEP_CLASSES.items()
+        if any(classes.issuperset(group) for group in groups)
+    )
+
 
 class PreProcessor:
     """Recipe ingredient sentence PreProcessor class.
@@ -80,6 +318,9 @@ class PreProcessor:
     method, which returns a list of dictionaries.
     Each dictionary is the feature set for each token.
 
+    The ``sentence_attributes`` method returns the same features already encoded as
+    the attributes used by the CRF model, which is faster to compute and to tag.
+
     The sentence features can then be passed to the CRF model which will generate the
     parsed output.
 
@@ -113,6 +354,22 @@ class PreProcessor:
         Tokenised ingredient sentence.
     """
 
+    # Number of sentences normalised with each combination of steps applied and
+    # skipped, by all PreProcessor objects. Each thread counts the sentences it
+    # normalises in its own Counter, so normalising a sentence doesn't take a lock
+    # that would be contended by threads parsing in parallel. The lock is only taken
+    # to add the Counter for a new thread, and to read or reset the counts. When a
+    # Counter is added, the Counters of threads that have exited are merged into
+    # _finished_step_outcomes, so there is only one Counter for each running thread.
+    _step_outcomes_local = threading.local()
+    _step_outcomes: dict[
+        threading.Thread, Counter[tuple[tuple[str, ...], tuple[str, ...]]]
+    ] = {}
+    _finished_step_outcomes: Counter[tuple[tuple[str, ...], tuple[str, ...]]] = (
+        Counter()
+    )
+    _step_counts_lock = threading.Lock()
+
     def __init__(
         self,
         input_sentence: str,
@@ -149,6 +406,10 @@ class PreProcessor:
 
         # Replace all numeric tokens with "!num" for calculating features
         self._feature_tokens = self._replace_numeric_tokens(self.tokenized_sentence)
+        # Cache of common features for each token index. The common features for a
+        # token are used by the token and its neighbours, so only calculate them once.
+        self._common_features_cache: dict[int, dict[str, str | bool]] = {}
+        self._common_attributes_cache: dict[int, tuple[str, ...]] = {}
 
     def __repr__(self) -> str:
         """__repr__ method.
@@ -189,12 +450,145 @@ class PreProcessor:
         str
             Normalised ingredient sentence
         """
-        # List of functions to apply to sentence
-        # Note that the order matters
-        funcs = [
-            self._replace_en_em_dash,
-            self._replace_html_fractions,
-            self._replace_unicode_fractions,
+        # The sentence is scanned for the characters the steps need, and each step is
+        # skipped if the sentence doesn't contain the characters that step needs. The
+        # sentence is only scanned again if a step changes it.
+        debug = self.show_debug_output
+        applicable = _applicable_steps(_character_classes(sentence))
+        applied, skipped = [], []
+        # When printing debug output, apply the steps that are usually combined into
+        # a single pass separately, so the result of each step can be printed.
+        for func in self._normalisation_steps(separate=debug):
+            name = func.__name__
+            if name in applicable or name not in NORMALISATION_STEP_CLASSES:
+                applied.append(name)
+                normalised = func(sentence)
+                if normalised != sentence:
+                    sentence = normalised
+                    applicable = _applicable_steps(_character_classes(sentence))
+            else:
+                skipped.append(name)
+
+            if debug:
+                print(f"{name}: {sentence}")
+
+        # The steps applied and skipped are counted together, as a single key, which
+        # is much faster than counting each step separately.
+        try:
+            outcomes = PreProcessor._step_outcomes_local.counter
+        except AttributeError:
+            outcomes = PreProcessor._thread_step_outcomes()
+        outcomes[(tuple(applied), tuple(skipped))] += 1
+
+        return sentence.strip()
+
+    @classmethod
+    def normalisation_step_counts(cls) -> dict[str, NormalisationStepCounts]:
+        """Return how often each normalisation step was applied or skipped.
+
+        Steps are skipped for sentences that don't contain the characters the step
+        needs, as defined in NORMALISATION_STEP_CLASSES. The counts are for every
+        sentence normalised by any PreProcessor since the counts were last reset.
+
+        Returns
+        -------
+        dict[str, NormalisationStepCounts]
+            Named tuple of the number of sentences each step was applied to and
+            skipped for, keyed by step name.
+
+        Examples
+        --------
+        >>> PreProcessor.reset_normalisation_step_counts()
+        >>> p = PreProcessor("salt and pepper to taste")
+        >>> PreProcessor.normalisation_step_counts()["_split_quantity_and_units"]
+        NormalisationStepCounts(applied=0, skipped=1)
+        """
+        with cls._step_counts_lock:
+            # list() copies the items of each Counter in one step, so a thread adding
+            # a new key whilst the counts are read can't break the iteration.
+            outcomes = [list(cls._finished_step_outcomes.items())]
+            outcomes.extend(
+                list(counter.items()) for counter in cls._step_outcomes.values()
+            )
+
+        applied_counts, skipped_counts = Counter(), Counter()
+        for (applied, skipped), n in chain.from_iterable(outcomes):
+            for name in applied:
+                applied_counts[name] += n
+            for name in skipped:
+                skipped_counts[name] += n
+
+        return {
+            name: NormalisationStepCounts(applied_counts[name], skipped_counts[name])
+            for name in applied_counts | skipped_counts
+        }
+
+    @classmethod
+    def reset_normalisation_step_counts(cls) -> None:
+        """Reset the counts of how often each normalisation step was applied or
+        skipped.
+        """
+        with cls._step_counts_lock:
+            cls._finished_step_outcomes.clear()
+            for counter in cls._step_outcomes.values():
+                counter.clear()
+
+    @classmethod
+    def _thread_step_outcomes(
+        cls,
+    ) -> Counter[tuple[tuple[str, ...], tuple[str, ...]]]:
+        """Create the Counter of normalisation step outcomes for the calling thread.
+
+        The Counters of threads that have exited are merged into a single Counter, so
+        the sentences they normalised are still included in the counts.
+
+        Returns
+        -------
+        Counter[tuple[tuple[str, ...], tuple[str, ...]]]
+            Number of sentences normalised by the calling thread with each combination
+            of steps applied and skipped.
+        """
+        counter = Counter()
+        with cls._step_counts_lock:
+            for thread in [t for t in cls._step_outcomes if not t.is_alive()]:
+                cls._finished_step_outcomes.update(cls._step_outcomes.pop(thread))
+            cls._step_outcomes[threading.current_thread()] = counter
+
+        cls._step_outcomes_local.counter = counter
+        return counter
+
+    def _normalisation_steps(
+        self, separate: bool = False
+    ) -> list[Callable[[str], str]]:
+        """Return the functions that normalise a sentence, in the order to apply them.
+
+        Note that the order matters, because later functions rely on the changes made
+        by earlier functions.
+
+        Parameters
+        ----------
+        separate : bool, optional
+            If True, return _replace_en_em_dash, _replace_html_fractions and
+            _replace_unicode_fractions separately, instead of
+            _replace_dashes_and_fractions, which combines them into a single pass
+            that gives the same result.
+            Default is False.
+
+        Returns
+        -------
+        list[Callable[[str], str]]
+            Normalisation functions.
+        """
+        if separate:
+            first_steps = [
+                self._replace_en_em_dash,
+                self._replace_html_fractions,
+                self._replace_unicode_fractions,
+            ]
+        else:
+            first_steps = [self._replace_dashes_and_fractions]
+
+        return first_steps + [
             combine_quantities_split_by_and,
             self._replace_fake_fractions,
             self._split_quantity_and_units,
@@ -205,13 +599,47 @@ class PreProcessor:
             self._collapse_ranges,
         ]
 
-        for func in funcs:
-            sentence = func(sentence)
+    def _replace_dashes_and_fractions(self, sentence: str) -> str:
+        """Replace en and em dashes, html fractions and unicode fractions.
 
-            if self.show_debug_output:
-                print(f"{func.__name__}: {sentence}")
+        This gives the same result as _replace_en_em_dash, _replace_html_fractions and
+        _replace_unicode_fractions applied one after the other, but the dashes and
+        unicode fractions are replaced in a single pass.
 
-        return sentence.strip()
+        Parameters
+        ----------
+        sentence : str
+            Ingredient sentence
+
+        Returns
+        -------
+        str
+            Ingredient sentence with dashes replaced with hyphens and html and unicode
+            fractions replaced with fake fractions
+
+        Examples
+        --------
+        >>> p = PreProcessor("")
+        >>> p._replace_dashes_and_fractions("1½–2 cups milk")
+        "1 1/2-2 cups milk"
+
+        >>> p = PreProcessor("")
+        >>> p._replace_dashes_and_fractions("¼–½ teaspoon")
+        " 1/4-1/2 teaspoon"
+        """
+        if "&" in sentence:
+            # Dashes are replaced before html entities are unescaped, so any dash
+            # entity is kept as a dash, but fractions are replaced afterwards.
+            sentence = unescape(self._replace_en_em_dash(sentence))
+            return self._replace_unicode_fractions(sentence)
+
+        # A hyphen that isn't followed by a fraction is matched, but not replaced.
+        return DASH_AND_FRACTION_PATTERN.sub(
+            lambda match: DASH_AND_FRACTION_REPLACEMENTS.get(
+                match.group(), match.group()
+            ),
+            sentence,
+        )
 
     def _replace_en_em_dash(self, sentence: str) -> str:
         """Replace en-dashes and em-dashes with hyphens.
@@ -384,9 +812,9 @@ class PreProcessor:
         >>> p._split_quantity_and_units("2lb-1oz cherry tomatoes")
         "2 lb - 1 oz cherry tomatoes"
         """
-        sentence = QUANTITY_UNITS_PATTERN.sub(r"\1 \2", sentence)
-        sentence = UNITS_QUANTITY_PATTERN.sub(r"\1 \2", sentence)
-        sentence = UNITS_HYPHEN_QUANTITY_PATTERN.sub(r"\1 - \2", sentence)
+        sentence = QUANTITY_UNITS_BOUNDARY_PATTERN.sub(
+            _quantity_unit_boundary, sentence
+        )
         return STRING_QUANTITY_HYPHEN_PATTERN.sub(r"\1 \2", sentence)
 
     def _remove_unit_trailing_period(self, sentence: str) -> str:
@@ -412,23 +840,7 @@ class PreProcessor:
         >>> p._remove_unit_trailing_period("5 oz. chopped tomatoes")
         "5 oz chopped tomatoes"
         """
-        units = [
-            "tsp.",
-            "tsps.",
-            "tbsp.",
-            "tbsps.",
-            "tbs.",
-            "tb.",
-            "lb.",
-            "lbs.",
-            "oz.",
-        ]
-        units.extend([u.capitalize() for u in units])
-        for unit in units:
-            unit_no_period = unit.replace(".", "")
-            sentence = sentence.replace(unit, unit_no_period)
-
-        return sentence
+        return UNIT_TRAILING_PERIOD_PATTERN.sub("", sentence)
 
     def _replace_dupe_units_ranges(self, sentence: str) -> str:
         """Replace ranges where the unit appears twice with standard range then unit.
@@ -601,6 +1013,30 @@ class PreProcessor:
             tags.append(tag)
         return tags
 
+    @staticmethod
+    def tag_partofspeech_batch(processed_sentences: list["PreProcessor"]) -> None:
+        """Tag the tokens of multiple PreProcessor objects with part of speech at once.
+
+        The part of speech tagger is only loaded once and all sentences are tagged in a
+        single call, which is much faster than tagging each sentence separately.
+        Only PreProcessor objects that deferred part of speech tagging are tagged.
+        Once tagged, the objects no longer defer part of speech tagging.
+
+        Parameters
+        ----------
+        processed_sentences : list[PreProcessor]
+            List of PreProcessor objects to tag.
+        """
+        deferred = [p for p in processed_sentences if p.defer_pos_tagging]
+        tagged_sentences = pos_tag_sents(
+            [[t.lower() for t in p.tokenized_sentence] for p in deferred]
+        )
+        for p, tagged in zip(deferred, tagged_sentences):
+            p.pos_tags = [
+                "CD" if p._is_numeric(token) else tag for token, tag in tagged
+            ]
+            p.defer_pos_tagging = False
+
     def _is_unit(self, token: str) -> bool:
         """Return True if token is a unit.
 
@@ -891,18 +1327,53 @@ class PreProcessor:
         dict[str, str | bool]
             Dict of features for token at given index.
         """
-        token = self._feature_tokens[index]
+        if index not in self._common_features_cache:
+            token = self._feature_tokens[index]
+            self._common_features_cache[index] = {
+                "is_capitalised": self._is_capitalised(token),
+                "is_unit": self._is_unit(token),
+                "is_punc": self._is_punc(token),
+                "is_ambiguous": self._is_ambiguous_unit(token),
+                "is_in_parens": self._is_inside_parentheses(index),
+                "is_after_comma": self._follows_comma(index),
+                "is_after_plus": self._follows_plus(index),
+                "word_shape": self._word_shape(token),
+            }
+
         return {
-            prefix + "is_capitalised": self._is_capitalised(token),
-            prefix + "is_unit": self._is_unit(token),
-            prefix + "is_punc": self._is_punc(token),
-            prefix + "is_ambiguous": self._is_ambiguous_unit(token),
-            prefix + "is_in_parens": self._is_inside_parentheses(index),
-            prefix + "is_after_comma": self._follows_comma(index),
-            prefix + "is_after_plus": self._follows_plus(index),
-            prefix + "word_shape": self._word_shape(token),
+            prefix + key: value
+            for key, value in self._common_features_cache[index].items()
         }
 
+    def _common_attributes(
+        self, index: int, prefix: str, known_attributes: frozenset[str] | None = None
+    ) -> tuple[str, ...]:
+        """Return common features for token at given index, encoded as attributes.
+
+        Parameters
+        ----------
+        index : int
+            Index of token to return attributes for.
+        prefix : str
+            Feature label prefix.
+        known_attributes : frozenset[str] | None, optional
+            If not None, only return attributes in this set.
+            Default is None.
+
+        Returns
+        -------
+        tuple[str, ...]
+            Attributes for token at given index.
+        """
+        if index not in self._common_attributes_cache:
+            self._common_attributes_cache[index] = tuple(
+                encode_features(self._common_features(index, ""))
+            )
+
+        return _prefixed_attributes(
+            self._common_attributes_cache[index], prefix, known_attributes
+        )
+
     def _ngram_features(self, token: str, prefix: str) -> dict[str, str]:
         """Return n-gram features for token in a dict.
 
@@ -1018,6 +1489,83 @@ class PreProcessor:
 
         return features
 
+    def _token_attributes(
+        self, index: int, known_attributes: frozenset[str] | None = None
+    ) -> list[str]:
+        """Return the features for the token at the given index, encoded as attributes.
+
+        The attributes are the same as encode_features(self._token_features(index)),
+        but are created directly without creating the dictionary of features.
+
+        Parameters
+        ----------
+        index : int
+            Index of token to get attributes for.
+        known_attributes : frozenset[str] | None, optional
+            If not None, only return attributes in this set.
+            Default is None.
+
+        Returns
+        -------
+        list[str]
+            List of attributes for token at index.
+        """
+        tokens = self._feature_tokens
+        pos_tags = self.pos_tags
+        known = known_attributes
+        head, ngrams, _ = _lexical_attributes(tokens[index], known)
+
+        # The lexical and common attributes are filtered when they are cached, so only
+        # the bias and part of speech attributes need to be checked here.
+        attributes = [
+            attr
+            for attr in ("bias:", "pos:" + pos_tags[index])
+            if known is None or attr in known
+        ]
+        attributes.extend(head)
+        attributes.extend(self._common_attributes(index, "", known))
+        attributes.extend(ngrams)
+
+        # Features for previous token
+        if index > 0:
+            attributes.extend(_lexical_attributes(tokens[index - 1], known)[2]["prev_"])
+            pos = f"prev_pos:{pos_tags[index - 1]}+{pos_tags[index]}"
+            if known is None or pos in known:
+                attributes.append(pos)
+            attributes.extend(self._common_attributes(index - 1, "prev_", known))
+
+        # Features for previous previous token
+        if index > 1:
+            attributes.extend(
+                _lexical_attributes(tokens[index - 2], known)[2]["prev2_"]
+            )
+            pos = "prev2_pos:" + "+".join(pos_tags[index - 2 : index + 1])
+            if known is None or pos in known:
+                attributes.append(pos)
+            attributes.extend(self._common_attributes(index - 2, "prev2_", known))
+
+        # Features for next token
+        if index < len(tokens) - 1:
+            attributes.extend(_lexical_attributes(tokens[index + 1], known)[2]["next_"])
+            pos = f"next_pos:{pos_tags[index]}+{pos_tags[index + 1]}"
+            if known is None or pos in known:
+                attributes.append(pos)
+            attributes.extend(self._common_attributes(index + 1, "next_", known))
+
+        # Features for next next token
+        if index < len(tokens) - 2:
+            attributes.extend(
+                _lexical_attributes(tokens[index + 2], known)[2]["next2_"]
+            )
+            pos = "next2_pos:" + "+".join(
+                (pos_tags[index + 2], pos_tags[index + 1], pos_tags[index])
+            )
+            if known is None or pos in known:
+                attributes.append(pos)
+            attributes.extend(self._common_attributes(index + 2, "next2_", known))
+
+        return attributes
+
     def sentence_features(self) -> list[dict[str, str | bool]]:
         """Return features for all tokens in sentence.
 
@@ -1035,3 +1583,39 @@ class PreProcessor:
             features.append(self._token_features(idx))
 
         return features
+
+    def sentence_attributes(
+        self, known_attributes: frozenset[str] | None = None
+    ) -> list[list[str]]:
+        """Return features for all tokens in sentence, encoded as CRF attributes.
+
+        These are the features returned by sentence_features, encoded using
+        encode_features, in the form the CRF model uses internally. Passing these to
+        the model avoids creating and converting a dictionary for each token, so this
+        is used when parsing sentences and when training the model.
+
+        If known_attributes is given, only the attributes in it are returned. Passing
+        the attributes a model has weights for gives the same labels and marginals,
+        because the model ignores any other attribute, but the model has fewer
+        attributes to look up.
+
+        Parameters
+        ----------
+        known_attributes : frozenset[str] | None, optional
+            If not None, only return attributes in this set, for example the attributes
+            of a model from ThreadLocalTagger.attributes.
+            Default is None, which returns all attributes.
+
+        Returns
+        -------
+        list[list[str]]
+            List of attributes for each token in sentence
+        """
+        if self.defer_pos_tagging:
+            # If part of speech tagging was deferred, do it now
+            self.pos_tags = self._tag_partofspeech(self.tokenized_sentence)
+
+        return [
+            self._token_attributes(idx, known_attributes)
+            for idx in range(len(self.tokenized_sentence))
+        ]
@@ -1,9 +1,533 @@
 #!/usr/bin/env python3
 
-from ingredient_parser.en import inspect_parser_en, parse_ingredient_en
+import asyncio
+import concurrent.futures as cf
+import copy
+import gc
+import threading
+from functools import lru_cache, partial
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from ingredient_parser.en import (
+    inspect_parser_en,
+    iter_parse_ingredients_en,
+    nbest_labels_en,
+    nbest_labels_multiple_en,
+    parse_ingredient_en,
+    parse_multiple_ingredients_en,
+    reload_models_en,
+    warmup_en,
+)
+from ingredient_parser.en.parser import FF_TAGGER, TAGGER
 
 from . import SUPPORTED_LANGUAGES
-from .dataclasses import ParsedIngredient, ParserDebugInfo
+from ._cache import ParseCache
+from ._common import chunked
+from ._tagger import BACKENDS, ThreadLocalTagger
+from .dataclasses import LabelSequence, ParsedIngredient, ParserDebugInfo
+
+
+class IngredientParser:
+    """Ingredient sentence parser, configured once and reused for many sentences.
+
+    An IngredientParser holds the parsing options, the taggers for the models used to
+    label and extract foundation foods from sentences and, optionally, a cache of
+    parsed sentences. Multiple parsers with different options, models and caches can be
+    used in the same process.
+
+    The parse_ingredient, parse_multiple_ingredients, iter_parse_ingredients and
+    inspect_parser functions use a default IngredientParser for each combination of
+    their parsing options. A cache passed to these functions is only used for that
+    call.
+
+    All parsers use the same pint unit registry, so that units returned by different
+    parsers can be compared and converted.
+
+    This class is thread safe. Each thread uses its own tagger for each model.
+
+    Parameters
+    ----------
+    lang : str
+        Language of sentences.
+        Currently supported options are: en
+    discard_isolated_stop_words : bool, optional
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+        Default is True.
+    expect_name_in_output : bool, optional
+        If True, if the model doesn't label any words in the sentence as the name,
+        fallback to selecting the most likely name from all tokens even though the
+        model gives it a different label. Note that this does guarantee the output
+        contains a name.
+        Default is True.
+    string_units : bool
+        If True, return all IngredientAmount units as strings.
+        If False, convert IngredientAmount units to pint.Unit objects where possible.
+        Default is False.
+    imperial_units : bool
+        If True, use imperial units instead of US customary units for pint.Unit objects
+        for the the following units: fluid ounce, cup, pint, quart, gallon.
+        Default is False, which results in US customary units being used.
+        This has no effect if string_units=True.
+    foundation_foods : bool, optional
+        If True, extract foundation foods from ingredient name. Foundation foods are
+        the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
+        of 'organic cucumber'.
+        Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    model : str | Path | None, optional
+        Path to the CRF model file used to label sentence tokens.
+        Default is None, which uses the model distributed with this package.
+    ff_model : str | Path | None, optional
+        Path to the CRF model file used to extract foundation foods.
+        Default is None, which uses the model distributed with this package.
+    cache : ParseCache | None, optional
+        Cache to look up parsed sentences in, and to store parsed sentences in if not
+        found.
+        Default is None, which means no cache is used.
+
+    Attributes
+    ----------
+    lang : str
+        Language of sentences.
+    options : dict[str, bool | str]
+        Parsing options.
+    tagger : ThreadLocalTagger
+        Tagger for the model used to label sentence tokens.
+    ff_tagger : ThreadLocalTagger
+        Tagger for the model used to extract foundation foods.
+    cache : ParseCache | None
+        Cache of parsed sentences.
+
+    Raises
+    ------
+    ValueError
+        If lang is not a supported language, or backend is not a supported inference
+        backend.
+    """
+
+    def __init__(
+        self,
+        lang: str = "en",
+        discard_isolated_stop_words: bool = True,
+        expect_name_in_output: bool = True,
+        string_units: bool = False,
+        imperial_units: bool = False,
+        foundation_foods: bool = False,
+        confidence: bool = True,
+        backend: str = "crfsuite",
+        model: str | Path | None = None,
+        ff_model: str | Path | None = None,
+        cache: ParseCache | None = None,
+    ):
+        if lang not in SUPPORTED_LANGUAGES:
+            raise ValueError(f'Unsupported language "{lang}"')
+        if backend not in BACKENDS:
+            raise ValueError(f'Unsupported backend "{backend}"')
+
+        self.lang = lang
+        self.options = {
+            "discard_isolated_stop_words": discard_isolated_stop_words,
+            "expect_name_in_output": expect_name_in_output,
+            "string_units": string_units,
+            "imperial_units": imperial_units,
+            "foundation_foods": foundation_foods,
+            "confidence": confidence,
+            "backend": backend,
+        }
+        self.cache = cache
+
+        match lang:
+            case "en":
+                tagger, ff_tagger = TAGGER, FF_TAGGER
+            case _:
+                raise ValueError(f'Unrecognised value "{lang}"')
+
+        if model is not None:
+            tagger = ThreadLocalTagger.shared(Path(model))
+        if ff_model is not None:
+            ff_tagger = ThreadLocalTagger.shared(Path(ff_model))
+
+        # Both taggers are replaced together by reload, so they are always read
+        # together.
+        self._taggers = (tagger, ff_tagger)
+        self._reload_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """__repr__ method.
+
+        Returns
+        -------
+        str
+            String representation of initialised object
+        """
+        options = ", ".join(f"{key}={value}" for key, value in self.options.items())
+        return f'IngredientParser(lang="{self.lang}", {options})'
+
+    @property
+    def tagger(self) -> ThreadLocalTagger:
+        """Tagger for the model used to label sentence tokens.
+
+        Returns
+        -------
+        ThreadLocalTagger
+            Tagger for model.
+        """
+        return self._taggers[0]
+
+    @property
+    def ff_tagger(self) -> ThreadLocalTagger:
+        """Tagger for the model used to extract foundation foods.
+
+        Returns
+        -------
+        ThreadLocalTagger
+            Tagger for foundation foods model.
+        """
+        return self._taggers[1]
+
+    def parse(self, sentence: str) -> ParsedIngredient:
+        """Parse an ingredient sentence to return structured data.
+
+        Parameters
+        ----------
+        sentence : str
+            Ingredient sentence to parse
+
+        Returns
+        -------
+        ParsedIngredient
+            ParsedIngredient object of structured data parsed from input string
+        """
+        tagger, ff_tagger = self._taggers
+        match self.lang:
+            case "en":
+                return parse_ingredient_en(
+                    sentence,
+                    tagger=tagger,
+                    ff_tagger=ff_tagger,
+                    cache=self.cache,
+                    **self.options,
+                )
+            case _:
+                raise ValueError(f'Unrecognised value "{self.lang}"')
+
+    def parse_many(
+        self, sentences: list[str], workers: int = 1, chunksize: int = 256
+    ) -> list[ParsedIngredient]:
+        """Parse multiple ingredient sentences in one go.
+
+        The sentences are parsed as a batch, where each stage of the parsing pipeline
+        is run over all the sentences before moving on to the next stage. Each distinct
+        sentence is only parsed once.
+
+        Parameters
+        ----------
+        sentences : list[str]
+            List of sentences to parse
+        workers : int, optional
+            Number of worker processes to parse the sentences with.
+            Default is 1, which parses the sentences in the current process.
+        chunksize : int, optional
+            Number of sentences parsed together as a batch. If workers is greater than
+            1, this is the number of sentences sent to a worker process at a time.
+            Default is 256.
+
+        Returns
+        -------
+        list[ParsedIngredient]
+            List of ParsedIngredient objects of structured data parsed
+            from input sentences
+        """
+        tagger, ff_tagger = self._taggers
+        match self.lang:
+            case "en":
+                return parse_multiple_ingredients_en(
+                    sentences,
+                    workers=workers,
+                    chunksize=chunksize,
+                    tagger=tagger,
+                    ff_tagger=ff_tagger,
+                    cache=self.cache,
+                    **self.options,
+                )
+            case _:
+                raise ValueError(f'Unrecognised value "{self.lang}"')
+
+    def iter_parse(
+        self, sentences: Iterable[str], workers: int = 1, chunksize: int = 256
+    ) -> Iterator[ParsedIngredient]:
+        """Lazily parse ingredient sentences from any iterable.
+
+        The sentences are read from the iterable and parsed as batches of chunksize
+        sentences, only when the results are requested.
+
+        Parameters
+        ----------
+        sentences : Iterable[str]
+            Iterable of sentences to parse
+        workers : int, optional
+            Number of worker processes to parse the sentences with.
+            Default is 1, which parses the sentences in the current process.
+        chunksize : int, optional
+            Number of sentences parsed together as a batch. If workers is greater than
+            1, this is the number of sentences sent to a worker process at a time.
+            Default is 256.
+
+        Returns
+        -------
+        Iterator[ParsedIngredient]
+            Iterator of ParsedIngredient objects of structured data parsed
+            from input sentences
+        """
+        tagger, ff_tagger = self._taggers
+        match self.lang:
+            case "en":
+                return iter_parse_ingredients_en(
+                    sentences,
+                    workers=workers,
+                    chunksize=chunksize,
+                    tagger=tagger,
+                    ff_tagger=ff_tagger,
+                    cache=self.cache,
+                    **self.options,
+                )
+            case _:
+                raise ValueError(f'Unrecognised value "{self.lang}"')
+
+    def inspect(self, sentence: str, nbest: int = 0) -> ParserDebugInfo:
+        """Return intermediate objects generated during parsing for inspection.
+
+        The cache is not used.
+
+        Parameters
+        ----------
+        sentence : str
+            Ingredient sentence to parse
+        nbest : int, optional
+            Number of most likely label sequences to return in the nbest attribute.
+            Default is 0, which returns none.
+
+        Returns
+        -------
+        ParserDebugInfo
+            ParserDebugInfo object containing the PreProcessor object, PostProcessor
+            object and Tagger.
+        """
+        tagger, ff_tagger = self._taggers
+        match self.lang:
+            case "en":
+                return inspect_parser_en(
+                    sentence,
+                    nbest=nbest,
+                    tagger=tagger,
+                    ff_tagger=ff_tagger,
+                    **self.options,
+                )
+            case _:
+                raise ValueError(f'Unrecognised value "{self.lang}"')
+
+    def nbest(self, sentence: str, k: int = 5) -> list[LabelSequence]:
+        """Return the k most likely label sequences for an ingredient sentence.
+
+        The label sequences are found using k-best Viterbi decoding. The parsing
+        options and cache are not used.
+
+        Parameters
+        ----------
+        sentence : str
+            Ingredient sentence
+        k : int, optional
+            Number of label sequences to return.
+            Default is 5.
+
+        Returns
+        -------
+        list[LabelSequence]
+            Up to k label sequences, most likely first.
+        """
+        match self.lang:
+            case "en":
+                return nbest_labels_en(sentence, k=k, tagger=self.tagger)
+            case _:
+                raise ValueError(f'Unrecognised value "{self.lang}"')
+
+    def nbest_many(
+        self, sentences: Iterable[str], k: int = 5
+    ) -> list[list[LabelSequence]]:
+        """Return the k most likely label sequences for each ingredient sentence.
+
+        Parameters
+        ----------
+        sentences : Iterable[str]
+            Ingredient sentences
+        k : int, optional
+            Number of label sequences to return for each sentence.
+            Default is 5.
+
+        Returns
+        -------
+        list[list[LabelSequence]]
+            Up to k label sequences for each sentence, most likely first, in the same
+            order as the input sentences.
+        """
+        match self.lang:
+            case "en":
+                return nbest_labels_multiple_en(sentences, k=k, tagger=self.tagger)
+            case _:
+                raise ValueError(f'Unrecognised value "{self.lang}"')
+
+    def reload(
+        self, model: str | Path | None = None, ff_model: str | Path | None = None
+    ) -> bool:
+        """Replace the models used by the parser, both at the same time.
+
+        Both new model files are read and checked before either model is replaced, so
+        if either file is not a valid model, the parser continues to use its current
+        models. Sentences that are already being parsed finish using the previous
+        models. If either model is replaced, the parser's cache is cleared.
+
+        Only this parser uses the new models. Other parsers, including parsers created
+        afterwards with the same model files as this parser was, and the
+        parse_ingredient functions continue to use their current models. Use
+        reload_models to replace the models distributed with this package everywhere.
+        Worker processes started by iter_parse or parse_many load the model files when
+        they start.
+
+        Parameters
+        ----------
+        model : str | Path | None, optional
+            Path to the new CRF model file used to label sentence tokens.
+            Default is None, which reads the current model file again.
+        ff_model : str | Path | None, optional
+            Path to the new CRF model file used to extract foundation foods.
+            Default is None, which reads the current model file again.
+
+        Returns
+        -------
+        bool
+            True if either model was replaced, False if both model files are the same
+            as the current ones.
+
+        Raises
+        ------
+        ValueError
+            If either model file is not a crfsuite model.
+        """
+        with self._reload_lock:
+            tagger, ff_tagger = self._taggers
+            taggers = ThreadLocalTagger.load_all(
+                [
+                    (tagger, None if model is None else Path(model)),
+                    (ff_tagger, None if ff_model is None else Path(ff_model)),
+                ]
+            )
+            reloaded = taggers != self._taggers
+            self._taggers = taggers
+
+        if reloaded and self.cache is not None:
+            self.cache.clear()
+
+        return reloaded
+
+
+@lru_cache(maxsize=128)
+def _default_parser(
+    lang: str = "en",
+    discard_isolated_stop_words: bool = True,
+    expect_name_in_output: bool = True,
+    string_units: bool = False,
+    imperial_units: bool = False,
+    foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+) -> IngredientParser:
+    """Return the default IngredientParser for the given language and options.
+
+    The same IngredientParser object is returned every time this function is called
+    with the same arguments. The parser doesn't have a cache; use _with_cache to parse
+    sentences with a cache.
+
+    Parameters
+    ----------
+    lang : str
+        Language of sentences.
+    discard_isolated_stop_words : bool, optional
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+        Default is True.
+    expect_name_in_output : bool, optional
+        If True, fallback to selecting the most likely name from all tokens if the
+        model doesn't label any words in the sentence as the name.
+        Default is True.
+    string_units : bool, optional
+        If True, return all IngredientAmount units as strings.
+        Default is False.
+    imperial_units : bool, optional
+        If True, use imperial units instead of US customary units for pint.Unit objects.
+        Default is False.
+    foundation_foods : bool, optional
+        If True, extract foundation foods from ingredient name.
+        Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens.
+        Default is "crfsuite".
+
+    Returns
+    -------
+    IngredientParser
+        IngredientParser using the default models.
+    """
+    return IngredientParser(
+        lang=lang,
+        discard_isolated_stop_words=discard_isolated_stop_words,
+        expect_name_in_output=expect_name_in_output,
+        string_units=string_units,
+        imperial_units=imperial_units,
+        foundation_foods=foundation_foods,
+        confidence=confidence,
+        backend=backend,
+    )
+
+
+def _with_cache(parser: IngredientParser, cache: ParseCache | None) -> IngredientParser:
+    """Return a parser that is the same as parser, but uses cache.
+
+    The returned parser is not kept after it is used, so the cache is only kept alive
+    by the caller.
+
+    Parameters
+    ----------
+    parser : IngredientParser
+        Parser to copy.
+    cache : ParseCache | None
+        Cache of parsed sentences.
+
+    Returns
+    -------
+    IngredientParser
+        parser if cache is None, otherwise a copy of parser that uses cache.
+    """
+    if cache is None:
+        return parser
+
+    parser = copy.copy(parser)
+    parser.cache = cache
+    return parser
 
 
 def parse_ingredient(
@@ -14,9 +538,15 @@ def parse_ingredient(
     string_units: bool = False,
     imperial_units: bool = False,
     foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    cache: ParseCache | None = None,
 ) -> ParsedIngredient:
     """Parse an ingredient sentence to return structured data.
 
+    This function is thread safe. Each thread uses its own tagger for the CRF model, so
+    sentences can be parsed concurrently from multiple threads.
+
     Parameters
     ----------
     sentence : str
@@ -48,27 +578,37 @@ def parse_ingredient(
         the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
         of 'organic cucumber'.
         Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    cache : ParseCache | None, optional
+        Cache to look up the parsed sentence in, and to store the parsed sentence in
+        if not found. The cache key is the sentence and all of the above options.
+        Default is None, which means no cache is used.
 
     Returns
     -------
     ParsedIngredient
         ParsedIngredient object of structured data parsed from input string
     """
-    if lang not in SUPPORTED_LANGUAGES:
-        raise ValueError(f'Unsupported language "{lang}"')
-
-    match lang:
-        case "en":
-            return parse_ingredient_en(
-                sentence,
-                discard_isolated_stop_words=discard_isolated_stop_words,
-                expect_name_in_output=expect_name_in_output,
-                string_units=string_units,
-                imperial_units=imperial_units,
-                foundation_foods=foundation_foods,
-            )
-        case _:
-            raise ValueError(f'Unrecognised value "{lang}"')
+    parser = _default_parser(
+        lang,
+        discard_isolated_stop_words=discard_isolated_stop_words,
+        expect_name_in_output=expect_name_in_output,
+        string_units=string_units,
+        imperial_units=imperial_units,
+        foundation_foods=foundation_foods,
+        confidence=confidence,
+        backend=backend,
+    )
+    return _with_cache(parser, cache).parse(sentence)
 
 
 def parse_multiple_ingredients(
@@ -79,14 +619,24 @@ def parse_multiple_ingredients(
     string_units: bool = False,
     imperial_units: bool = False,
     foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    workers: int = 1,
+    chunksize: int = 256,
+    cache: ParseCache | None = None,
 ) -> list[ParsedIngredient]:
     """Parse multiple ingredient sentences in one go.
 
     This function accepts a list of sentences, with element of the list representing
     one ingredient sentence.
-    A list of dictionaries is returned, with optional confidence values.
-    This function is a simple for-loop that iterates through each element of the
-    input list.
+    A list of ParsedIngredient objects is returned, in the same order as the input
+    sentences.
+    The sentences are parsed as a batch, where each stage of the parsing pipeline is
+    run over all the sentences before moving on to the next stage. This is faster than
+    calling parse_ingredient on each sentence in turn, but gives identical results.
+
+    The sentences can optionally be parsed in parallel using a pool of worker
+    processes, by setting workers to a value greater than 1.
 
     Parameters
     ----------
@@ -119,6 +669,30 @@ def parse_multiple_ingredients(
         the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
         of 'organic cucumber'.
         Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    workers : int, optional
+        Number of worker processes to parse the sentences with. The sentences are
+        split into chunks which are parsed in parallel, and the results returned in
+        the same order as the input sentences.
+        Default is 1, which parses the sentences in the current process.
+    chunksize : int, optional
+        Number of sentences parsed together as a batch. If workers is greater than 1,
+        this is the number of sentences sent to a worker process at a time.
+        Default is 256.
+    cache : ParseCache | None, optional
+        Cache to look up the parsed sentences in, and to store the parsed sentences in
+        if not found. The cache key is each sentence and all of the above options
+        apart from workers and chunksize.
+        Default is None, which means no cache is used.
 
     Returns
     -------
@@ -126,18 +700,123 @@ def parse_multiple_ingredients(
         List of ParsedIngredient objects of structured data parsed
         from input sentences
     """
-    return [
-        parse_ingredient(
-            sentence,
-            lang=lang,
-            discard_isolated_stop_words=discard_isolated_stop_words,
-            expect_name_in_output=expect_name_in_output,
-            string_units=string_units,
-            imperial_units=imperial_units,
-            foundation_foods=foundation_foods,
-        )
-        for sentence in sentences
-    ]
+    parser = _default_parser(
+        lang,
+        discard_isolated_stop_words=discard_isolated_stop_words,
+        expect_name_in_output=expect_name_in_output,
+        string_units=string_units,
+        imperial_units=imperial_units,
+        foundation_foods=foundation_foods,
+        confidence=confidence,
+        backend=backend,
+    )
+    return _with_cache(parser, cache).parse_many(
+        sentences, workers=workers, chunksize=chunksize
+    )
+
+
+def iter_parse_ingredients(
+    sentences: Iterable[str],
+    lang: str = "en",
+    discard_isolated_stop_words: bool = True,
+    expect_name_in_output: bool = True,
+    string_units: bool = False,
+    imperial_units: bool = False,
+    foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    workers: int = 1,
+    chunksize: int = 256,
+    cache: ParseCache | None = None,
+) -> Iterator[ParsedIngredient]:
+    """Lazily parse ingredient sentences from any iterable.
+
+    This function accepts any iterable of sentences, such as a list, an open file or a
+    generator, and returns an iterator that yields a ParsedIngredient object for each
+    sentence, in the same order as the input sentences.
+    The sentences are read from the iterable and parsed as batches of chunksize
+    sentences, only when the results are requested. This allows very large or unbounded
+    inputs to be parsed without holding all the sentences or results in memory.
+
+    The sentences can optionally be parsed in parallel using a pool of worker
+    processes, by setting workers to a value greater than 1. At most 2 * workers
+    chunks are being parsed or waiting to be yielded at any time.
+
+    Parameters
+    ----------
+    sentences : Iterable[str]
+        Iterable of sentences to parse
+    lang : str
+        Language of sentence.
+        Currently supported options are: en
+    discard_isolated_stop_words : bool, optional
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+        Default is True.
+    expect_name_in_output : bool, optional
+        If True, if the model doesn't label any words in the sentence as the name,
+        fallback to selecting the most likely name from all tokens even though the
+        model gives it a different label. Note that this does guarantee the output
+        contains a name.
+        Default is True.
+    string_units : bool
+        If True, return all IngredientAmount units as strings.
+        If False, convert IngredientAmount units to pint.Unit objects where possible.
+        Default is False.
+    imperial_units : bool
+        If True, use imperial units instead of US customary units for pint.Unit objects
+        for the the following units: fluid ounce, cup, pint, quart, gallon.
+        Default is False, which results in US customary units being used.
+        This has no effect if string_units=True.
+    foundation_foods : bool, optional
+        If True, extract foundation foods from ingredient name. Foundation foods are
+        the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
+        of 'organic cucumber'.
+        Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    workers : int, optional
+        Number of worker processes to parse the sentences with. The sentences are
+        split into chunks which are parsed in parallel, and the results returned in
+        the same order as the input sentences.
+        Default is 1, which parses the sentences in the current process.
+    chunksize : int, optional
+        Number of sentences parsed together as a batch. If workers is greater than 1,
+        this is the number of sentences sent to a worker process at a time.
+        Default is 256.
+    cache : ParseCache | None, optional
+        Cache to look up the parsed sentences in, and to store the parsed sentences in
+        if not found. The cache key is each sentence and all of the above options
+        apart from workers and chunksize.
+        Default is None, which means no cache is used.
+
+    Returns
+    -------
+    Iterator[ParsedIngredient]
+        Iterator of ParsedIngredient objects of structured data parsed
+        from input sentences
+    """
+    parser = _default_parser(
+        lang,
+        discard_isolated_stop_words=discard_isolated_stop_words,
+        expect_name_in_output=expect_name_in_output,
+        string_units=string_units,
+        imperial_units=imperial_units,
+        foundation_foods=foundation_foods,
+        confidence=confidence,
+        backend=backend,
+    )
+    return _with_cache(parser, cache).iter_parse(
+        sentences, workers=workers, chunksize=chunksize
+    )
 
 
 def inspect_parser(
@@ -148,9 +827,16 @@ def inspect_parser(
     string_units: bool = False,
     imperial_units: bool = False,
     foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    nbest: int = 0,
 ) -> ParserDebugInfo:
     """Return intermediate objects generated during parsing for inspection.
 
+    This function is thread safe. The returned tagger belongs to the calling thread, so
+    the marginals it returns are for the inspected sentence until the calling thread
+    parses another sentence.
+
     Parameters
     ----------
     sentence : str
@@ -182,6 +868,19 @@ def inspect_parser(
         the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
         of 'organic cucumber'.
         Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    nbest : int, optional
+        Number of most likely label sequences to return in the nbest attribute.
+        Default is 0, which returns none.
 
     Returns
     -------
@@ -189,18 +888,472 @@ def inspect_parser(
         ParserDebugInfo object containing the PreProcessor object, PostProcessor
         object and Tagger.
     """
+    parser = _default_parser(
+        lang,
+        discard_isolated_stop_words=discard_isolated_stop_words,
+        expect_name_in_output=expect_name_in_output,
+        string_units=string_units,
+        imperial_units=imperial_units,
+        foundation_foods=foundation_foods,
+        confidence=confidence,
+        backend=backend,
+    )
+    return parser.inspect(sentence, nbest=nbest)
+
+
+def nbest_labels(sentence: str, k: int = 5, lang: str = "en") -> list[LabelSequence]:
+    """Return the k most likely label sequences for an ingredient sentence.
+
+    The label sequences are found using k-best Viterbi decoding, rather than by
+    scoring every possible label sequence. The most likely label sequence is the one
+    used by parse_ingredient.
+
+    Parameters
+    ----------
+    sentence : str
+        Ingredient sentence
+    k : int, optional
+        Number of label sequences to return.
+        Default is 5.
+    lang : str
+        Language of sentence.
+        Currently supported options are: en
+
+    Returns
+    -------
+    list[LabelSequence]
+        Up to k label sequences, most likely first.
+    """
+    return _default_parser(lang).nbest(sentence, k=k)
+
+
+def nbest_labels_multiple(
+    sentences: Iterable[str], k: int = 5, lang: str = "en"
+) -> list[list[LabelSequence]]:
+    """Return the k most likely label sequences for each ingredient sentence.
+
+    Parameters
+    ----------
+    sentences : Iterable[str]
+        Ingredient sentences
+    k : int, optional
+        Number of label sequences to return for each sentence.
+        Default is 5.
+    lang : str
+        Language of sentences.
+        Currently supported options are: en
+
+    Returns
+    -------
+    list[list[LabelSequence]]
+        Up to k label sequences for each sentence, most likely first, in the same
+        order as the input sentences.
+    """
+    return _default_parser(lang).nbest_many(sentences, k=k)
+
+
+def warmup(
+    foundation_foods: bool = True,
+    lang: str = "en",
+    backend: str = "crfsuite",
+    corpus: bool = True,
+) -> dict[str, float]:
+    """Load every lazily loaded resource used to parse ingredient sentences.
+
+    The models, part of speech tagger, unit registry and caches used by the parser are
+    loaded the first time they are needed, which makes the first sentence parsed much
+    slower than the rest. Call this function when an application starts to load them
+    up front instead.
+
+    Parameters
+    ----------
+    foundation_foods : bool, optional
+        If True, also load the foundation foods model.
+        Default is True.
+    lang : str
+        Language of sentences that will be parsed.
+        Currently supported options are: en
+    backend : str, optional
+        Inference backend to load the models for, either "crfsuite" or "numpy".
+        Default is "crfsuite".
+    corpus : bool, optional
+        If True, parse a small built-in set of sentences after loading the resources.
+        Default is True.
+
+    Returns
+    -------
+    dict[str, float]
+        Time, in seconds, taken by each step, in the order the steps were run.
+
+    Raises
+    ------
+    ValueError
+        If lang is not a supported language, or backend is not a supported inference
+        backend.
+    """
+    if lang not in SUPPORTED_LANGUAGES:
+        raise ValueError(f'Unsupported language "{lang}"')
+    if backend not in BACKENDS:
+        raise ValueError(f'Unsupported backend "{backend}"')
+
+    match lang:
+        case "en":
+            return warmup_en(
+                foundation_foods=foundation_foods, backend=backend, corpus=corpus
+            )
+        case _:
+            raise ValueError(f'Unrecognised value "{lang}"')
+
+
+def prepare_for_fork(
+    foundation_foods: bool = True,
+    lang: str = "en",
+    backend: str = "crfsuite",
+    corpus: bool = True,
+) -> dict[str, float]:
+    """Load every lazily loaded resource and freeze it, before forking worker processes.
+
+    This is intended to be called in the parent process of a pre-fork server, such as
+    gunicorn with --preload, or before starting a multiprocessing pool using the fork
+    start method. The resources are loaded using warmup, then all objects currently
+    tracked by the garbage collector are moved to a permanent generation using
+    gc.freeze.
+
+    Forked child processes share the memory of the parent until a page is written to.
+    Without freezing, each garbage collection in a child process writes to the headers
+    of the objects it examines, gradually copying the memory used by the models and
+    other resources into every child. Frozen objects are never examined by the garbage
+    collector, so collections no longer copy them. Using an object still changes its
+    reference count, so the pages holding objects used to parse sentences are copied
+    either way. Most of the memory saved in each child comes from loading the
+    resources before forking, which warmup alone does; freezing only stops the
+    garbage collector copying the rest.
+
+    Parameters
+    ----------
+    foundation_foods : bool, optional
+        If True, also load the foundation foods model.
+        Default is True.
+    lang : str
+        Language of sentences that will be parsed.
+        Currently supported options are: en
+    backend : str, optional
+        Inference backend to load the models for, either "crfsuite" or "numpy".
+        Default is "crfsuite".
+    corpus : bool, optional
+        If True, parse a small built-in set of sentences after loading the resources.
+        Default is True.
+
+    Returns
+    -------
+    dict[str, float]
+        Time, in seconds, taken by each step of warmup, in the order the steps were
+        run.
+
+    Raises
+    ------
+    ValueError
+        If lang is not a supported language, or backend is not a supported inference
+        backend.
+    """
+    timings = warmup(
+        foundation_foods=foundation_foods, lang=lang, backend=backend, corpus=corpus
+    )
+    # Collect garbage first so that unreachable objects aren't frozen along with the
+    # loaded resources.
+    gc.collect()
+    gc.freeze()
+    return timings
+
+
+def reload_models(
+    model: str | Path | None = None,
+    ff_model: str | Path | None = None,
+    lang: str = "en",
+) -> bool:
+    """Replace the models distributed with this package, both at the same time.
+
+    This replaces the models used by parse_ingredient, parse_multiple_ingredients,
+    iter_parse_ingredients, inspect_parser and every IngredientParser that uses the
+    default models. It can be called whilst other threads are parsing sentences.
+
+    Both new model files are read and checked before either model is replaced, so if
+    either file is not a valid model, the current models continue to be used.
+    Sentences that are already being parsed finish using the previous models. Every
+    sentence parsed afterwards uses the new models. Cached parsed sentences are keyed by
+    a hash of each model, so sentences parsed by the previous models are never returned
+    for the new models.
+
+    Parameters
+    ----------
+    model : str | Path | None, optional
+        Path to the new CRF model file used to label sentence tokens.
+        Default is None, which reads the current model file again.
+    ff_model : str | Path | None, optional
+        Path to the new CRF model file used to extract foundation foods.
+        Default is None, which reads the current model file again.
+    lang : str
+        Language of the models.
+        Currently supported options are: en
+
+    Returns
+    -------
+    bool
+        True if either model was replaced, False if both model files are the same as
+        the current ones.
+
+    Raises
+    ------
+    ValueError
+        If lang is not a supported language, or either model file is not a crfsuite
+        model.
+    """
     if lang not in SUPPORTED_LANGUAGES:
         raise ValueError(f'Unsupported language "{lang}"')
 
     match lang:
         case "en":
-            return inspect_parser_en(
-                sentence,
-                discard_isolated_stop_words=discard_isolated_stop_words,
-                expect_name_in_output=expect_name_in_output,
-                string_units=string_units,
-                imperial_units=imperial_units,
-                foundation_foods=foundation_foods,
+            return reload_models_en(
+                model=None if model is None else Path(model),
+                ff_model=None if ff_model is None else Path(ff_model),
             )
         case _:
             raise ValueError(f'Unrecognised value "{lang}"')
+
+
+async def parse_ingredient_async(
+    sentence: str,
+    lang: str = "en",
+    discard_isolated_stop_words: bool = True,
+    expect_name_in_output: bool = True,
+    string_units: bool = False,
+    imperial_units: bool = False,
+    foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    executor: cf.Executor | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+) -> ParsedIngredient:
+    """Parse an ingredient sentence without blocking the event loop.
+
+    The sentence is parsed by calling parse_ingredient in an executor, so other
+    coroutines can continue to run whilst the sentence is being parsed.
+
+    Without a semaphore, every call submits its sentence to the executor immediately,
+    so the only limit on the work in flight is the executor: its workers limit how
+    many sentences are parsed at the same time, and the rest wait in its queue. To
+    bound the number of sentences submitted to the executor, share one semaphore
+    between the calls; a call waits for the semaphore before submitting its sentence.
+
+    If the task awaiting this coroutine is cancelled before the executor has started
+    parsing the sentence, the sentence is not parsed.
+
+    Parameters
+    ----------
+    sentence : str
+        Ingredient sentence to parse
+    lang : str
+        Language of sentence.
+        Currently supported options are: en
+    discard_isolated_stop_words : bool, optional
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+        Default is True.
+    expect_name_in_output : bool, optional
+        If True, if the model doesn't label any words in the sentence as the name,
+        fallback to selecting the most likely name from all tokens even though the
+        model gives it a different label. Note that this does guarantee the output
+        contains a name.
+        Default is True.
+    string_units : bool
+        If True, return all IngredientAmount units as strings.
+        If False, convert IngredientAmount units to pint.Unit objects where possible.
+        Default is False.
+    imperial_units : bool
+        If True, use imperial units instead of US customary units for pint.Unit objects
+        for the the following units: fluid ounce, cup, pint, quart, gallon.
+        Default is False, which results in US customary units being used.
+        This has no effect if string_units=True.
+    foundation_foods : bool, optional
+        If True, extract foundation foods from ingredient name. Foundation foods are
+        the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
+        of 'organic cucumber'.
+        Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    executor : cf.Executor | None, optional
+        Executor to parse the sentence in. This can be a ThreadPoolExecutor or a
+        ProcessPoolExecutor.
+        Default is None, which uses the default executor of the running event loop.
+    semaphore : asyncio.Semaphore | None, optional
+        Semaphore held whilst the sentence is in the executor. Sharing a
+        Semaphore(n) between calls limits them to n sentences in the executor at once.
+        Default is None, which leaves the executor as the only limit.
+
+    Returns
+    -------
+    ParsedIngredient
+        ParsedIngredient object of structured data parsed from input string
+    """
+    if lang not in SUPPORTED_LANGUAGES:
+        raise ValueError(f'Unsupported language "{lang}"')
+
+    loop = asyncio.get_running_loop()
+    parse = partial(
+        parse_ingredient,
+        sentence,
+        lang=lang,
+        discard_isolated_stop_words=discard_isolated_stop_words,
+        expect_name_in_output=expect_name_in_output,
+        string_units=string_units,
+        imperial_units=imperial_units,
+        foundation_foods=foundation_foods,
+        confidence=confidence,
+        backend=backend,
+    )
+    if semaphore is None:
+        return await loop.run_in_executor(executor, parse)
+
+    async with semaphore:
+        return await loop.run_in_executor(executor, parse)
+
+
+async def parse_multiple_ingredients_async(
+    sentences: list[str],
+    lang: str = "en",
+    discard_isolated_stop_words: bool = True,
+    expect_name_in_output: bool = True,
+    string_units: bool = False,
+    imperial_units: bool = False,
+    foundation_foods: bool = False,
+    confidence: bool = True,
+    backend: str = "crfsuite",
+    executor: cf.Executor | None = None,
+    chunksize: int = 64,
+    max_in_flight: int = 4,
+    semaphore: asyncio.Semaphore | None = None,
+) -> list[ParsedIngredient]:
+    """Parse multiple ingredient sentences in one go, without blocking the event loop.
+
+    The sentences are split into chunks of chunksize sentences, and each chunk is
+    parsed as a batch by calling parse_multiple_ingredients in an executor. At most
+    max_in_flight chunks are submitted to the executor at any time, so a long list of
+    sentences cannot fill the executor and delay other work submitted to it.
+    A list of ParsedIngredient objects is returned, in the same order as the input
+    sentences.
+
+    If the task awaiting this coroutine is cancelled, or parsing any chunk raises an
+    exception, chunks that have not yet started are not parsed.
+
+    Parameters
+    ----------
+    sentences : list[str]
+        List of sentences to parse
+    lang : str
+        Language of sentence.
+        Currently supported options are: en
+    discard_isolated_stop_words : bool, optional
+        If True, any isolated stop words in the name, preparation, or comment fields
+        are discarded.
+        Default is True.
+    expect_name_in_output : bool, optional
+        If True, if the model doesn't label any words in the sentence as the name,
+        fallback to selecting the most likely name from all tokens even though the
+        model gives it a different label. Note that this does guarantee the output
+        contains a name.
+        Default is True.
+    string_units : bool
+        If True, return all IngredientAmount units as strings.
+        If False, convert IngredientAmount units to pint.Unit objects where possible.
+        Default is False.
+    imperial_units : bool
+        If True, use imperial units instead of US customary units for pint.Unit objects
+        for the the following units: fluid ounce, cup, pint, quart, gallon.
+        Default is False, which results in US customary units being used.
+        This has no effect if string_units=True.
+    foundation_foods : bool, optional
+        If True, extract foundation foods from ingredient name. Foundation foods are
+        the fundamental foods without any descriptive terms, e.g. 'cucumber' instead
+        of 'organic cucumber'.
+        Default is False.
+    confidence : bool, optional
+        If True, calculate the confidence of each field of the parsed output.
+        If False, the marginal probabilities of the labels are not calculated and every
+        confidence is 0, which makes parsing faster.
+        Default is True.
+    backend : str, optional
+        Inference backend used to label the sentence tokens, either "crfsuite" or
+        "numpy". The numpy backend requires numpy to be installed and labels batches of
+        sentences faster. Both backends give the same labels and confidences.
+        Default is "crfsuite".
+    executor : cf.Executor | None, optional
+        Executor to parse the chunks of sentences in. This can be a ThreadPoolExecutor
+        or a ProcessPoolExecutor.
+        Default is None, which uses the default executor of the running event loop.
+    chunksize : int, optional
+        Number of sentences parsed together as a batch in the executor.
+        Smaller chunks allow cancellation to take effect sooner.
+        Default is 64.
+    max_in_flight : int, optional
+        Maximum number of chunks submitted to the executor at the same time.
+        Not used if semaphore is given.
+        Default is 4.
+    semaphore : asyncio.Semaphore | None, optional
+        Semaphore held whilst each chunk is in the executor. This can be shared with
+        other calls to this function or parse_ingredient_async, so they have a single
+        limit on the work in flight.
+        Default is None, which creates a Semaphore(max_in_flight) for this call.
+
+    Returns
+    -------
+    list[ParsedIngredient]
+        List of ParsedIngredient objects of structured data parsed
+        from input sentences
+    """
+    if lang not in SUPPORTED_LANGUAGES:
+        raise ValueError(f'Unsupported language "{lang}"')
+
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least one")
+
+    loop = asyncio.get_running_loop()
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_in_flight)
+    parse_chunk = partial(
+        parse_multiple_ingredients,
+        lang=lang,
+        discard_isolated_stop_words=discard_isolated_stop_words,
+        expect_name_in_output=expect_name_in_output,
+        string_units=string_units,
+        imperial_units=imperial_units,
+        foundation_foods=foundation_foods,
+        confidence=confidence,
+        backend=backend,
+    )
+
+    async def run_chunk(chunk: list[str]) -> list[ParsedIngredient]:
+        async with semaphore:
+            return await loop.run_in_executor(executor, parse_chunk, chunk)
+
+    tasks = [
+        asyncio.ensure_future(run_chunk(chunk))
+        for chunk in chunked(sentences, chunksize)
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # gather only cancels the tasks if it is cancelled itself, so make sure no
+        # more chunks are started if a chunk raised an exception.
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return list(chain.from_iterable(results))
@@ -0,0 +1,15 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def frequent_thread_switching():
+    """
+    Switch between threads as often as possible, to maximise the chance of concurrent
+    parses interleaving with each other, or with a reload.
+    """
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
@@ -0,0 +1,208 @@
+import asyncio
+import concurrent.futures as cf
+import threading
+
+import pytest
+
+from ingredient_parser import (
+    parse_ingredient,
+    parse_ingredient_async,
+    parse_multiple_ingredients,
+    parse_multiple_ingredients_async,
+)
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "3 lime wedges, for serving",
+    "2 large garlic cloves, finely grated",
+    "1 28 ounce can chopped tomatoes",
+    "1 lb 2 oz butter, softened",
+    "½ cup milk or fortified soy milk",
+    "3 cloves, lightly bruised",
+    "salt and freshly ground black pepper, to taste",
+]
+
+
+class CountingExecutor(cf.ThreadPoolExecutor):
+    """ThreadPoolExecutor that records how many submitted calls have started and the
+    maximum number of calls submitted but not finished at the same time.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        def run():
+            with self.lock:
+                self.started += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+
+        return super().submit(run)
+
+
+class Test_parse_ingredient_async:
+    def test_same_as_parse_ingredient(self):
+        """
+        Test that parse_ingredient_async returns the same result as parse_ingredient
+        """
+        sentence = "2 tbsp of olive oil"
+        parsed = asyncio.run(parse_ingredient_async(sentence, foundation_foods=True))
+        assert parsed == parse_ingredient(sentence, foundation_foods=True)
+
+    def test_gather(self):
+        """
+        Test that concurrently parsing sentences with a custom executor returns the
+        results in order.
+        """
+
+        async def parse_all(executor):
+            return await asyncio.gather(
+                *(parse_ingredient_async(s, executor=executor) for s in SENTENCES)
+            )
+
+        with cf.ThreadPoolExecutor(max_workers=2) as executor:
+            parsed = asyncio.run(parse_all(executor))
+
+        assert parsed == [parse_ingredient(sentence) for sentence in SENTENCES]
+
+    def test_semaphore(self):
+        """
+        Test that concurrent calls sharing a semaphore submit no more sentences to the
+        executor at the same time than the semaphore allows.
+        """
+
+        async def parse_all(executor):
+            semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(
+                *(
+                    parse_ingredient_async(s, executor=executor, semaphore=semaphore)
+                    for s in SENTENCES
+                )
+            )
+
+        with CountingExecutor(max_workers=4) as executor:
+            parsed = asyncio.run(parse_all(executor))
+
+        assert parsed == [parse_ingredient(sentence) for sentence in SENTENCES]
+        assert executor.started == len(SENTENCES)
+        assert executor.max_in_flight <= 2
+
+    def test_unsupported_language(self):
+        """
+        Test that an unsupported language raises a ValueError
+        """
+        with pytest.raises(ValueError):
+            asyncio.run(parse_ingredient_async(SENTENCES[0], lang="fr"))
+
+
+class Test_parse_multiple_ingredients_async:
+    def test_same_as_parse_multiple_ingredients(self):
+        """
+        Test that parse_multiple_ingredients_async returns the same results, in the
+        same order, as parse_multiple_ingredients.
+        """
+        sentences = SENTENCES * 3
+        parsed = asyncio.run(parse_multiple_ingredients_async(sentences, chunksize=4))
+        assert parsed == parse_multiple_ingredients(sentences)
+
+    def test_event_loop_not_blocked(self):
+        """
+        Test that other coroutines run whilst the sentences are being parsed.
+        """
+
+        async def main():
+            ticks = 0
+            task = asyncio.ensure_future(
+                parse_multiple_ingredients_async(SENTENCES * 5, chunksize=5)
+            )
+            while not task.done():
+                ticks += 1
+                await asyncio.sleep(0)
+
+            await task
+            return ticks
+
+        assert asyncio.run(main()) > 1
+
+    def test_max_in_flight(self):
+        """
+        Test that no more than max_in_flight chunks are submitted to the executor at
+        the same time.
+        """
+        with CountingExecutor(max_workers=4) as executor:
+            asyncio.run(
+                parse_multiple_ingredients_async(
+                    SENTENCES * 5, executor=executor, chunksize=2, max_in_flight=2
+                )
+            )
+
+        assert executor.started == 23
+        assert executor.max_in_flight <= 2
+
+    def test_shared_semaphore(self):
+        """
+        Test that a semaphore shared with parse_ingredient_async limits the chunks and
+        sentences submitted to the executor together.
+        """
+
+        async def main(executor):
+            semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(
+                parse_multiple_ingredients_async(
+                    SENTENCES * 2, executor=executor, chunksize=3, semaphore=semaphore
+                ),
+                *(
+                    parse_ingredient_async(s, executor=executor, semaphore=semaphore)
+                    for s in SENTENCES
+                ),
+            )
+
+        with CountingExecutor(max_workers=4) as executor:
+            asyncio.run(main(executor))
+
+        assert executor.started == 6 + len(SENTENCES)
+        assert executor.max_in_flight <= 2
+
+    def test_cancel(self):
+        """
+        Test that cancelling the task stops any chunks that have not yet started from
+        being parsed.
+        """
+
+        async def main(executor):
+            task = asyncio.ensure_future(
+                parse_multiple_ingredients_async(
+                    SENTENCES * 10, executor=executor, chunksize=1, max_in_flight=1
+                )
+            )
+            while executor.started == 0:
+                await asyncio.sleep(0)
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        with CountingExecutor(max_workers=1) as executor:
+            asyncio.run(main(executor))
+
+        assert executor.started < 10
+
+    def test_unsupported_language(self):
+        """
+        Test that an unsupported language raises a ValueError
+        """
+        with pytest.raises(ValueError):
+            asyncio.run(parse_multiple_ingredients_async(SENTENCES, lang="fr"))
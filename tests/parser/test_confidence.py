@@ -0,0 +1,74 @@
+import copy
+
+import pytest
+
+from ingredient_parser import parse_ingredient
+from ingredient_parser._tagger import Marginals
+from ingredient_parser.dataclasses import CompositeIngredientAmount, ParsedIngredient
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "1 28 ounce can chopped tomatoes",
+    "1 lb 2 oz butter, softened",
+    "1 cup plus 2 tablespoons flour",
+    "½ cup milk or fortified soy milk",
+    "one to two dozen eggs",
+    "salt and freshly ground black pepper, to taste",
+    "For the garnish",
+]
+
+
+def without_confidence(parsed: ParsedIngredient) -> ParsedIngredient:
+    """Return a copy of parsed with the confidence of every field set to 0."""
+    parsed = copy.deepcopy(parsed)
+    for field in [
+        parsed.name,
+        parsed.size,
+        parsed.preparation,
+        parsed.comment,
+        parsed.purpose,
+        *parsed.foundation_foods,
+    ]:
+        if field is not None:
+            field.confidence = 0
+
+    for amount in parsed.amount:
+        amount.confidence = 0
+        if isinstance(amount, CompositeIngredientAmount):
+            for a in amount.amounts:
+                a.confidence = 0
+
+    return parsed
+
+
+class Test_confidence:
+    @pytest.mark.parametrize("sentence", SENTENCES)
+    def test_same_as_with_confidence(self, sentence):
+        """
+        Test that parsing without confidence returns the same result as parsing with
+        confidence, except that every confidence is 0.
+        """
+        expected = parse_ingredient(sentence, foundation_foods=True)
+        parsed = parse_ingredient(sentence, foundation_foods=True, confidence=False)
+        assert parsed == without_confidence(expected)
+
+    def test_no_marginals_computed(self, monkeypatch):
+        """
+        Test that no marginals are computed when confidence is False and the model
+        labels a name.
+        """
+        calls = []
+        getitem = Marginals.__getitem__
+
+        def counting_getitem(self, key):
+            calls.append(key)
+            return getitem(self, key)
+
+        monkeypatch.setattr(Marginals, "__getitem__", counting_getitem)
+
+        parse_ingredient("2 tbsp of olive oil", foundation_foods=True, confidence=False)
+        assert calls == []
+
+        parse_ingredient("2 tbsp of olive oil", foundation_foods=True)
+        assert calls != []
@@ -0,0 +1,188 @@
+import pickle
+import shutil
+from importlib.resources import files
+
+import pytest
+
+from ingredient_parser import (
+    IngredientParser,
+    ParseCache,
+    inspect_parser,
+    parse_ingredient,
+    parse_multiple_ingredients,
+)
+from ingredient_parser._tagger import ThreadLocalTagger
+from ingredient_parser.en import PreProcessor
+from ingredient_parser.en.parser import FF_TAGGER, TAGGER, _known_attributes
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "3 lime wedges, for serving",
+    "2 large garlic cloves, finely grated",
+    "1 28 ounce can chopped tomatoes",
+    "salt and freshly ground black pepper, to taste",
+    "2 tbsp of olive oil",
+]
+
+OPTIONS = {"string_units": True, "foundation_foods": True}
+
+
+@pytest.fixture
+def model_copy(tmp_path):
+    """Copy the parser model to a temporary directory and return its path."""
+    path = tmp_path / "model.en.crfsuite"
+    shutil.copyfile(str(files("ingredient_parser.en") / "model.en.crfsuite"), path)
+    return path
+
+
+class TestIngredientParser:
+    def test_parse(self):
+        """
+        Test that parse returns the same result as parse_ingredient with the same
+        options
+        """
+        parser = IngredientParser(**OPTIONS)
+        for sentence in SENTENCES:
+            assert parser.parse(sentence) == parse_ingredient(sentence, **OPTIONS)
+
+    def test_parse_many(self):
+        """
+        Test that parse_many and iter_parse return the same results as
+        parse_multiple_ingredients with the same options
+        """
+        parser = IngredientParser(**OPTIONS)
+        expected = parse_multiple_ingredients(SENTENCES, **OPTIONS)
+        assert parser.parse_many(SENTENCES) == expected
+        assert list(parser.iter_parse(iter(SENTENCES), chunksize=3)) == expected
+
+    def test_inspect(self):
+        """
+        Test that inspect returns the same parsed sentence as inspect_parser with the
+        same options
+        """
+        parser = IngredientParser(**OPTIONS)
+        sentence = SENTENCES[0]
+        assert (
+            parser.inspect(sentence).PostProcessor.parsed
+            == inspect_parser(sentence, **OPTIONS).PostProcessor.parsed
+        )
+
+    def test_model_path(self, model_copy):
+        """
+        Test that a parser with a model path uses a separate tagger for that model,
+        and gives the same results for the same model
+        """
+        parser = IngredientParser(model=model_copy)
+        assert parser.tagger is not TAGGER
+        assert parser.tagger is IngredientParser(model=str(model_copy)).tagger
+        assert parser.parse_many(SENTENCES) == parse_multiple_ingredients(SENTENCES)
+
+    def test_model_path_workers(self, model_copy):
+        """
+        Test that worker processes use the model of the parser
+        """
+        parser = IngredientParser(model=model_copy)
+        sentences = SENTENCES * 3
+        assert parser.parse_many(sentences, workers=2, chunksize=4) == (
+            parse_multiple_ingredients(sentences)
+        )
+
+    def test_separate_caches(self):
+        """
+        Test that parsers with different caches use their own cache
+        """
+        first = IngredientParser(cache=ParseCache())
+        second = IngredientParser(cache=ParseCache())
+        first.parse(SENTENCES[0])
+        second.parse(SENTENCES[0])
+        first.cache.clear()
+        second.parse(SENTENCES[0])
+
+        assert first.cache.cache_info().currsize == 0
+        assert second.cache.cache_info().hits == 1
+
+    def test_parse_many_cache(self):
+        """
+        Test that parse_many looks up and stores sentences in the cache
+        """
+        cache = ParseCache()
+        parser = IngredientParser(cache=cache)
+        expected = parse_multiple_ingredients(SENTENCES)
+
+        assert parser.parse_many(SENTENCES[:3]) == expected[:3]
+        assert cache.cache_info().currsize == 3
+        assert parser.parse_many(SENTENCES) == expected
+        assert cache.cache_info().hits == 3
+
+    def test_unsupported_language(self):
+        """
+        Test that an unsupported language raises a ValueError
+        """
+        with pytest.raises(ValueError):
+            IngredientParser(lang="fr")
+
+
+class TestThreadLocalTagger_pickle:
+    def test_pickle(self):
+        """
+        Test that unpickling a ThreadLocalTagger returns the shared ThreadLocalTagger
+        for the same model
+        """
+        assert pickle.loads(pickle.dumps(TAGGER)) is TAGGER
+
+    def test_model_hash(self, model_copy, tmp_path):
+        """
+        Test that the model hash depends on the contents of the model file, not its
+        path
+        """
+        other = tmp_path / "other.crfsuite"
+        other.write_bytes(model_copy.read_bytes() + b"\0")
+
+        assert ThreadLocalTagger(model_copy).model_hash == TAGGER.model_hash
+        assert ThreadLocalTagger(other).model_hash != TAGGER.model_hash
+
+
+class TestThreadLocalTagger_attributes:
+    def test_attributes(self):
+        """
+        Test that the attributes read from the model file are the attributes that have
+        state feature weights
+        """
+        assert TAGGER.attributes == frozenset(TAGGER.weights._state_features)
+        assert FF_TAGGER.attributes == frozenset(FF_TAGGER.weights._state_features)
+
+    def test_invalid_model(self, tmp_path):
+        """
+        Test that ValueError is raised if the model file is not a crfsuite model
+        """
+        path = tmp_path / "model.crfsuite"
+        path.write_bytes(b"not a model")
+        with pytest.raises(ValueError):
+            ThreadLocalTagger(path).attributes
+
+    def test_known_attributes(self):
+        """
+        Test that the foundation foods model attributes are only included if
+        foundation foods are extracted
+        """
+        assert _known_attributes(TAGGER, FF_TAGGER, False) == TAGGER.attributes
+        assert _known_attributes(TAGGER, FF_TAGGER, True) == (
+            TAGGER.attributes | FF_TAGGER.attributes
+        )
+
+    @pytest.mark.parametrize("sentence", SENTENCES)
+    def test_same_labels(self, sentence):
+        """
+        Test that filtering attributes by the attributes the model knows gives the same
+        labels and marginals
+        """
+        p = PreProcessor(sentence)
+        labels, marginals = TAGGER.tag(p.sentence_attributes())
+        expected = marginals.matrix()
+        filtered_labels, filtered_marginals = TAGGER.tag(
+            p.sentence_attributes(TAGGER.attributes)
+        )
+        assert filtered_labels == labels
+        for row, expected_row in zip(filtered_marginals.matrix(), expected):
+            assert row == pytest.approx(expected_row)
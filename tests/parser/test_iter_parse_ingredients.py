@@ -0,0 +1,110 @@
+from itertools import count, islice
+from types import GeneratorType
+
+import pytest
+
+from ingredient_parser import iter_parse_ingredients, parse_multiple_ingredients
+from ingredient_parser.en import parser as en_parser
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "3 lime wedges, for serving",
+    "2 large garlic cloves, finely grated",
+    "1 28 ounce can chopped tomatoes",
+    "1 lb 2 oz butter, softened",
+    "½ cup milk or fortified soy milk",
+    "3 cloves, lightly bruised",
+    "salt and freshly ground black pepper, to taste",
+]
+
+
+def counting_sentences(consumed: list[int]):
+    """Yield sentences forever, recording the number of sentences consumed."""
+    for i in count():
+        consumed[0] = i + 1
+        yield SENTENCES[i % len(SENTENCES)]
+
+
+class Test_iter_parse_ingredients:
+    def test_generator(self):
+        """
+        Test that a generator is returned
+        """
+        assert isinstance(iter_parse_ingredients(SENTENCES), GeneratorType)
+
+    def test_same_as_parse_multiple_ingredients(self):
+        """
+        Test that the yielded results are the same, and in the same order, as
+        parse_multiple_ingredients.
+        """
+        expected = parse_multiple_ingredients(SENTENCES)
+        assert list(iter_parse_ingredients(iter(SENTENCES), chunksize=4)) == expected
+
+    def test_lazy(self):
+        """
+        Test that sentences are only consumed from the input when results are
+        requested, one chunk at a time.
+        """
+        consumed = [0]
+        results = iter_parse_ingredients(counting_sentences(consumed), chunksize=5)
+        assert consumed[0] == 0
+
+        first = list(islice(results, 6))
+        assert [p.sentence for p in first] == (SENTENCES * 2)[:6]
+        # Yielding the 6th result requires only the first two chunks to be read
+        assert consumed[0] == 10
+
+    def test_workers(self):
+        """
+        Test that parsing with multiple worker processes yields the same results, in
+        the same order, as parsing in the current process.
+        """
+        sentences = SENTENCES * 5
+        expected = parse_multiple_ingredients(sentences)
+        assert list(iter_parse_ingredients(sentences, workers=2, chunksize=4)) == (
+            expected
+        )
+
+    def test_workers_bounded(self):
+        """
+        Test that the number of sentences consumed from the input when parsing with
+        multiple worker processes is bounded.
+        """
+        consumed = [0]
+        results = iter_parse_ingredients(
+            counting_sentences(consumed), workers=2, chunksize=3
+        )
+        first = list(islice(results, 3))
+        results.close()
+
+        assert [p.sentence for p in first] == SENTENCES[:3]
+        # At most 2 * workers chunks are submitted before the first result is yielded
+        assert consumed[0] <= 2 * 2 * 3
+
+    def test_duplicates(self, monkeypatch):
+        """
+        Test that each distinct sentence in a chunk is parsed once, and duplicates
+        are yielded as separate objects with their own input sentence.
+        """
+        parsed_batches = []
+        parse_batch = en_parser._parse_batch_en
+
+        def recording_parse_batch(sentences, **kwargs):
+            parsed_batches.append(sentences)
+            return parse_batch(sentences, **kwargs)
+
+        monkeypatch.setattr(en_parser, "_parse_batch_en", recording_parse_batch)
+        sentences = ["1 cup milk", "2 eggs", " 1 cup milk ", "1 cup milk"]
+        parsed = list(iter_parse_ingredients(sentences, chunksize=4))
+
+        assert parsed_batches == [["1 cup milk", "2 eggs"]]
+        assert [p.sentence for p in parsed] == sentences
+        assert len({id(p) for p in parsed}) == 4
+
+    def test_unsupported_language(self):
+        """
+        Test that an unsupported language raises a ValueError
+        """
+        with pytest.raises(ValueError):
+            iter_parse_ingredients(SENTENCES, lang="fr")
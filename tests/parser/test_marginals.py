@@ -0,0 +1,66 @@
+import pytest
+
+from ingredient_parser import inspect_parser
+from ingredient_parser._tagger import Marginals
+from ingredient_parser.en import PreProcessor
+from ingredient_parser.en.parser import TAGGER
+
+
+class CountingTagger:
+    """Tagger stand-in that returns a fixed marginal and counts calls to marginal."""
+
+    def __init__(self):
+        self.calls = []
+
+    def marginal(self, label, i):
+        self.calls.append((label, i))
+        return 0.5
+
+
+class TestMarginals:
+    def test_computed_once(self):
+        """
+        Test that each marginal is only requested from the tagger once
+        """
+        tagger = CountingTagger()
+        marginals = Marginals(tagger, 3, ["A", "B"])
+        assert marginals.sequence(["A", "B", "A"]) == [0.5, 0.5, 0.5]
+        assert marginals.label("A") == [0.5, 0.5, 0.5]
+        assert marginals.matrix() == [[0.5, 0.5]] * 3
+
+        assert sorted(tagger.calls) == sorted(
+            [(label, i) for label in ["A", "B"] for i in range(3)]
+        )
+
+    def test_same_as_tagger(self):
+        """
+        Test that the marginals are the same as those returned by the tagger
+        """
+        features = PreProcessor(
+            "2 large garlic cloves, finely grated"
+        ).sentence_features()
+        labels, marginals = TAGGER.tag(features)
+        tagger = TAGGER.get()
+
+        assert labels == tagger.tag(features)
+        assert marginals.matrix() == [
+            [tagger.marginal(label, i) for label in tagger.labels()]
+            for i in range(len(labels))
+        ]
+
+    def test_inspect_parser(self):
+        """
+        Test that inspect_parser returns the full marginals matrix, where the
+        marginals for each token sum to 1 and the marginal of each token's label is
+        its score
+        """
+        parser_info = inspect_parser("3 lime wedges, for serving")
+        label_index = {label: i for i, label in enumerate(parser_info.tagger.labels())}
+        postprocessor = parser_info.PostProcessor
+
+        assert len(parser_info.marginals) == len(postprocessor.tokens)
+        for token_marginals, label, score in zip(
+            parser_info.marginals, postprocessor.labels, postprocessor.scores
+        ):
+            assert sum(token_marginals) == pytest.approx(1)
+            assert token_marginals[label_index[label]] == score
@@ -0,0 +1,156 @@
+import itertools
+import math
+
+import pytest
+
+from ingredient_parser import (
+    IngredientParser,
+    inspect_parser,
+    nbest_labels,
+    nbest_labels_multiple,
+)
+from ingredient_parser._tagger import CRFWeights
+from ingredient_parser.en import PreProcessor
+from ingredient_parser.en.parser import TAGGER
+
+SENTENCES = [
+    "2 tbsp of olive oil",
+    "1 28 ounce can chopped tomatoes",
+    "salt and freshly ground black pepper, to taste",
+    "For the garnish",
+]
+
+
+@pytest.fixture
+def weights():
+    """Small CRF with three labels and two attributes."""
+    state_features = {
+        "word:a": [(0, 1.31), (1, 0.47)],
+        "word:b": [(1, 1.07), (2, 0.83)],
+    }
+    transitions = [[0.23, -0.51, 0.13], [0.41, 0.29, -1.03], [-0.17, 0.61, 0.07]]
+    return CRFWeights(["X", "Y", "Z"], state_features, transitions)
+
+
+def brute_force(weights, features):
+    """Return every label sequence and its probability, most likely first."""
+    state_scores = weights.state_scores(features)
+    n_labels = len(weights.labels)
+    sequences = []
+    for seq in itertools.product(range(n_labels), repeat=len(features)):
+        score = sum(state_scores[t][j] for t, j in enumerate(seq))
+        score += sum(weights._transitions[i][j] for i, j in itertools.pairwise(seq))
+        sequences.append(([weights.labels[i] for i in seq], score))
+
+    log_z = math.log(sum(math.exp(score) for _, score in sequences))
+    sequences = [(labels, math.exp(score - log_z)) for labels, score in sequences]
+    return sorted(sequences, key=lambda x: x[1], reverse=True)
+
+
+class TestCRFWeights_nbest:
+    def test_same_as_brute_force(self, weights):
+        """
+        Test that k-best Viterbi finds the same sequences and probabilities as scoring
+        every possible sequence
+        """
+        features = [{"word": "a"}, {"word": "b"}, {"word": "a"}, {"word": "c"}]
+        expected = brute_force(weights, features)
+        probabilities = {tuple(labels): p for labels, p in expected}
+        nbest = weights.nbest(features, 10)
+
+        # Sequences with equal probabilities may be in a different order, so compare
+        # the probabilities in order and check each sequence has its probability.
+        assert [p for _, p in nbest] == pytest.approx([p for _, p in expected[:10]])
+        for labels, p in nbest:
+            assert p == pytest.approx(probabilities[tuple(labels)])
+        assert len(set(tuple(labels) for labels, _ in nbest)) == 10
+
+    def test_k_larger_than_possible(self, weights):
+        """
+        Test that every sequence is returned if k is greater than the number of
+        possible sequences, and the probabilities sum to 1
+        """
+        nbest = weights.nbest([{"word": "a"}, {"word": "b"}], 100)
+        assert len(nbest) == 9
+        assert sum(p for _, p in nbest) == pytest.approx(1)
+
+    def test_empty(self, weights):
+        """
+        Test that an empty list is returned for a sentence with no tokens
+        """
+        assert weights.nbest([], 5) == []
+
+    def test_invalid_k(self, weights):
+        """
+        Test that ValueError is raised if k is less than one
+        """
+        with pytest.raises(ValueError):
+            weights.nbest([{"word": "a"}], 0)
+
+
+class Test_nbest_labels:
+    @pytest.mark.parametrize("sentence", SENTENCES)
+    def test_best_is_tagger_labels(self, sentence):
+        """
+        Test that the most likely sequence is the sequence returned by the tagger, and
+        every probability matches the tagger's probability for that sequence
+        """
+        features = PreProcessor(sentence).sentence_features()
+        tagger = TAGGER.get()
+        expected = tagger.tag(features)
+
+        nbest = nbest_labels(sentence, k=5)
+        assert nbest[0].labels == expected
+        # The weights read from the model are rounded, so the probabilities are only
+        # approximately the same.
+        for seq in nbest:
+            assert seq.probability == pytest.approx(
+                tagger.probability(seq.labels), rel=1e-4
+            )
+
+        probabilities = [seq.probability for seq in nbest]
+        assert probabilities == sorted(probabilities, reverse=True)
+        assert len(set(tuple(seq.labels) for seq in nbest)) == 5
+
+    def test_same_as_brute_force(self):
+        """
+        Test that the k most likely sequences of a short sentence are the same as
+        found by scoring every possible sequence with the tagger
+        """
+        sentence = "salt to taste"
+        features = PreProcessor(sentence).sentence_features()
+        tagger = TAGGER.get()
+        tagger.set(features)
+        expected = sorted(
+            (list(seq) for seq in itertools.product(tagger.labels(), repeat=3)),
+            key=tagger.probability,
+            reverse=True,
+        )[:5]
+
+        assert [seq.labels for seq in nbest_labels(sentence, k=5)] == expected
+
+    def test_multiple(self):
+        """
+        Test that the sequences for a batch of sentences are the same as for each
+        sentence individually
+        """
+        expected = [nbest_labels(sentence, k=3) for sentence in SENTENCES]
+        assert nbest_labels_multiple(SENTENCES, k=3) == expected
+
+    def test_parser(self):
+        """
+        Test that IngredientParser returns the same sequences as nbest_labels
+        """
+        parser = IngredientParser()
+        assert parser.nbest(SENTENCES[0], k=3) == nbest_labels(SENTENCES[0], k=3)
+        assert parser.nbest_many(SENTENCES, k=3) == nbest_labels_multiple(SENTENCES, 3)
+
+    def test_inspect_parser(self):
+        """
+        Test that inspect_parser only returns sequences when requested
+        """
+        assert inspect_parser(SENTENCES[0]).nbest == []
+
+        parser_info = inspect_parser(SENTENCES[0], nbest=3)
+        assert parser_info.nbest == nbest_labels(SENTENCES[0], k=3)
+        assert parser_info.nbest[0].labels == parser_info.PostProcessor.labels
@@ -0,0 +1,163 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from ingredient_parser import IngredientParser, parse_ingredient
+from ingredient_parser.en import PreProcessor
+from ingredient_parser.en.parser import FF_TAGGER, TAGGER
+
+np = pytest.importorskip("numpy")
+
+TRAINING_CSVS = [
+    "train/data/bbc/bbc-ingredients-snapshot-2017.csv",
+    "train/data/cookstr/cookstr-ingredients-snapshot-2017.csv",
+]
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "1 28 ounce can chopped tomatoes",
+    "1 lb 2 oz butter, softened",
+    "½ cup milk or fortified soy milk",
+    "salt and freshly ground black pepper, to taste",
+    "For the garnish",
+]
+
+
+def load_training_sentences(n: int) -> list[str]:
+    """Load the first n sentences from each training data csv file."""
+    sentences = []
+    for path in TRAINING_CSVS:
+        with (Path(__file__).parents[2] / path).open(encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            sentences.extend(row["input"] for _, row in zip(range(n), reader))
+
+    return sentences
+
+
+@pytest.fixture(scope="module")
+def training_features():
+    """Features for sentences from the training data."""
+    processed = [
+        PreProcessor(sentence, defer_pos_tagging=True)
+        for sentence in load_training_sentences(500)
+    ]
+    PreProcessor.tag_partofspeech_batch(processed)
+    return [p.sentence_attributes() for p in processed]
+
+
+def assert_same_as_crfsuite(tagger, features_batch):
+    """Assert the numpy backend gives the same labels and marginals as pycrfsuite."""
+    tagged = tagger.numpy_crf.tag_batch(features_batch)
+    assert len(tagged) == len(features_batch)
+    for features, (labels, marginals) in zip(features_batch, tagged):
+        expected_labels, expected_marginals = tagger.tag(features)
+        assert labels == expected_labels
+        np.testing.assert_allclose(
+            marginals.matrix(), expected_marginals.matrix(), rtol=0, atol=1e-9
+        )
+
+
+class TestNumpyCRF:
+    def test_weights(self):
+        """
+        Test that the weights read from the model file are the same as the weights
+        pycrfsuite reads, which are rounded
+        """
+        crf = TAGGER.numpy_crf
+        weights = TAGGER.weights
+        assert crf.labels == weights.labels
+        np.testing.assert_allclose(
+            crf._transitions, weights._transitions, rtol=0, atol=1e-6
+        )
+        for attr, label_weights in weights._state_features.items():
+            row = crf._state_weights[crf._attribute_index[attr]]
+            for label_idx, weight in label_weights:
+                assert row[label_idx] == pytest.approx(weight, abs=1e-6)
+
+    def test_training_data(self, training_features):
+        """
+        Test that the labels and marginals for sentences from the training data are
+        the same as pycrfsuite's when tagged as a single batch
+        """
+        assert_same_as_crfsuite(TAGGER, training_features)
+
+    def test_foundation_foods_model(self, training_features):
+        """
+        Test that the labels and marginals from the foundation foods model are the
+        same as pycrfsuite's
+        """
+        assert_same_as_crfsuite(FF_TAGGER, training_features[:200])
+
+    def test_batch_same_as_single(self, training_features):
+        """
+        Test that tagging sentences of different lengths as a padded batch gives the
+        same result as tagging each sentence on its own
+        """
+        crf = TAGGER.numpy_crf
+        batch = crf.tag_batch(training_features[:50])
+        for features, (labels, marginals) in zip(training_features[:50], batch):
+            single_labels, single_marginals = crf.tag(features)
+            assert labels == single_labels
+            np.testing.assert_allclose(marginals.matrix(), single_marginals.matrix())
+
+    def test_unknown_attributes(self):
+        """
+        Test that attributes the model has no weights for are ignored, and features
+        can be given as dicts
+        """
+        features = PreProcessor("2 tbsp of olive oil").sentence_features()
+        unknown = [{**token, "not_a_feature": "x"} for token in features]
+        labels, _ = TAGGER.numpy_crf.tag(unknown)
+        assert labels == TAGGER.tag(features)[0]
+
+    def test_empty(self):
+        """
+        Test that empty sentences are labelled with no labels
+        """
+        tagged = TAGGER.numpy_crf.tag_batch([[], [["bias:"]]])
+        assert tagged[0][0] == []
+        assert tagged[0][1].matrix() == []
+        assert len(tagged[1][0]) == 1
+        assert TAGGER.numpy_crf.tag_batch([]) == []
+
+    def test_invalid_model(self):
+        """
+        Test that ValueError is raised if the model file is not a crfsuite model
+        """
+        with pytest.raises(ValueError):
+            TAGGER.numpy_crf.from_model(b"not a model")
+
+
+class Test_backend:
+    @pytest.mark.parametrize("sentence", SENTENCES)
+    def test_parse_ingredient(self, sentence):
+        """
+        Test that parsing with the numpy backend gives the same result as the
+        crfsuite backend
+        """
+        expected = parse_ingredient(sentence, foundation_foods=True)
+        assert parse_ingredient(sentence, foundation_foods=True, backend="numpy") == (
+            expected
+        )
+
+    def test_parse_many(self):
+        """
+        Test that parsing a batch with the numpy backend gives the same result as the
+        crfsuite backend
+        """
+        sentences = load_training_sentences(100)
+        expected = IngredientParser(foundation_foods=True).parse_many(sentences)
+        parser = IngredientParser(foundation_foods=True, backend="numpy")
+        assert parser.parse_many(sentences, chunksize=64) == expected
+
+    def test_invalid_backend(self):
+        """
+        Test that ValueError is raised for an unsupported backend
+        """
+        with pytest.raises(ValueError):
+            IngredientParser(backend="torch")
+
+        with pytest.raises(ValueError):
+            TAGGER.tag([["bias:"]], "torch")
@@ -0,0 +1,100 @@
+import pytest
+
+from ingredient_parser import parse_ingredient, parse_multiple_ingredients
+from ingredient_parser.en import parser as en_parser
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "3 lime wedges, for serving",
+    "2 large garlic cloves, finely grated",
+    "1 28 ounce can chopped tomatoes",
+    "1 lb 2 oz butter, softened",
+    "½ cup milk or fortified soy milk",
+    "3 cloves, lightly bruised",
+    "salt and freshly ground black pepper, to taste",
+    "",
+    "2 tbsp of olive oil",
+]
+
+
+class Test_parse_multiple_ingredients:
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"discard_isolated_stop_words": False},
+            {"expect_name_in_output": False},
+            {"string_units": True},
+            {"imperial_units": True},
+            {"foundation_foods": True},
+            {"confidence": False},
+        ],
+    )
+    def test_same_as_parse_ingredient(self, options):
+        """
+        Test that parsing a batch of sentences returns the same results as parsing
+        each sentence individually.
+        """
+        expected = [parse_ingredient(sentence, **options) for sentence in SENTENCES]
+        assert parse_multiple_ingredients(SENTENCES, **options) == expected
+
+    def test_workers(self):
+        """
+        Test that parsing a batch of sentences with multiple worker processes returns
+        the same results, in the same order, as parsing in the current process.
+        """
+        sentences = SENTENCES * 5
+        expected = parse_multiple_ingredients(sentences, foundation_foods=True)
+        assert (
+            parse_multiple_ingredients(
+                sentences, foundation_foods=True, workers=2, chunksize=7
+            )
+            == expected
+        )
+
+    def test_duplicates(self):
+        """
+        Test that duplicate sentences, including sentences that only differ by
+        leading or trailing whitespace, are returned as separate objects with their
+        own input sentence.
+        """
+        sentences = ["1 cup milk", " 1 cup milk ", "1 cup milk"]
+        parsed = parse_multiple_ingredients(sentences)
+
+        assert [p.sentence for p in parsed] == sentences
+        assert len({id(p) for p in parsed}) == 3
+        parsed[0].amount.clear()
+        assert parsed[2] == parse_ingredient("1 cup milk")
+
+    def test_parsed_once(self, monkeypatch):
+        """
+        Test that each distinct sentence is parsed once, even if its duplicates are in
+        different chunks.
+        """
+        parsed_batches = []
+        parse_batch = en_parser._parse_batch_en
+
+        def recording_parse_batch(sentences, **kwargs):
+            parsed_batches.append(sentences)
+            return parse_batch(sentences, **kwargs)
+
+        monkeypatch.setattr(en_parser, "_parse_batch_en", recording_parse_batch)
+        parse_multiple_ingredients(
+            ["1 cup milk", "2 eggs", "1 cup milk", "salt"] * 2, chunksize=2
+        )
+
+        assert parsed_batches == [["1 cup milk", "2 eggs"], ["salt"]]
+
+    def test_empty_list(self):
+        """
+        Test that an empty list of sentences returns an empty list
+        """
+        assert parse_multiple_ingredients([]) == []
+
+    def test_unsupported_language(self):
+        """
+        Test that an unsupported language raises a ValueError
+        """
+        with pytest.raises(ValueError):
+            parse_multiple_ingredients(SENTENCES, lang="fr")
@@ -0,0 +1,339 @@
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib.resources import files
+
+import pycrfsuite
+import pytest
+
+from ingredient_parser import (
+    IngredientParser,
+    ParseCache,
+    inspect_parser,
+    reload_models,
+)
+from ingredient_parser._tagger import ThreadLocalTagger
+from ingredient_parser.en.parser import TAGGER
+from ingredient_parser.en.preprocess import PreProcessor
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "3 lime wedges, for serving",
+    "2 large garlic cloves, finely grated",
+    "1 28 ounce can chopped tomatoes",
+    "1 lb 2 oz butter, softened",
+    "½ cup milk or fortified soy milk",
+    "salt and freshly ground black pepper, to taste",
+]
+
+
+@pytest.fixture
+def models(tmp_path):
+    """
+    Copies of the models distributed with the package and a small model trained on a
+    few sentences, which labels sentences differently to the distributed model.
+    """
+    package = files("ingredient_parser.en")
+    model = tmp_path / "model.crfsuite"
+    model.write_bytes((package / "model.en.crfsuite").read_bytes())
+    ff_model = tmp_path / "ff_model.crfsuite"
+    ff_model.write_bytes((package / "ff_model.en.crfsuite").read_bytes())
+
+    labels = TAGGER.get().labels()
+    trainer = pycrfsuite.Trainer(verbose=False)
+    for sentence in ["2 cups flour, sifted", "1 onion, finely chopped"]:
+        trainer.append(
+            PreProcessor(sentence).sentence_features(),
+            inspect_parser(sentence).PostProcessor.labels,
+        )
+    # Make sure the model has every label the distributed model has.
+    trainer.append([{"bias": ""} for _ in labels], labels)
+    trainer.set_params({"max_iterations": 5})
+    small_model = tmp_path / "small_model.crfsuite"
+    trainer.train(str(small_model))
+
+    return model, ff_model, small_model
+
+
+class TestThreadLocalTagger_reload:
+    def test_reload(self, models):
+        """
+        Test that the tagger uses the new model after reloading, and a tagger pinned
+        before reloading continues to use the previous model
+        """
+        model, _, small_model = models
+        tagger = ThreadLocalTagger(model)
+        pinned = tagger.pin()
+        previous_hash = tagger.model_hash
+
+        assert tagger.reload(small_model)
+        assert tagger.model == small_model
+        assert tagger.model_hash != previous_hash
+        assert pinned.model == model
+        assert pinned.model_hash == previous_hash
+        assert tagger.pin() is not pinned
+
+    def test_reload_unchanged(self, models):
+        """
+        Test that reloading the same model file does not replace the model
+        """
+        model, _, _ = models
+        tagger = ThreadLocalTagger(model)
+        pinned = tagger.pin()
+
+        assert not tagger.reload()
+        assert not tagger.reload(model)
+        assert tagger.pin() is pinned
+
+    def test_reload_changed_file(self, models):
+        """
+        Test that reloading reads the model file again, so a model file that has been
+        overwritten is loaded
+        """
+        model, _, small_model = models
+        tagger = ThreadLocalTagger(model)
+        previous_hash = tagger.model_hash
+        shutil.copy(small_model, model)
+
+        assert tagger.reload()
+        assert tagger.model_hash != previous_hash
+
+    def test_reload_loaded_resources(self, models):
+        """
+        Test that anything loaded from the previous model is loaded from the new
+        model before it is used
+        """
+        pytest.importorskip("numpy")
+        model, _, small_model = models
+        tagger = ThreadLocalTagger(model)
+        previous_numpy_crf = tagger.numpy_crf
+
+        tagger.reload(small_model)
+        assert tagger.pin()._loaded.loaded_numpy_crf
+        assert tagger.numpy_crf is not previous_numpy_crf
+
+    @pytest.mark.parametrize("data", [b"", b"not a model", b"lCRF" + bytes(100)])
+    def test_invalid_model(self, models, tmp_path, data):
+        """
+        Test that ValueError is raised for a file that isn't a crfsuite model, and the
+        tagger continues to use the previous model
+        """
+        model, _, _ = models
+        invalid = tmp_path / "invalid.crfsuite"
+        invalid.write_bytes(data)
+        tagger = ThreadLocalTagger(model)
+        pinned = tagger.pin()
+
+        with pytest.raises(ValueError):
+            tagger.reload(invalid)
+        assert tagger.pin() is pinned
+
+    def test_reload_pinned(self, models):
+        """
+        Test that ValueError is raised if a pinned tagger is reloaded
+        """
+        model, _, small_model = models
+        with pytest.raises(ValueError):
+            ThreadLocalTagger(model).pin().reload(small_model)
+
+    def test_reload_shared(self, models):
+        """
+        Test that a shared tagger reloaded with a different model file is no longer
+        shared for its previous model file
+        """
+        model, _, small_model = models
+        tagger = ThreadLocalTagger.shared(model)
+        assert ThreadLocalTagger.shared(model) is tagger
+
+        tagger.reload(small_model)
+        shared = ThreadLocalTagger.shared(model)
+        assert shared is not tagger
+        assert shared.model == model
+
+    def test_load_all(self, models):
+        """
+        Test that load_all returns a new tagger for a new model without changing the
+        current tagger, and the current tagger if the model is unchanged
+        """
+        model, ff_model, small_model = models
+        tagger, ff_tagger = ThreadLocalTagger(model), ThreadLocalTagger(ff_model)
+
+        new_tagger, new_ff_tagger = ThreadLocalTagger.load_all(
+            [(tagger, small_model), (ff_tagger, None)]
+        )
+        assert new_tagger.model == small_model
+        assert tagger.model == model
+        assert new_ff_tagger is ff_tagger
+
+    def test_reload_all_invalid(self, models, tmp_path):
+        """
+        Test that if any model file is invalid, no tagger is reloaded
+        """
+        model, ff_model, small_model = models
+        invalid = tmp_path / "invalid.crfsuite"
+        invalid.write_bytes(b"not a model")
+        tagger, ff_tagger = ThreadLocalTagger(model), ThreadLocalTagger(ff_model)
+
+        with pytest.raises(ValueError):
+            ThreadLocalTagger.reload_all([(tagger, small_model), (ff_tagger, invalid)])
+        assert tagger.model == model
+        assert ff_tagger.model == ff_model
+
+
+class TestIngredientParser_reload:
+    def test_reload(self, models):
+        """
+        Test that the parser gives the same results as a new parser for the new model
+        after reloading
+        """
+        model, ff_model, small_model = models
+        parser = IngredientParser(model=model, ff_model=ff_model)
+        before = [parser.parse(sentence) for sentence in SENTENCES]
+
+        assert parser.reload(model=small_model)
+        expected = [
+            IngredientParser(model=small_model, ff_model=ff_model).parse(sentence)
+            for sentence in SENTENCES
+        ]
+        assert [parser.parse(sentence) for sentence in SENTENCES] == expected
+        assert expected != before
+
+    def test_other_parsers_unchanged(self, models):
+        """
+        Test that reloading a parser does not change the models used by other parsers
+        using the same model files, parsers created afterwards or parse_ingredient
+        """
+        model, ff_model, small_model = models
+        parser = IngredientParser(model=model, ff_model=ff_model)
+        other = IngredientParser(model=model, ff_model=ff_model)
+        before = [other.parse(sentence) for sentence in SENTENCES]
+
+        assert parser.reload(model=small_model)
+        assert parser.tagger.model == small_model
+        assert other.tagger.model == model
+        assert [other.parse(sentence) for sentence in SENTENCES] == before
+
+        new = IngredientParser(model=model, ff_model=ff_model)
+        assert new.tagger.model == model
+        assert [new.parse(sentence) for sentence in SENTENCES] == before
+
+        default = IngredientParser()
+        default_model = TAGGER.model
+        assert default.reload(model=small_model)
+        assert default.tagger.model == small_model
+        assert TAGGER.model == default_model
+        assert IngredientParser().tagger is TAGGER
+
+    def test_cache_cleared(self, models):
+        """
+        Test that the parser's cache is cleared when the model is replaced, and
+        sentences are parsed using the new model
+        """
+        model, ff_model, small_model = models
+        cache = ParseCache()
+        parser = IngredientParser(model=model, ff_model=ff_model, cache=cache)
+        parser.parse_many(SENTENCES)
+        assert len(cache) == len(SENTENCES)
+
+        assert not parser.reload()
+        assert len(cache) == len(SENTENCES)
+
+        parser.reload(model=small_model)
+        assert len(cache) == 0
+        expected = IngredientParser(model=small_model, ff_model=ff_model).parse_many(
+            SENTENCES
+        )
+        assert parser.parse_many(SENTENCES) == expected
+
+    def test_in_flight_iter_parse(self, models):
+        """
+        Test that sentences parsed by iter_parse after a reload, but which were passed
+        to iter_parse before the reload, are parsed using the previous model
+        """
+        model, ff_model, small_model = models
+        parser = IngredientParser(model=model, ff_model=ff_model)
+        expected = parser.parse_many(SENTENCES)
+
+        parsed = parser.iter_parse(SENTENCES, chunksize=1)
+        first = next(parsed)
+        parser.reload(model=small_model)
+
+        assert [first, *parsed] == expected
+
+    def test_concurrent_reload(self, models, frequent_thread_switching):
+        """
+        Test that sentences parsed whilst another thread repeatedly reloads the models
+        are always parsed entirely by either the previous models or the new models
+        """
+        model, ff_model, small_model = models
+        parser = IngredientParser(foundation_foods=True, model=model, ff_model=ff_model)
+        expected = {
+            path: [
+                IngredientParser(
+                    foundation_foods=True, model=path, ff_model=ff_model
+                ).parse(sentence)
+                for sentence in SENTENCES
+            ]
+            for path in (model, small_model)
+        }
+
+        stop = threading.Event()
+
+        def reload():
+            reloads = 0
+            while not stop.is_set():
+                parser.reload(model=small_model if reloads % 2 == 0 else model)
+                reloads += 1
+            return reloads
+
+        def parse(i):
+            sentence = SENTENCES[i % len(SENTENCES)]
+            return i % len(SENTENCES), parser.parse(sentence)
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            reloads = executor.submit(reload)
+            try:
+                results = list(executor.map(parse, range(len(SENTENCES) * 25)))
+            finally:
+                stop.set()
+
+        assert reloads.result() > 0
+        for i, parsed in results:
+            assert parsed in (expected[model][i], expected[small_model][i])
+
+
+class Test_reload_models:
+    def test_reload_unchanged(self):
+        """
+        Test that reloading the models distributed with the package doesn't replace
+        them
+        """
+        pinned = TAGGER.pin()
+        assert not reload_models()
+        assert TAGGER.pin() is pinned
+
+    def test_reload(self, models):
+        """
+        Test that the default models are replaced, then restored
+        """
+        model, _, small_model = models
+        default_model = TAGGER.model
+        try:
+            assert reload_models(model=small_model)
+            assert TAGGER.model == small_model
+            assert ThreadLocalTagger.shared(default_model) is not TAGGER
+        finally:
+            reload_models(model=default_model)
+            # Restore the shared tagger for the default model, which was removed when
+            # the default tagger was reloaded with a different model file.
+            ThreadLocalTagger._shared[str(default_model)] = TAGGER
+
+        assert TAGGER.model == default_model
+
+    def test_invalid(self):
+        """
+        Test that ValueError is raised for an unsupported language
+        """
+        with pytest.raises(ValueError):
+            reload_models(lang="fr")
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from ingredient_parser import inspect_parser, parse_ingredient
+from ingredient_parser.en.parser import TAGGER
+from ingredient_parser.en.preprocess import PreProcessor
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "3 lime wedges, for serving",
+    "2 large garlic cloves, finely grated",
+    "1 28 ounce can chopped tomatoes",
+    "1 lb 2 oz butter, softened",
+    "½ cup milk or fortified soy milk",
+    "3 cloves, lightly bruised",
+    "salt and freshly ground black pepper, to taste",
+    "4 x 100 g wild salmon fillets, skinned",
+]
+
+
+class TestThreadSafety:
+    def test_separate_tagger_per_thread(self):
+        """
+        Test that each thread gets its own Tagger, and the same thread always gets
+        the same Tagger
+        """
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            # Keep the Taggers, not their ids, so that a Tagger freed when its thread
+            # exits can't have its id reused by the Tagger for this thread.
+            taggers = list(executor.map(lambda _: TAGGER.get(), range(4)))
+
+        assert TAGGER.get() is TAGGER.get()
+        assert all(tagger is not TAGGER.get() for tagger in taggers)
+
+    def test_concurrent_marginals(self, frequent_thread_switching):
+        """
+        Test that the marginals read after tagging a sentence in one thread are not
+        affected by other threads tagging different sentences at the same time
+        """
+        features = [PreProcessor(s).sentence_features() for s in SENTENCES]
+
+        def tag(X):
+            tagger = TAGGER.get()
+            labels = tagger.tag(X)
+            return labels, [tagger.marginal(label, i) for i, label in enumerate(labels)]
+
+        expected = [tag(X) for X in features]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(tag, features * 50))
+
+        assert results == expected * 50
+
+    def test_concurrent_parse_ingredient(self, frequent_thread_switching):
+        """
+        Test that parsing sentences concurrently in multiple threads gives the same
+        results, including confidence values, as parsing them in a single thread
+        """
+        expected = [parse_ingredient(s, foundation_foods=True) for s in SENTENCES]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda s: parse_ingredient(s, foundation_foods=True),
+                    SENTENCES * 20,
+                )
+            )
+
+        assert results == expected * 20
+
+    def test_concurrent_inspect_parser(self, frequent_thread_switching):
+        """
+        Test that the tagger returned by inspect_parser belongs to the calling
+        thread, so its marginals are for the inspected sentence
+        """
+
+        def marginals(sentence):
+            info = inspect_parser(sentence)
+            return [
+                info.tagger.marginal(label, i)
+                for i, label in enumerate(info.PostProcessor.labels)
+            ]
+
+        expected = [marginals(s) for s in SENTENCES]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(marginals, SENTENCES * 20))
+
+        assert results == expected * 20
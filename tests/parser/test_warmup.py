@@ -0,0 +1,95 @@
+import gc
+
+import pytest
+
+from ingredient_parser import prepare_for_fork, warmup
+from ingredient_parser.en._regex import QUANTITY_UNITS_BOUNDARY_PATTERN
+from ingredient_parser.en._utils import convert_to_pint_unit
+from ingredient_parser.en.parser import FF_TAGGER, TAGGER
+
+
+class Test_warmup:
+    def test_steps(self):
+        """
+        Test that the time taken by every step is returned, in the order the steps
+        were run
+        """
+        timings = warmup()
+        assert list(timings) == [
+            "pos_tagger",
+            "parser_model",
+            "foundation_foods_model",
+            "pint_units",
+            "stems",
+            "unit_patterns",
+            "corpus",
+        ]
+        assert all(seconds >= 0 for seconds in timings.values())
+
+    def test_optional_steps(self):
+        """
+        Test that the foundation foods model and corpus steps are skipped if not
+        requested
+        """
+        timings = warmup(foundation_foods=False, corpus=False)
+        assert list(timings) == [
+            "pos_tagger",
+            "parser_model",
+            "pint_units",
+            "stems",
+            "unit_patterns",
+        ]
+
+    def test_resources_loaded(self):
+        """
+        Test that the models are loaded for the calling thread, the pint unit cache
+        is populated and the unit patterns are compiled
+        """
+        warmup()
+        assert TAGGER._loaded._model_bytes is not None
+        assert FF_TAGGER._loaded._model_bytes is not None
+        assert getattr(TAGGER._loaded._local, "tagger", None) is not None
+        assert convert_to_pint_unit.cache_info().currsize > 0
+        assert QUANTITY_UNITS_BOUNDARY_PATTERN._compiled is not None
+
+    def test_numpy_backend(self):
+        """
+        Test that the numpy models are loaded when using the numpy backend
+        """
+        pytest.importorskip("numpy")
+        warmup(backend="numpy", corpus=False)
+        assert TAGGER._loaded._numpy_crf is not None
+        assert FF_TAGGER._loaded._numpy_crf is not None
+
+    def test_invalid(self):
+        """
+        Test that ValueError is raised for an unsupported language or backend
+        """
+        with pytest.raises(ValueError):
+            warmup(lang="fr")
+
+        with pytest.raises(ValueError):
+            warmup(backend="torch")
+
+
+class Test_prepare_for_fork:
+    def test_frozen(self):
+        """
+        Test that the resources are loaded and the objects tracked by the garbage
+        collector are frozen
+        """
+        try:
+            timings = prepare_for_fork(corpus=False)
+            assert "parser_model" in timings
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+
+    def test_invalid(self):
+        """
+        Test that ValueError is raised for an unsupported backend, before anything is
+        frozen
+        """
+        with pytest.raises(ValueError):
+            prepare_for_fork(backend="torch")
+        assert gc.get_freeze_count() == 0
@@ -0,0 +1,152 @@
+import ast
+import inspect
+import textwrap
+
+import pytest
+
+from ingredient_parser.en import preprocess
+
+# Smallest number of elements for a list, set or dict of constants to be flagged.
+MIN_ELEMENTS = 3
+
+
+def _is_constant_display(node: ast.AST) -> bool:
+    """Return True if node is a list, set or dict display of constants."""
+    if isinstance(node, (ast.List, ast.Set)):
+        elements = node.elts
+    elif isinstance(node, ast.Dict):
+        # A key of None is a ** unpacking, which isn't constant.
+        elements = [*node.keys, *node.values]
+    else:
+        return False
+
+    return len(elements) >= MIN_ELEMENTS and all(
+        isinstance(element, ast.Constant) for element in elements
+    )
+
+
+def _is_re_compile(node: ast.AST) -> bool:
+    """Return True if node is a call to re.compile."""
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "compile"
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "re"
+    )
+
+
+def _folded_displays(function: ast.AST) -> set[int]:
+    """Return the ids of the displays in function that the compiler makes constants.
+
+    A list or set of constants that is only iterated over, or only tested for
+    membership, is compiled to a tuple or frozenset constant, so it is not rebuilt
+    each time the function is called.
+    """
+    folded = set()
+    for node in ast.walk(function):
+        if isinstance(node, ast.Compare):
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    folded.add(id(comparator))
+        elif isinstance(node, (ast.For, ast.comprehension)):
+            folded.add(id(node.iter))
+
+    return folded
+
+
+def find_rebuilt_constant_data(source: str) -> list[str]:
+    """Find constant data that is built each time a function is called.
+
+    Parameters
+    ----------
+    source : str
+        Python source code.
+
+    Returns
+    -------
+    list[str]
+        Function name and line number of each list, set or dict of constants and each
+        call to re.compile inside a function body.
+    """
+    found = []
+    for function in ast.walk(ast.parse(source)):
+        if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        folded = _folded_displays(function)
+        for node in ast.walk(function):
+            if _is_re_compile(node) or (
+                _is_constant_display(node) and id(node) not in folded
+            ):
+                found.append(f"{function.name}, line {node.lineno}")
+
+    return found
+
+
+class Test_find_rebuilt_constant_data:
+    def test_list_of_units(self):
+        """
+        Test that a list of constants assigned to a variable, then extended, is found
+        """
+        source = """
+        def remove_period(sentence):
+            units = ["tsp.", "tbsp.", "oz."]
+            units.extend([u.capitalize() for u in units])
+            for unit in units:
+                sentence = sentence.replace(unit, unit.replace(".", ""))
+            return sentence
+        """
+        assert find_rebuilt_constant_data(textwrap.dedent(source)) == [
+            "remove_period, line 3"
+        ]
+
+    def test_dict(self):
+        """
+        Test that a dict of constants is found
+        """
+        source = """
+        def replace(token):
+            return {"a": "1", "b": "2", "c": "3"}.get(token, token)
+        """
+        assert find_rebuilt_constant_data(textwrap.dedent(source)) == [
+            "replace, line 3"
+        ]
+
+    def test_re_compile(self):
+        """
+        Test that calling re.compile in a function is found
+        """
+        source = """
+        def has_digit(sentence):
+            return re.compile(r"\\d").search(sentence) is not None
+        """
+        assert find_rebuilt_constant_data(textwrap.dedent(source)) == [
+            "has_digit, line 3"
+        ]
+
+    def test_folded_constants(self):
+        """
+        Test that lists and sets of constants that are compiled to constants, and
+        module level constants, are not found
+        """
+        source = """
+        UNITS = ["tsp", "tbsp", "oz"]
+
+        def is_unit(token):
+            for unit in ["tsp", "tbsp", "oz"]:
+                pass
+            return token in {"tsp", "tbsp", "oz"} or token not in ["a", "b", "c"]
+        """
+        assert find_rebuilt_constant_data(textwrap.dedent(source)) == []
+
+
+class TestPreProcessor_constant_data:
+    @pytest.mark.parametrize("module", [preprocess])
+    def test_no_rebuilt_constant_data(self, module):
+        """
+        Test that no function in the module builds constant data, or compiles a regex,
+        each time it is called. These should be defined once at module level, in
+        _constants.py or _regex.py.
+        """
+        assert find_rebuilt_constant_data(inspect.getsource(module)) == []
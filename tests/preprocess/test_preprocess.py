@@ -1,6 +1,13 @@
+import threading
+
 import pytest
 
+from ingredient_parser._tagger import encode_features
 from ingredient_parser.en import PreProcessor
+from ingredient_parser.en.preprocess import (
+    _applicable_steps,
+    _character_classes,
+)
 
 
 class TestPreProcessor__builtins__:
@@ -100,6 +107,194 @@ class TestPreProcessor_normalise:
         p = PreProcessor(input_sentence, defer_pos_tagging=True)
         assert p.sentence == normalised
 
+    @pytest.mark.parametrize(
+        "sentence",
+        [case[0] for case in normalise_test_cases()]
+        + [
+            "1½–2 cups milk",
+            "¼–½ teaspoon",
+            "3 tbsp—about ¼ cup—olive oil",
+            "1 &ndash; 2 &frac12; cups flour",
+            "lb-2lb1oz beef",
+        ],
+    )
+    def test_same_as_separate_steps(self, sentence):
+        """
+        Test that normalising a sentence gives the same result as applying each
+        normalisation step separately, one after the other
+        """
+        p = PreProcessor("", defer_pos_tagging=True)
+        expected = sentence
+        for func in p._normalisation_steps(separate=True):
+            expected = func(expected)
+
+        assert p._normalise(sentence) == expected.strip()
+
+
+class TestPreProcessor_character_classes:
+    def test_no_classes(self):
+        """
+        Test that a sentence without any of the classes of characters returns an
+        empty set
+        """
+        assert _character_classes("salt and pepper") == frozenset()
+
+    def test_classes(self):
+        """
+        Test that each class of characters in the sentence is found
+        """
+        assert _character_classes("1/2 tsp. dried herbs – to taste") == {
+            "digit",
+            "slash",
+            "period",
+            "dash",
+            "o",
+        }
+        assert _character_classes("2 X ½-cup &amp; 1⁄4") == {
+            "digit",
+            "x",
+            "fraction",
+            "hyphen",
+            "ampersand",
+            "slash",
+        }
+
+    def test_non_ascii_digit(self):
+        """
+        Test that non-ascii decimal digits are found
+        """
+        assert _character_classes("٣ cups") == {"digit"}
+
+    def test_applicable_steps(self):
+        """
+        Test that only steps where every class of characters in one of its groups is
+        present are applicable
+        """
+        assert _applicable_steps(frozenset()) == frozenset()
+        assert _applicable_steps(frozenset({"slash"})) == {"_replace_fake_fractions"}
+        assert _applicable_steps(frozenset({"x"})) == frozenset()
+        assert "_merge_quantity_x" in _applicable_steps(frozenset({"digit", "x"}))
+
+
+class TestPreProcessor_normalisation_step_counts:
+    def test_skipped(self):
+        """
+        Test that steps are counted as skipped for a sentence without the characters
+        they need
+        """
+        PreProcessor.reset_normalisation_step_counts()
+        PreProcessor("salt and pepper", defer_pos_tagging=True)
+        counts = PreProcessor.normalisation_step_counts()
+        steps = [func.__name__ for func in PreProcessor("")._normalisation_steps()]
+        for name in steps:
+            assert counts[name].applied == 0
+            assert counts[name].skipped == 1
+
+    def test_applied(self):
+        """
+        Test that steps are counted as applied for sentences with the characters they
+        need, and the counts accumulate over sentences
+        """
+        PreProcessor.reset_normalisation_step_counts()
+        PreProcessor("1/2 cup milk", defer_pos_tagging=True)
+        PreProcessor("2 x 100g fillets", defer_pos_tagging=True)
+        counts = PreProcessor.normalisation_step_counts()
+        assert counts["_replace_fake_fractions"] == (1, 1)
+        assert counts["_split_quantity_and_units"] == (2, 0)
+        assert counts["_merge_quantity_x"] == (1, 1)
+        assert counts["_replace_dashes_and_fractions"] == (0, 2)
+
+    def test_reset(self):
+        """
+        Test that resetting the counts removes all counts
+        """
+        PreProcessor("1/2 cup milk", defer_pos_tagging=True)
+        PreProcessor.reset_normalisation_step_counts()
+        assert PreProcessor.normalisation_step_counts() == {}
+
+    def test_threads(self):
+        """
+        Test that the counts include sentences normalised in other threads, including
+        threads that have exited
+        """
+        PreProcessor.reset_normalisation_step_counts()
+
+        def normalise():
+            for _ in range(10):
+                PreProcessor("1/2 cup milk", defer_pos_tagging=True)
+
+        batches = [
+            [threading.Thread(target=normalise) for _ in range(4)] for _ in range(2)
+        ]
+        for threads in batches:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        PreProcessor("salt and pepper", defer_pos_tagging=True)
+        counts = PreProcessor.normalisation_step_counts()
+        assert counts["_replace_fake_fractions"] == (80, 1)
+        # The counts of the first batch of threads have been merged, because they had
+        # exited when the second batch started.
+        assert not any(t in PreProcessor._step_outcomes for t in batches[0])
+
+    @pytest.mark.parametrize(
+        "sentence",
+        [
+            "salt and pepper",
+            "٣ cups flour",
+            "1⁄2 cup sugar",
+            "&frac12; cup cream",
+            "two-pound roast",
+            "3 to 4 apples",
+            "Tsp. salt",
+            "2 X 4 cm pieces",
+        ],
+    )
+    def test_same_as_every_step(self, sentence):
+        """
+        Test that skipping steps gives the same result as applying every step
+        """
+        p = PreProcessor("", defer_pos_tagging=True)
+        expected = sentence
+        for func in p._normalisation_steps(separate=True):
+            expected = func(expected)
+
+        assert p._normalise(sentence) == expected.strip()
+
+
+class TestPreProcessor_replace_dashes_and_fractions:
+    @pytest.mark.parametrize(
+        "sentence",
+        [
+            "2 cups flour – white or self-raising",
+            "3 tbsp—about ¼ cup—olive oil",
+            "1½–2 cups milk",
+            "¼–½ teaspoon",
+            "-⅓ cup sugar",
+            "1&frac34; cups tomato ketchup",
+            "1 &ndash; 2 &frac12; cups flour",
+        ],
+    )
+    def test_same_as_separate_steps(self, sentence):
+        """
+        Test that the result is the same as replacing dashes, html fractions and
+        unicode fractions one after the other
+        """
+        p = PreProcessor("", defer_pos_tagging=True)
+        expected = p._replace_unicode_fractions(
+            p._replace_html_fractions(p._replace_en_em_dash(sentence))
+        )
+        assert p._replace_dashes_and_fractions(sentence) == expected
+
+    def test_html_dash_kept(self):
+        """
+        Test that an html dash entity is unescaped to a dash, which is not replaced
+        """
+        p = PreProcessor("", defer_pos_tagging=True)
+        assert p._replace_dashes_and_fractions("1 &ndash; 2 cups") == "1 – 2 cups"
+
 
 class TestPreProcessor_sentence_features:
     def test(self):
@@ -438,3 +633,90 @@ class TestPreProcessor_sentence_features:
         ]
 
         assert p.sentence_features() == expected
+
+    def test_tag_partofspeech_batch(self):
+        """
+        Test part of speech tagging a batch of PreProcessor objects gives the same
+        result as tagging each one individually.
+        """
+        sentences = [
+            "100g green beans",
+            "2 tbsp. olive oil",
+            "1 large onion, finely chopped",
+            "salt and pepper",
+        ]
+        batch = [PreProcessor(s, defer_pos_tagging=True) for s in sentences]
+        PreProcessor.tag_partofspeech_batch(batch)
+
+        for sentence, p in zip(sentences, batch):
+            assert not p.defer_pos_tagging
+            assert p.pos_tags == PreProcessor(sentence).pos_tags
+            assert p.sentence_features() == PreProcessor(sentence).sentence_features()
+
+
+class TestPreProcessor_sentence_attributes:
+    @pytest.mark.parametrize(
+        "sentence",
+        [
+            "2 14 ounce cans coconut milk",
+            "1½ cups (360 ml) Heavy Cream, warmed",
+            "3 pounds pork shoulder, cut into 2-inch chunks",
+            "1 cup plus 2 tablespoons flour",
+            "salt",
+            "",
+        ],
+    )
+    def test_same_as_encoded_features(self, sentence):
+        """
+        Test that the attributes are the same as encoding the sentence features
+        """
+        p = PreProcessor(sentence)
+        expected = [encode_features(features) for features in p.sentence_features()]
+        assert p.sentence_attributes() == expected
+
+    def test_defer_pos_tagging(self):
+        """
+        Test that part of speech tagging is done when attributes are requested if it
+        was deferred
+        """
+        p = PreProcessor("2 14 ounce cans coconut milk", defer_pos_tagging=True)
+        expected = PreProcessor("2 14 ounce cans coconut milk").sentence_attributes()
+        assert p.sentence_attributes() == expected
+
+    @pytest.mark.parametrize(
+        "sentence",
+        [
+            "2 14 ounce cans coconut milk",
+            "1½ cups (360 ml) Heavy Cream, warmed",
+            "3 pounds pork shoulder, cut into 2-inch chunks",
+            "",
+        ],
+    )
+    def test_known_attributes(self, sentence):
+        """
+        Test that only known attributes are returned, in the same order, if a set of
+        known attributes is given
+        """
+        p = PreProcessor(sentence)
+        all_attributes = p.sentence_attributes()
+        known = frozenset(
+            attr
+            for token_attributes in all_attributes
+            for attr in token_attributes[::2]
+        )
+        expected = [
+            [attr for attr in token_attributes if attr in known]
+            for token_attributes in all_attributes
+        ]
+        assert p.sentence_attributes(known) == expected
+        assert p.sentence_attributes(frozenset()) == [[] for _ in all_attributes]
+        # Filtering must not change the attributes returned without known attributes.
+        assert p.sentence_attributes() == all_attributes
+
+    def test_encode_features(self):
+        """
+        Test string features are encoded as name:value, True features as name and
+        False features are omitted
+        """
+        features = {"bias": "", "stem": "cup", "is_unit": True, "is_punc": False}
+        assert encode_features(features) == ["bias:", "stem:cup", "is_unit"]
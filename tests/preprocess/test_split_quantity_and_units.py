@@ -64,3 +64,11 @@ class TestPreProcessor_split_quantity_and_units:
         """
         input_sentence = "1 4-chop rack of lamb"
         assert p._split_quantity_and_units(input_sentence) == "1 4-chop rack of lamb"
+
+    def test_unit_between_quantities(self, p):
+        """
+        A space is inserted either side of a unit between two quantities, and either
+        side of a quantity between two units
+        """
+        input_sentence = "1lb2oz-3oz beef"
+        assert p._split_quantity_and_units(input_sentence) == "1 lb 2 oz - 3 oz beef"
@@ -0,0 +1,144 @@
+import csv
+import re
+from pathlib import Path
+
+import pytest
+
+from ingredient_parser.en._constants import STRING_NUMBERS
+from ingredient_parser.en._regex import (
+    QUANTITY_UNITS_BOUNDARY_PATTERN,
+    STRING_QUANTITY_HYPHEN_PATTERN,
+    LazyPattern,
+    trie_alternation,
+    units_list,
+)
+
+TRAINING_CSVS = [
+    "train/data/bbc/bbc-ingredients-snapshot-2017.csv",
+    "train/data/cookstr/cookstr-ingredients-snapshot-2017.csv",
+]
+
+# The patterns as they were built before using trie_alternation, by joining every unit
+# with | in the order they appear in units_list.
+JOINED_QUANTITY_UNITS_BOUNDARY_PATTERN = re.compile(
+    rf"""
+    (\d)\-?(?={"|".join(units_list)})
+    |
+    ({"|".join(units_list)})(\-)?(?=\d)
+    """,
+    re.VERBOSE,
+)
+JOINED_STRING_QUANTITY_HYPHEN_PATTERN = re.compile(
+    rf"""
+    \b({"|".join(STRING_NUMBERS.keys())})\b
+    \-
+    \b({"|".join(units_list)})\b
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+
+@pytest.fixture(scope="module")
+def training_sentences():
+    """All sentences from the training data."""
+    sentences = []
+    for path in TRAINING_CSVS:
+        with (Path(__file__).parents[2] / path).open(encoding="utf-8") as f:
+            sentences.extend(row["input"] for row in csv.DictReader(f))
+
+    return sentences
+
+
+def matches(pattern, sentence: str) -> list[tuple]:
+    """Return the span and groups of every match of pattern in sentence."""
+    return [(m.span(), m.groups()) for m in pattern.finditer(sentence)]
+
+
+class Test_trie_alternation:
+    def test_shared_prefix(self):
+        """
+        Test that words with a shared prefix share a branch, with the longer word
+        tried first
+        """
+        assert trie_alternation(["cup", "cups", "can"]) == "c(?:an|ups?)"
+
+    def test_duplicates(self):
+        """
+        Test that duplicate words are removed
+        """
+        assert trie_alternation(["g", "g", "kg", "kg"]) == "(?:g|kg)"
+
+    def test_matches_every_word(self):
+        """
+        Test that every unit, and nothing else, is matched
+        """
+        pattern = re.compile(trie_alternation(units_list))
+        assert all(pattern.fullmatch(unit) for unit in units_list)
+        assert pattern.fullmatch("cupss") is None
+        assert pattern.fullmatch("cu") is None
+
+    def test_longest_first(self):
+        """
+        Test that the longest word is matched where one word is a prefix of another
+        """
+        pattern = re.compile(trie_alternation(["tb", "tbs", "tbsp", "tbsps"]))
+        assert pattern.match("tbsps").group() == "tbsps"
+        assert pattern.match("tbspx").group() == "tbsp"
+
+    def test_escaped(self):
+        """
+        Test that regex special characters are escaped
+        """
+        pattern = re.compile(trie_alternation(["fl.oz", "fl"]))
+        assert pattern.fullmatch("fl.oz")
+        assert pattern.fullmatch("flxoz") is None
+
+
+class TestLazyPattern:
+    def test_compiled_on_first_use(self):
+        """
+        Test that the pattern is only compiled when it is first used
+        """
+        built = []
+
+        def pattern():
+            built.append(True)
+            return r"\d+"
+
+        lazy = LazyPattern(pattern)
+        assert built == []
+        assert lazy.sub("#", "2 cups") == "# cups"
+        assert lazy.findall("1 or 2") == ["1", "2"]
+        assert built == [True]
+        assert lazy.compile() is lazy.compile()
+
+    def test_flags(self):
+        """
+        Test that the pattern is compiled with the flags
+        """
+        lazy = LazyPattern(lambda: "cup", re.IGNORECASE)
+        assert lazy.flags & re.IGNORECASE
+        assert lazy.search("2 CUPS")
+
+
+class TestUnitPatterns_training_corpus:
+    @pytest.mark.parametrize(
+        ("pattern", "joined"),
+        [
+            (QUANTITY_UNITS_BOUNDARY_PATTERN, JOINED_QUANTITY_UNITS_BOUNDARY_PATTERN),
+            (STRING_QUANTITY_HYPHEN_PATTERN, JOINED_STRING_QUANTITY_HYPHEN_PATTERN),
+        ],
+        ids=["quantity_units_boundary", "string_quantity_hyphen"],
+    )
+    def test_same_matches(self, training_sentences, pattern, joined):
+        """
+        Test that the patterns built using trie_alternation give the same matches as
+        the patterns built by joining every unit, for every sentence in the training
+        data
+        """
+        different = [
+            sentence
+            for sentence in training_sentences
+            if matches(pattern, sentence) != matches(joined, sentence)
+        ]
+        assert different == []
@@ -0,0 +1,323 @@
+import gc
+import time
+import weakref
+
+import pytest
+
+from ingredient_parser import (
+    CacheInfo,
+    IngredientParser,
+    ParseCache,
+    SQLiteParseCache,
+    iter_parse_ingredients,
+    parse_ingredient,
+    parse_multiple_ingredients,
+)
+from ingredient_parser._tagger import ThreadLocalTagger
+from ingredient_parser.en.parser import FF_TAGGER, TAGGER, _cache_key
+
+
+class TestParseCache:
+    def test_miss_then_hit(self):
+        """
+        Test that a lookup before a result is cached is a miss, and after is a hit
+        """
+        cache = ParseCache()
+        assert cache.get("a") is None
+        cache.put("a", [1])
+        assert cache.get("a") == [1]
+        assert cache.cache_info() == CacheInfo(
+            hits=1, misses=1, maxsize=1024, currsize=1
+        )
+
+    def test_copies(self):
+        """
+        Test that modifying the stored or returned value does not modify the cached
+        value
+        """
+        cache = ParseCache()
+        value = [1]
+        cache.put("a", value)
+        value.append(2)
+
+        returned = cache.get("a")
+        assert returned == [1]
+        returned.append(3)
+
+        assert cache.get("a") == [1]
+
+    def test_lru_eviction(self):
+        """
+        Test the least recently used result is evicted when the cache is full
+        """
+        cache = ParseCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_ttl(self, monkeypatch):
+        """
+        Test that a result is treated as missing and evicted once it has expired
+        """
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        cache = ParseCache(ttl=10)
+        cache.put("a", 1)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+        assert cache.get("a") == 1
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_clear(self):
+        """
+        Test that clear removes all results and resets the statistics
+        """
+        cache = ParseCache()
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        assert cache.cache_info() == CacheInfo(
+            hits=0, misses=0, maxsize=1024, currsize=0
+        )
+
+    @pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"ttl": 0}])
+    def test_invalid_arguments(self, kwargs):
+        """
+        Test that a ValueError is raised for a maxsize less than 1 or ttl that isn't
+        greater than 0
+        """
+        with pytest.raises(ValueError):
+            ParseCache(**kwargs)
+
+
+class TestParseCache_parse_ingredient:
+    def test_cached_result(self):
+        """
+        Test that parsing the same sentence with the same options returns the cached
+        result, which is equal to the uncached result
+        """
+        cache = ParseCache()
+        sentence = "2 tbsp of olive oil"
+        first = parse_ingredient(sentence, cache=cache)
+        second = parse_ingredient(sentence, cache=cache)
+
+        assert first == second == parse_ingredient(sentence)
+        assert first is not second
+        assert cache.cache_info().hits == 1
+
+    def test_options_in_key(self):
+        """
+        Test that parsing the same sentence with different options does not return
+        the cached result
+        """
+        cache = ParseCache()
+        sentence = "1 cup milk"
+        parse_ingredient(sentence, cache=cache)
+        parsed = parse_ingredient(sentence, string_units=True, cache=cache)
+
+        assert parsed == parse_ingredient(sentence, string_units=True)
+        assert cache.cache_info() == CacheInfo(
+            hits=0, misses=2, maxsize=1024, currsize=2
+        )
+
+    def test_mutation(self):
+        """
+        Test that modifying a returned result does not modify the cached result
+        """
+        cache = ParseCache()
+        sentence = "2 large garlic cloves, finely grated"
+        parsed = parse_ingredient(sentence, foundation_foods=True, cache=cache)
+        parsed.foundation_foods.clear()
+        parsed.amount.clear()
+
+        assert parse_ingredient(sentence, foundation_foods=True, cache=cache) == (
+            parse_ingredient(sentence, foundation_foods=True)
+        )
+
+    def test_no_cache_no_hash(self, monkeypatch):
+        """
+        Test that the models are not hashed when parsing without a cache
+        """
+
+        def model_hash(self):
+            pytest.fail("model hashed without a cache")
+
+        monkeypatch.setattr(ThreadLocalTagger, "model_hash", property(model_hash))
+        parse_ingredient("2 tbsp of olive oil", foundation_foods=True)
+
+    def test_ff_model_in_key(self):
+        """
+        Test that the foundation foods model is only in the key if foundation foods
+        are extracted
+        """
+        key = _cache_key("salt", {"foundation_foods": False}, TAGGER, FF_TAGGER)
+        assert FF_TAGGER.model_hash not in key
+
+        key = _cache_key("salt", {"foundation_foods": True}, TAGGER, FF_TAGGER)
+        assert FF_TAGGER.model_hash in key
+
+    def test_batch_functions(self):
+        """
+        Test that parse_multiple_ingredients and iter_parse_ingredients look up and
+        store sentences in the cache
+        """
+        cache = ParseCache()
+        sentences = ["1 cup milk", "2 tbsp of olive oil", "1 cup milk"]
+        expected = parse_multiple_ingredients(sentences)
+
+        assert parse_multiple_ingredients(sentences, cache=cache) == expected
+        assert cache.cache_info().currsize == 2
+        assert list(iter_parse_ingredients(sentences, cache=cache)) == expected
+        # The chunk is deduplicated before the cache lookups, so there is one lookup
+        # for each distinct sentence.
+        assert cache.cache_info().hits == 2
+
+    def test_cache_not_kept(self):
+        """
+        Test that a cache passed to parse_ingredient is not kept alive after the
+        caller no longer references it
+        """
+        cache = ParseCache()
+        parse_ingredient("1 cup milk", cache=cache)
+        ref = weakref.ref(cache)
+        del cache
+        gc.collect()
+
+        assert ref() is None
+
+
+class TestSQLiteParseCache:
+    def test_persistent(self, tmp_path):
+        """
+        Test that cached results are available from a new cache object using the same
+        file
+        """
+        path = tmp_path / "cache.sqlite"
+        cache = SQLiteParseCache(path)
+        cache.put(("a", True), {"x": [1]})
+        cache.close()
+
+        cache = SQLiteParseCache(path)
+        assert cache.get(("a", True)) == {"x": [1]}
+        assert cache.get(("a", False)) is None
+        assert cache.cache_info() == CacheInfo(
+            hits=1, misses=1, maxsize=1_000_000, currsize=1
+        )
+
+    def test_copies(self, tmp_path):
+        """
+        Test that modifying a returned value does not modify the cached value
+        """
+        cache = SQLiteParseCache(tmp_path / "cache.sqlite")
+        cache.put("a", [1])
+        cache.get("a").append(2)
+        assert cache.get("a") == [1]
+
+    def test_get_many(self, tmp_path):
+        """
+        Test that bulk lookups return the cached values, in order, including for more
+        keys than are selected at once
+        """
+        cache = SQLiteParseCache(tmp_path / "cache.sqlite")
+        cache.put_many([(i, i * 2) for i in range(0, 1200, 2)])
+
+        assert cache.get_many(list(range(1200))) == [
+            i * 2 if i % 2 == 0 else None for i in range(1200)
+        ]
+        assert cache.cache_info().hits == 600
+
+    def test_eviction(self, tmp_path, monkeypatch):
+        """
+        Test the least recently used results are evicted when the cache contains more
+        than maxsize results
+        """
+        now = time.time()
+        cache = SQLiteParseCache(tmp_path / "cache.sqlite", maxsize=2)
+        monkeypatch.setattr(time, "time", lambda: now)
+        cache.put("a", 1)
+        monkeypatch.setattr(time, "time", lambda: now + 1)
+        cache.put("b", 2)
+        monkeypatch.setattr(time, "time", lambda: now + 2)
+        cache.get("a")
+        monkeypatch.setattr(time, "time", lambda: now + 3)
+        cache.put("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get_many(["a", "b", "c"]) == [1, None, 3]
+
+    def test_size(self, tmp_path):
+        """
+        Test that the number of cached results is kept up to date when results are
+        replaced, duplicated in a batch and evicted, and when the file is reopened
+        """
+        path = tmp_path / "cache.sqlite"
+        cache = SQLiteParseCache(path, maxsize=5)
+        cache.put_many([("a", 1), ("b", 2), ("a", 3)])
+        assert len(cache) == 2
+        cache.put_many([("b", 4), ("c", 5)])
+        assert len(cache) == 3
+        cache.put_many([(i, i) for i in range(4)])
+        assert len(cache) == 5
+        cache.close()
+
+        cache = SQLiteParseCache(path, maxsize=5)
+        assert len(cache) == 5
+        count = cache._connection.execute("SELECT COUNT(*) FROM parsed").fetchone()[0]
+        assert count == 5
+
+    def test_version(self, tmp_path):
+        """
+        Test that results cached by a different version of the package are not used
+        """
+        path = tmp_path / "cache.sqlite"
+        cache = SQLiteParseCache(path)
+        cache._version = "0.0.0"
+        cache.put("a", 1)
+
+        assert SQLiteParseCache(path).get("a") is None
+
+    def test_clear(self, tmp_path):
+        """
+        Test that clear removes all results and resets the statistics
+        """
+        cache = SQLiteParseCache(tmp_path / "cache.sqlite")
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        assert cache.cache_info() == CacheInfo(
+            hits=0, misses=0, maxsize=1_000_000, currsize=0
+        )
+
+    def test_parser(self, tmp_path):
+        """
+        Test that sentences parsed by one parser are returned from the cache by another
+        parser with the same options, and that the results are the same as without a
+        cache
+        """
+        path = tmp_path / "cache.sqlite"
+        sentences = ["1 cup milk", "2 tbsp of olive oil", "1 cup milk", "salt"]
+        expected = parse_multiple_ingredients(sentences, string_units=True)
+
+        parser = IngredientParser(string_units=True, cache=SQLiteParseCache(path))
+        assert parser.parse_many(sentences) == expected
+
+        cache = SQLiteParseCache(path)
+        parser = IngredientParser(string_units=True, cache=cache)
+        assert parser.parse_many(sentences) == expected
+        assert parser.parse("salt") == expected[3]
+        assert cache.cache_info() == CacheInfo(
+            hits=4, misses=0, maxsize=1_000_000, currsize=3
+        )
+
+        parser = IngredientParser(cache=cache)
+        assert parser.parse("1 cup milk") == parse_ingredient("1 cup milk")
+        assert cache.cache_info().misses == 1
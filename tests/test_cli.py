@@ -0,0 +1,226 @@
+import io
+import json
+
+import pytest
+
+from ingredient_parser import parse_ingredient
+from ingredient_parser.__main__ import infer_format, main, read_sentences, to_json
+
+SENTENCES = [
+    "3 pounds pork shoulder, cut into 2-inch chunks",
+    "2 tbsp of olive oil",
+    "3 lime wedges, for serving",
+    "2 large garlic cloves, finely grated",
+    "1 28 ounce can chopped tomatoes",
+]
+
+
+class Test_infer_format:
+    @pytest.mark.parametrize(
+        "path, fmt",
+        [
+            ("-", "text"),
+            ("sentences.txt", "text"),
+            ("sentences.csv", "csv"),
+            ("sentences.JSONL", "jsonl"),
+            ("sentences.ndjson", "jsonl"),
+        ],
+    )
+    def test_infer_format(self, path, fmt):
+        """
+        Test format is inferred from file extension
+        """
+        assert infer_format(path) == fmt
+
+
+class Test_read_sentences:
+    def test_text(self):
+        """
+        Test sentences are read from each line, with None for each blank line
+        """
+        f = io.StringIO("1 cup milk\n\n2 eggs\r\n")
+        assert list(read_sentences(f, "text", "sentence")) == [
+            "1 cup milk",
+            None,
+            "2 eggs",
+        ]
+
+    def test_csv(self):
+        """
+        Test sentences are read from csv column
+        """
+        f = io.StringIO('id,input\n1,"1 cup milk, warmed"\n2,2 eggs\n')
+        assert list(read_sentences(f, "csv", "input")) == [
+            "1 cup milk, warmed",
+            "2 eggs",
+        ]
+
+    def test_csv_missing_column(self):
+        """
+        Test ValueError is raised if csv file does not have the column
+        """
+        f = io.StringIO("id,input\n1,2 eggs\n")
+        with pytest.raises(ValueError):
+            list(read_sentences(f, "csv", "sentence"))
+
+    @pytest.mark.parametrize("line", ['{"input": "2 eggs"}', '["2 eggs"]', "2 eggs"])
+    def test_jsonl_invalid_line(self, line):
+        """
+        Test ValueError with the line number is raised if a line is not a JSON object
+        with the key
+        """
+        f = io.StringIO('{"sentence": "1 cup milk"}\n\n' + line + "\n")
+        with pytest.raises(ValueError, match="Line 3"):
+            list(read_sentences(f, "jsonl", "sentence"))
+
+    def test_jsonl(self):
+        """
+        Test sentences are read from key of each JSON object, with None for each blank
+        line
+        """
+        f = io.StringIO('{"sentence": "1 cup milk"}\n\n{"sentence": "2 eggs"}\n')
+        assert list(read_sentences(f, "jsonl", "sentence")) == [
+            "1 cup milk",
+            None,
+            "2 eggs",
+        ]
+
+
+class Test_main:
+    def test_stdin(self, monkeypatch, capsys):
+        """
+        Test sentences from stdin are written to stdout as JSON lines, with a summary
+        written to stderr
+        """
+        monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(SENTENCES)))
+        assert main([]) == 0
+
+        out, err = capsys.readouterr()
+        expected = [to_json(parse_ingredient(sentence)) for sentence in SENTENCES]
+        assert out.splitlines() == expected
+        assert "Parsed 5 sentences" in err
+
+    def test_options(self, tmp_path):
+        """
+        Test parsing options are used
+        """
+        infile = tmp_path / "sentences.jsonl"
+        infile.write_text("\n".join(json.dumps({"s": s}) for s in SENTENCES))
+        outfile = tmp_path / "parsed.jsonl"
+        main(
+            [
+                str(infile),
+                "-o",
+                str(outfile),
+                "--field",
+                "s",
+                "--string-units",
+                "--no-discard-isolated-stop-words",
+                "--no-confidence",
+            ]
+        )
+
+        options = {
+            "string_units": True,
+            "discard_isolated_stop_words": False,
+            "confidence": False,
+        }
+        expected = [to_json(parse_ingredient(s, **options)) for s in SENTENCES]
+        assert outfile.read_text().splitlines() == expected
+
+    def test_workers_and_cache(self, tmp_path, capsys):
+        """
+        Test parsing with worker processes and a cache gives results in input order,
+        and the second run uses the cache
+        """
+        infile = tmp_path / "sentences.txt"
+        infile.write_text("\n".join(SENTENCES * 3))
+        cache = str(tmp_path / "cache.sqlite")
+        args = [str(infile), "--workers", "2", "--chunk-size", "4", "--cache", cache]
+
+        main(args)
+        first, _ = capsys.readouterr()
+        main(args)
+        second, err = capsys.readouterr()
+
+        expected = [to_json(parse_ingredient(sentence)) for sentence in SENTENCES * 3]
+        assert first.splitlines() == expected
+        assert second.splitlines() == expected
+        assert "15 hits, 0 misses" in err
+
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_blank_lines(self, monkeypatch, capsys, workers):
+        """
+        Test a null line is written for each blank input line, so each output line
+        corresponds to the same input line
+        """
+        lines = ["", SENTENCES[0], "", "  ", SENTENCES[1], SENTENCES[2], ""]
+        monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(lines) + "\n"))
+        main(["--workers", workers, "--chunk-size", "2"])
+
+        out, err = capsys.readouterr()
+        expected = [
+            to_json(parse_ingredient(line)) if line.strip() else "null"
+            for line in lines
+        ]
+        assert out.splitlines() == expected
+        assert "Parsed 3 sentences" in err
+        assert "Wrote null for 4 blank lines" in err
+
+    @pytest.mark.parametrize("option", ["--workers", "--chunk-size", "--cache-size"])
+    @pytest.mark.parametrize("value", ["0", "-1", "two"])
+    def test_not_positive(self, capsys, option, value):
+        """
+        Test a command line error is reported for values that aren't positive integers
+        """
+        with pytest.raises(SystemExit) as e:
+            main([option, value])
+
+        assert e.value.code == 2
+        assert "is not a positive integer" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "fmt, text, message",
+        [
+            ("csv", "id,input\n1,2 eggs\n", 'CSV file does not have a "sentence"'),
+            (
+                "jsonl",
+                '{"sentence": "2 eggs"}\n{"input": "1 cup milk"}\n',
+                'Line 2 does not have a "sentence" key',
+            ),
+            ("jsonl", '{"sentence": "2 eggs"}\nnot json\n', "Line 2 is not valid JSON"),
+        ],
+    )
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_unreadable_input(self, monkeypatch, capsys, fmt, text, message, workers):
+        """
+        Test a one line error is written to stderr and the exit status is 1 if the
+        input can't be read, after writing the sentences read before the error
+        """
+        monkeypatch.setattr("sys.stdin", io.StringIO(text))
+        assert main(["--format", fmt, "--workers", workers]) == 1
+
+        out, err = capsys.readouterr()
+        expected = [to_json(parse_ingredient("2 eggs"))] if fmt == "jsonl" else []
+        assert out.splitlines() == expected
+        assert message in err.splitlines()[-1]
+        assert "Traceback" not in err
+
+    def test_cache_closed(self, tmp_path, monkeypatch):
+        """
+        Test the cache is closed if parsing raises an exception
+        """
+        closed = []
+        monkeypatch.setattr(
+            "ingredient_parser.__main__.SQLiteParseCache.close",
+            lambda self: closed.append(self),
+        )
+        monkeypatch.setattr(
+            "ingredient_parser.__main__.to_json",
+            lambda parsed: 1 / 0,
+        )
+        monkeypatch.setattr("sys.stdin", io.StringIO("2 eggs\n"))
+        with pytest.raises(ZeroDivisionError):
+            main(["--cache", str(tmp_path / "cache.sqlite")])
+
+        assert len(closed) == 1
@@ -1,13 +1,91 @@
 import pytest
 
+from ingredient_parser import (
+    DedupInfo,
+    IngredientParser,
+    dedup_info,
+    parse_multiple_ingredients,
+    reset_dedup_info,
+)
 from ingredient_parser._common import (
+    chunked,
     consume,
+    deduplicate,
     group_consecutive_idx,
     is_float,
     is_range,
 )
 
 
+class Test_chunked:
+    def test_chunks(self):
+        """
+        Test iterable is split into chunks of n elements, with the remainder in the
+        last chunk
+        """
+        assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_lazy(self):
+        """
+        Test that only one chunk is read from the iterable at a time
+        """
+        it = iter(range(10))
+        chunks = chunked(it, 4)
+        assert next(chunks) == [0, 1, 2, 3]
+        assert next(it) == 4
+
+    def test_empty(self):
+        """
+        Test empty iterable returns no chunks
+        """
+        assert list(chunked([], 3)) == []
+
+    def test_invalid_n(self):
+        """
+        Test ValueError is raised if n is less than 1
+        """
+        with pytest.raises(ValueError):
+            list(chunked(range(3), 0))
+
+
+class Test_deduplicate:
+    def test_deduplicate(self):
+        """
+        Test the first occurrence of each distinct sentence is returned, with the
+        index of the distinct sentence for each input sentence
+        """
+        assert deduplicate(["salt", "pepper", "salt", "pepper", "oil"]) == (
+            ["salt", "pepper", "oil"],
+            [0, 1, 0, 1, 2],
+        )
+
+    def test_whitespace(self):
+        """
+        Test sentences that only differ by leading or trailing whitespace are
+        considered the same
+        """
+        assert deduplicate([" salt", "salt ", "Salt"]) == ([" salt", "Salt"], [0, 0, 1])
+
+
+class Test_dedup_info:
+    def test_counts(self):
+        """
+        Test the number of sentences and distinct sentences parsed as a batch are
+        counted, over every call, and reset
+        """
+        reset_dedup_info()
+        parse_multiple_ingredients(["salt", "pepper", "salt ", "salt"])
+        IngredientParser().parse_many(["salt", "oil"])
+
+        info = dedup_info()
+        assert info == DedupInfo(sentences=6, distinct=4)
+        assert info.ratio == pytest.approx(1 / 3)
+
+        reset_dedup_info()
+        assert dedup_info() == DedupInfo(sentences=0, distinct=0)
+        assert dedup_info().ratio == 0.0
+
+
 class Test_consume:
     def test_conume(self):
         """
@@ -1,3 +1,5 @@
+import pickle
+
 from ingredient_parser.en._utils import (
     UREG,
     combine_quantities_split_by_and,
@@ -30,6 +32,22 @@ class TestUtils_pluralise_units:
             == "3 cups (750 milliliters) milk"
         )
 
+    def test_part_of_word(self):
+        """
+        Units that are only part of a word are not pluralised
+        """
+        assert pluralise_units("1 cupcake") == "1 cupcake"
+        assert pluralise_units("2cup flour") == "2cup flour"
+        assert pluralise_units("1 lb_bag") == "1 lb_bag"
+        assert pluralise_units("1 cup-sized bag") == "1 cups-sized bags"
+
+    def test_already_plural(self):
+        """
+        Plural units and units that are the same in singular and plural are unchanged
+        """
+        assert pluralise_units("2 cups flour") == "2 cups flour"
+        assert pluralise_units("100 g sugar") == "100 g sugar"
+
 
 class Test_convert_to_pint_unit:
     def test_empty_string(self):
@@ -52,6 +70,26 @@ class Test_convert_to_pint_unit:
         assert convert_to_pint_unit("ounce") == UREG("oz").units
         assert convert_to_pint_unit("ounces") == UREG("oz").units
 
+    def test_pickle(self):
+        """
+        Test pint.Unit objects are unpickled into the same unit registry
+        """
+        unit = convert_to_pint_unit("fl oz", imperial_units=True)
+        unpickled = pickle.loads(pickle.dumps(unit))
+        assert unpickled == unit
+        assert unpickled == UREG("imperial_fluid_ounce").units
+
+    def test_pickle_compound(self):
+        """
+        Test compound pint.Unit objects are unpickled with their units in the same
+        order, so they have the same string representation
+        """
+        unit = UREG("ounce * gram / cup").units
+        unpickled = pickle.loads(pickle.dumps(unit))
+        assert unpickled == unit
+        assert repr(unpickled) == repr(unit)
+        assert str(unpickled) == str(unit)
+
     def test_modified_cases(self):
         """
         Test cases where we need to swap to unit to a version pint recognises
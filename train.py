@@ -9,6 +9,7 @@ from train import (
     check_label_consistency,
     feature_search,
     grid_search,
+    prune_model,
     train_multiple,
     train_single,
 )
@@ -336,6 +337,74 @@ if __name__ == "__main__":
         help="Specify which model to train.",
     )
 
+    prune_parser_help = "Prune low weight features from a trained model."
+    prune_parser = subparsers.add_parser("prune", help=prune_parser_help)
+    prune_parser.add_argument(
+        "--database",
+        help="Path to database of training data",
+        type=str,
+        dest="database",
+        required=True,
+    )
+    prune_parser.add_argument(
+        "--database-table",
+        help="Name of table in database containing training data",
+        type=str,
+        dest="table",
+        default="en",
+    )
+    prune_parser.add_argument(
+        "--datasets",
+        help="Datasets to use in evaluating the model",
+        dest="datasets",
+        nargs="*",
+        default=["bbc", "cookstr", "nyt", "allrecipes"],
+    )
+    prune_parser.add_argument(
+        "--split",
+        default=0.20,
+        type=float,
+        help="Fraction of data to be used for testing",
+    )
+    prune_parser.add_argument(
+        "--seed",
+        default=None,
+        type=int,
+        help="Seed value used for train/test split. "
+        "Use the seed the model was trained with to evaluate on held-out data.",
+    )
+    prune_parser.add_argument(
+        "--model",
+        choices=["parser", "foundationfoods"],
+        required=True,
+        help="Specify which model to prune.",
+    )
+    prune_parser.add_argument(
+        "--model-file",
+        default=None,
+        help="Path to model to prune. Defaults to the model distributed with the "
+        "package.",
+    )
+    prune_parser.add_argument(
+        "--thresholds",
+        default=[0.01, 0.05, 0.1],
+        type=float,
+        nargs="*",
+        help="Remove features with an absolute weight less than each threshold.",
+    )
+    prune_parser.add_argument(
+        "--top-n",
+        default=[],
+        type=int,
+        nargs="*",
+        help="Keep only the N features with the largest absolute weights.",
+    )
+    prune_parser.add_argument(
+        "--output-dir",
+        default="pruned_models",
+        help="Directory to save pruned models to.",
+    )
+
     utility_help = "Utilities to aid cleaning training data."
     utility_parser = subparsers.add_parser("utility", help=utility_help)
     utility_parser.add_argument(
@@ -375,6 +444,8 @@ if __name__ == "__main__":
         grid_search(args)
     elif args.command == "featuresearch":
         feature_search(args)
+    elif args.command == "prune":
+        prune_model(args)
     elif args.command == "utility":
         if args.utility == "consistency":
             check_label_consistency(args)
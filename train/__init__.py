@@ -1,12 +1,14 @@
 from .clean__check_label_consistency import check_label_consistency
 from .featuresearch import feature_search
 from .gridsearch import grid_search
+from .prune import prune_model
 from .train_model import train_multiple, train_single
 
 __all__ = [
     "check_label_consistency",
     "feature_search",
     "grid_search",
+    "prune_model",
     "train_multiple",
     "train_single",
 ]
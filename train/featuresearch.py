@@ -32,30 +32,31 @@ DISCARDED_FEATURES = {
 
 
 def select_features(
-    features_all: list[list[dict]], discard_features: list[str]
-) -> list[dict]:
+    features_all: list[list[list[str]]], discard_features: list[str]
+) -> list[list[list[str]]]:
     """Select specific features from full feature set.
 
     Parameters
     ----------
-    features_all : list[list[dict]]
-        List of sentence feature dicts containing all features.
+    features_all : list[list[list[str]]]
+        List of sentence attribute lists containing all features.
     discard_features : list[str]
         List of feature names to discard.
 
     Returns
     -------
-    list[dict]
-        List of feature dicts, containing selected features.
+    list[list[list[str]]]
+        List of sentence attribute lists, containing selected features.
     """
     features_selected = []
     for sentence in features_all:
         sentence_features = []
         for token in sentence:
-            token_features = {}
-            for key in token:
-                if key not in discard_features:
-                    token_features[key] = token[key]
+            # Attributes are "name:value" for string features or "name" for True
+            # boolean features.
+            token_features = [
+                attr for attr in token if attr.split(":", 1)[0] not in discard_features
+            ]
             sentence_features.append(token_features)
 
         features_selected.append(sentence_features)
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+
+import argparse
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from random import randint
+
+import pycrfsuite
+from sklearn.model_selection import train_test_split
+from tabulate import tabulate
+
+from ingredient_parser._tagger import CQDB_HEADER, MODEL_HEADER, read_cqdb
+
+from .training_utils import evaluate, load_datasets
+
+MODEL_FILES = {
+    "parser": "ingredient_parser/en/model.en.crfsuite",
+    "foundationfoods": "ingredient_parser/en/ff_model.en.crfsuite",
+}
+
+# crfsuite model file format.
+# The file starts with the header in MODEL_HEADER.
+# Each chunk starts with a chunk id, the size of the chunk and the number of items.
+CHUNK = struct.Struct("<4sII")
+# A feature is a type, source, destination and weight. Type 0 is a state feature from
+# the attribute at source to the label at destination, type 1 is a transition from the
+# label at source to the label at destination.
+FEATURE = struct.Struct("<IIId")
+STATE, TRANSITION = 0, 1
+
+# The labels and attributes are stored in constant databases (CQDB), which start with
+# the header in CQDB_HEADER, followed by the offset and number of buckets of 256 hash
+# tables.
+CQDB_TABLES = 256
+CQDB_BYTEORDER = 0x62445371
+
+
+@dataclass
+class CRFModel:
+    """Labels, attributes and features of a crfsuite model."""
+
+    labels: list[str]
+    attributes: list[str]
+    features: list[tuple[int, int, int, float]]
+
+
+def read_model(path: str | Path) -> CRFModel:
+    """Read the labels, attributes and features from a crfsuite model file.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path to model file.
+
+    Returns
+    -------
+    CRFModel
+        Contents of model.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a crfsuite model.
+    """
+    data = Path(path).read_bytes()
+    header = MODEL_HEADER.unpack_from(data, 0)
+    if header[0] != b"lCRF":
+        raise ValueError(f"{path} is not a crfsuite model")
+
+    n_labels, n_attributes, features_offset, labels_offset, attributes_offset = header[
+        5:10
+    ]
+    _, _, n_features = CHUNK.unpack_from(data, features_offset)
+    start = features_offset + CHUNK.size
+    features = list(
+        FEATURE.iter_unpack(data[start : start + n_features * FEATURE.size])
+    )
+
+    return CRFModel(
+        labels=read_cqdb(data, labels_offset, n_labels),
+        attributes=read_cqdb(data, attributes_offset, n_attributes),
+        features=features,
+    )
+
+
+def write_model(model: CRFModel, path: str | Path) -> None:
+    """Write a crfsuite model file.
+
+    The file is written in the same way as crfsuite writes models, so a model read
+    with read_model and written with write_model is identical to the original file.
+
+    Parameters
+    ----------
+    model : CRFModel
+        Model to write.
+    path : str | Path
+        Path to write model file to.
+    """
+    n_labels = len(model.labels)
+    buffer = bytearray(MODEL_HEADER.size)
+
+    features_offset = len(buffer)
+    buffer += CHUNK.pack(
+        b"FEAT", CHUNK.size + FEATURE.size * len(model.features), len(model.features)
+    )
+    for feature in model.features:
+        buffer += FEATURE.pack(*feature)
+
+    labels_offset = len(buffer)
+    buffer += write_cqdb(model.labels)
+    attributes_offset = len(buffer)
+    buffer += write_cqdb(model.attributes)
+
+    # The transition features from each label and the state features of each
+    # attribute.
+    label_refs: list[list[int]] = [[] for _ in model.labels]
+    attribute_refs: list[list[int]] = [[] for _ in model.attributes]
+    for fid, (feature_type, src, _, _) in enumerate(model.features):
+        refs = label_refs if feature_type == TRANSITION else attribute_refs
+        refs[src].append(fid)
+
+    # crfsuite aligns the feature references chunks to 4 bytes.
+    buffer += b"\0" * (-len(buffer) % 4)
+    label_refs_offset = len(buffer)
+    # The label references have two unused entries, for the start and end of the
+    # sentence.
+    buffer += write_refs(b"LFRF", label_refs, len(buffer), n_unused=2)
+    buffer += b"\0" * (-len(buffer) % 4)
+    attribute_refs_offset = len(buffer)
+    buffer += write_refs(b"AFRF", attribute_refs, len(buffer))
+
+    buffer[: MODEL_HEADER.size] = MODEL_HEADER.pack(
+        b"lCRF",
+        len(buffer),
+        b"FOMC",
+        100,
+        0,
+        n_labels,
+        len(model.attributes),
+        features_offset,
+        labels_offset,
+        attributes_offset,
+        label_refs_offset,
+        attribute_refs_offset,
+    )
+    Path(path).write_bytes(buffer)
+
+
+def write_refs(
+    chunk_id: bytes, refs: list[list[int]], offset: int, n_unused: int = 0
+) -> bytes:
+    """Return a chunk of feature references.
+
+    Parameters
+    ----------
+    chunk_id : bytes
+        Chunk id.
+    refs : list[list[int]]
+        Feature ids for each label or attribute.
+    offset : int
+        Offset of the chunk in the model file.
+    n_unused : int, optional
+        Number of entries without any references to add after refs.
+
+    Returns
+    -------
+    bytes
+        Chunk of feature references.
+    """
+    # The chunk header is followed by the absolute offset of the references for each
+    # item, then the number of references and the feature ids for each item.
+    # Unused entries have an offset of 0.
+    n = len(refs) + n_unused
+    body = bytearray()
+    offsets = []
+    body_offset = offset + CHUNK.size + 4 * n
+    for fids in refs:
+        offsets.append(body_offset + len(body))
+        body += struct.pack(f"<I{len(fids)}I", len(fids), *fids)
+    offsets.extend([0] * n_unused)
+
+    size = CHUNK.size + 4 * n + len(body)
+    return CHUNK.pack(chunk_id, size, n) + struct.pack(f"<{n}I", *offsets) + body
+
+
+def write_cqdb(strings: list[str]) -> bytes:
+    """Return a constant database of strings, where each string's id is its index.
+
+    Parameters
+    ----------
+    strings : list[str]
+        Strings to store.
+
+    Returns
+    -------
+    bytes
+        Constant database.
+    """
+    # Records start after the header and the references to the hash tables.
+    offset = CQDB_HEADER.size + 8 * CQDB_TABLES
+    records = bytearray()
+    tables: list[list[tuple[int, int]]] = [[] for _ in range(CQDB_TABLES)]
+    backward = []
+    for i, string in enumerate(strings):
+        key = string.encode("utf-8") + b"\0"
+        hash_value = hashlittle(key)
+        tables[hash_value % CQDB_TABLES].append((hash_value, offset + len(records)))
+        backward.append(offset + len(records))
+        records += struct.pack("<II", i, len(key)) + key
+
+    offset += len(records)
+    table_refs = []
+    hash_tables = bytearray()
+    for table in tables:
+        if not table:
+            table_refs.append((0, 0))
+            continue
+
+        # Open addressing hash table with twice as many buckets as entries
+        n_buckets = 2 * len(table)
+        buckets = [(0, 0)] * n_buckets
+        for hash_value, record_offset in table:
+            k = (hash_value >> 8) % n_buckets
+            while buckets[k][1] != 0:
+                k = (k + 1) % n_buckets
+            buckets[k] = (hash_value, record_offset)
+
+        table_refs.append((offset + len(hash_tables), n_buckets))
+        for bucket in buckets:
+            hash_tables += struct.pack("<II", *bucket)
+
+    backward_offset = offset + len(hash_tables)
+    size = backward_offset + 4 * len(backward)
+    header = CQDB_HEADER.pack(
+        b"CQDB", size, 0, CQDB_BYTEORDER, len(backward), backward_offset
+    )
+    refs = b"".join(struct.pack("<II", *ref) for ref in table_refs)
+    return (
+        header
+        + refs
+        + records
+        + hash_tables
+        + struct.pack(f"<{len(backward)}I", *backward)
+    )
+
+
+def hashlittle(key: bytes, initval: int = 0) -> int:
+    """Return the 32 bit lookup3 hash of key, as used by crfsuite's CQDB.
+
+    Parameters
+    ----------
+    key : bytes
+        Key to hash.
+    initval : int, optional
+        Initial value.
+
+    Returns
+    -------
+    int
+        Hash value.
+    """
+    mask = 0xFFFFFFFF
+
+    def rot(x: int, k: int) -> int:
+        return ((x << k) | (x >> (32 - k))) & mask
+
+    a = b = c = (0xDEADBEEF + len(key) + initval) & mask
+    length = len(key)
+    pos = 0
+    while length > 12:
+        a = (a + int.from_bytes(key[pos : pos + 4], "little")) & mask
+        b = (b + int.from_bytes(key[pos + 4 : pos + 8], "little")) & mask
+        c = (c + int.from_bytes(key[pos + 8 : pos + 12], "little")) & mask
+        a = (a - c) & mask
+        a ^= rot(c, 4)
+        c = (c + b) & mask
+        b = (b - a) & mask
+        b ^= rot(a, 6)
+        a = (a + c) & mask
+        c = (c - b) & mask
+        c ^= rot(b, 8)
+        b = (b + a) & mask
+        a = (a - c) & mask
+        a ^= rot(c, 16)
+        c = (c + b) & mask
+        b = (b - a) & mask
+        b ^= rot(a, 19)
+        a = (a + c) & mask
+        c = (c - b) & mask
+        c ^= rot(b, 4)
+        b = (b + a) & mask
+        length -= 12
+        pos += 12
+
+    if length == 0:
+        return c
+
+    # Zero pad the last block
+    tail = key[pos:] + b"\0" * (12 - length)
+    a = (a + int.from_bytes(tail[0:4], "little")) & mask
+    b = (b + int.from_bytes(tail[4:8], "little")) & mask
+    c = (c + int.from_bytes(tail[8:12], "little")) & mask
+
+    c ^= b
+    c = (c - rot(b, 14)) & mask
+    a ^= c
+    a = (a - rot(c, 11)) & mask
+    b ^= a
+    b = (b - rot(a, 25)) & mask
+    c ^= b
+    c = (c - rot(b, 16)) & mask
+    a ^= c
+    a = (a - rot(c, 4)) & mask
+    b ^= a
+    b = (b - rot(a, 14)) & mask
+    c ^= b
+    c = (c - rot(b, 24)) & mask
+    return c
+
+
+def prune_features(
+    model: CRFModel, threshold: float | None = None, top_n: int | None = None
+) -> CRFModel:
+    """Return a copy of model with low weight features removed.
+
+    Attributes without any remaining state features are removed from the model.
+    Labels are always kept.
+
+    Parameters
+    ----------
+    model : CRFModel
+        Model to prune.
+    threshold : float | None, optional
+        Remove features whose absolute weight is less than threshold.
+    top_n : int | None, optional
+        Keep only the top_n features with the largest absolute weight.
+
+    Returns
+    -------
+    CRFModel
+        Pruned model.
+    """
+    keep = set(range(len(model.features)))
+    if threshold is not None:
+        keep = {i for i in keep if abs(model.features[i][3]) >= threshold}
+    if top_n is not None:
+        ranked = sorted(keep, key=lambda i: abs(model.features[i][3]), reverse=True)
+        keep = set(ranked[:top_n])
+
+    features = [f for i, f in enumerate(model.features) if i in keep]
+
+    # Renumber the attributes that still have state features, keeping their order.
+    used = sorted(
+        {src for feature_type, src, _, _ in features if feature_type == STATE}
+    )
+    attribute_ids = {old: new for new, old in enumerate(used)}
+    features = [
+        (t, attribute_ids[src] if t == STATE else src, dst, w)
+        for t, src, dst, w in features
+    ]
+
+    return CRFModel(
+        labels=model.labels,
+        attributes=[model.attributes[i] for i in used],
+        features=features,
+    )
+
+
+def evaluate_model(
+    path: Path,
+    features_test: list[list[list[str]]],
+    truth_test: list[list[str]],
+    seed: int,
+    foundation_foods: bool,
+) -> dict:
+    """Measure the size, load time, tagging throughput and accuracy of a model.
+
+    Parameters
+    ----------
+    path : Path
+        Path to model file.
+    features_test : list[list[list[str]]]
+        Features of test sentences.
+    truth_test : list[list[str]]
+        True labels of test sentences.
+    seed : int
+        Seed value used for train/test split.
+    foundation_foods : bool
+        If True, the model is the foundation foods model.
+
+    Returns
+    -------
+    dict
+        Model size in bytes, load time in seconds, throughput in sentences per
+        second, sentence accuracy and token accuracy.
+    """
+    # Best of several loads, to reduce noise from the file system cache.
+    load_times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        pycrfsuite.Tagger().open(str(path))  # type: ignore
+        load_times.append(time.perf_counter() - start)
+
+    tagger = pycrfsuite.Tagger()  # type: ignore
+    tagger.open(str(path))
+    start = time.perf_counter()
+    labels_pred = [tagger.tag(X) for X in features_test]
+    elapsed = time.perf_counter() - start
+
+    stats = evaluate(labels_pred, truth_test, seed, foundation_foods)
+    return {
+        "size": path.stat().st_size,
+        "load_time": min(load_times),
+        "throughput": len(features_test) / elapsed,
+        "sentence_accuracy": stats.sentence.accuracy,
+        "token_accuracy": stats.token.accuracy,
+    }
+
+
+def prune_model(args: argparse.Namespace) -> None:
+    """Prune low weight features from a trained model, and compare the pruned models
+    with the original.
+
+    A pruned model is written for each threshold and top-N value, and evaluated on the
+    test split of the training data. For the test split to be held-out data, use the
+    same seed and split that the model was trained with.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Model pruning configuration
+    """
+    foundation_foods = args.model == "foundationfoods"
+    model_file = Path(args.model_file or MODEL_FILES[args.model])
+
+    seed = args.seed
+    if seed is None:
+        seed = randint(0, 1_000_000_000)
+    print(f"[INFO] {seed} is the random seed used for the train/test split.")
+
+    vectors = load_datasets(args.database, args.table, args.datasets, foundation_foods)
+    _, features_test, _, truth_test = train_test_split(
+        vectors.features,
+        vectors.labels,
+        test_size=args.split,
+        stratify=vectors.source,
+        random_state=seed,
+    )
+    print(f"[INFO] {len(features_test):,} testing vectors.")
+
+    model = read_model(model_file)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    configurations = [(f"threshold={t}", t, None) for t in args.thresholds] + [
+        (f"top_n={n}", None, n) for n in args.top_n
+    ]
+
+    baseline = evaluate_model(
+        model_file, features_test, truth_test, seed, foundation_foods
+    )
+    rows = [("original", len(model.features), baseline)]
+    for name, threshold, top_n in configurations:
+        pruned = prune_features(model, threshold=threshold, top_n=top_n)
+        path = output_dir / f"{model_file.stem}.{name.replace('=', '-')}.crfsuite"
+        write_model(pruned, path)
+        print(f"[INFO] Wrote {path}.")
+        results = evaluate_model(
+            path, features_test, truth_test, seed, foundation_foods
+        )
+        rows.append((name, len(pruned.features), results))
+
+    headers = [
+        "Model",
+        "Features",
+        "Size (KB)",
+        "Load time (ms)",
+        "Throughput (sent/s)",
+        "Sentence acc.",
+        "Δ",
+        "Token acc.",
+        "Δ",
+    ]
+    table = []
+    for name, n_features, results in rows:
+        sentence_delta = results["sentence_accuracy"] - baseline["sentence_accuracy"]
+        token_delta = results["token_accuracy"] - baseline["token_accuracy"]
+        table.append(
+            [
+                name,
+                n_features,
+                f"{results['size'] / 1024:,.0f}",
+                f"{1000 * results['load_time']:.2f}",
+                f"{results['throughput']:,.0f}",
+                f"{100 * results['sentence_accuracy']:.2f}%",
+                f"{100 * sentence_delta:+.2f}",
+                f"{100 * results['token_accuracy']:.2f}%",
+                f"{100 * token_delta:+.2f}",
+            ]
+        )
+
+    print(tabulate(table, headers=headers, tablefmt="simple_outline"))
@@ -23,7 +23,7 @@ class DataVectors:
     """Dataclass to store the loaded and transformed inputs."""
 
     sentences: list[str]
-    features: list[list[dict[str, str]]]
+    features: list[list[list[str]]]
     tokens: list[list[str]]
     labels: list[list[str]]
     source: list[str]
@@ -141,7 +141,7 @@ def load_datasets(
     DataVectors
         Dataclass holding:
             raw input sentences,
-            features extracted from sentences,
+            features extracted from sentences, encoded as CRF attributes,
             labels for sentences
             source dataset of sentences
     """
@@ -178,7 +178,7 @@ def load_datasets(
             ]
             name_features = [
                 feat
-                for idx, feat in enumerate(p.sentence_features())
+                for idx, feat in enumerate(p.sentence_attributes())
                 if idx in name_idx
             ]
             name_tokens = [
@@ -191,7 +191,7 @@ def load_datasets(
             tokens.append(name_tokens)
             labels.append(name_labels)
         else:
-            features.append(p.sentence_features())
+            features.append(p.sentence_attributes())
             tokens.append(p.tokenized_sentence)
             labels.append(entry["labels"])
 
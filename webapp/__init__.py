@@ -101,12 +101,15 @@ def get_all_marginals(parser_info: ParserDebugInfo) -> list[dict[str, float]]:
         "PUNC",
     ]
 
+    # The marginals matrix is computed once when the sentence is tagged, with a row
+    # for each token and the labels in the order the model returns them.
+    label_index = {label: i for i, label in enumerate(parser_info.tagger.labels())}
+
     marginals = []
-    tagger = parser_info.tagger
     for i, _ in enumerate(parser_info.PostProcessor.tokens):
         token_marginals = {}
         for label in labels:
-            token_marginals[label] = tagger.marginal(label, i)
+            token_marginals[label] = parser_info.marginals[i][label_index[label]]
 
         marginals.append(token_marginals)
 